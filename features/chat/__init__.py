@@ -0,0 +1,17 @@
+# Import essential classes for convenient package-level access
+from .config import ChatConfig
+from .conversation import Conversation, ConversationStore
+from .response_cache import ResponseCache, normalize_text
+from .streaming import SentenceSegmenter, iter_sentences, iter_sse_content
+
+# Define what gets exposed when importing the package
+__all__ = [
+    "ChatConfig",
+    "Conversation",
+    "ConversationStore",
+    "ResponseCache",
+    "SentenceSegmenter",
+    "iter_sentences",
+    "iter_sse_content",
+    "normalize_text"
+]
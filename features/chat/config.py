@@ -0,0 +1,19 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class ChatConfig:
+    # Response cache in front of the LLM
+    CACHE_PATH = os.getenv("CHAT_CACHE_PATH", "cache/chat_responses.json")
+    CACHE_TTL = float(os.getenv("CHAT_CACHE_TTL", str(6 * 3600)))  # seconds
+    CACHE_MAX_ENTRIES = int(os.getenv("CHAT_CACHE_MAX_ENTRIES", "500"))
+    CACHE_SIMILARITY = float(os.getenv("CHAT_CACHE_SIMILARITY", "0.8"))  # 0 disables fuzzy lookup
+
+    # ASR filler words removed before lookup
+    FILLER_WORDS = ["请问", "那个", "一下", "嗯", "啊", "呃", "额", "哦", "唔", "um", "uh"]
+
+    # Conversation memory: token budget for summary plus recent turns
+    HISTORY_TOKEN_BUDGET = int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "400"))
+    SUMMARY_MAX_CHARS = int(os.getenv("CHAT_SUMMARY_MAX_CHARS", "200"))
@@ -0,0 +1,191 @@
+import logging
+import threading
+
+from .config import ChatConfig
+
+
+def estimate_tokens(text):
+    """Roughly estimate the LLM token count of a text.
+
+    CJK characters count as one token each, other characters as a quarter.
+
+    Args:
+        text (str): Text to measure
+
+    Returns:
+        int: Estimated token count
+    """
+    cjk = sum(1 for ch in text if '\u3000' <= ch <= '\u9fff' or '\uff00' <= ch <= '\uffef')
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def extractive_summary(summary, turns, max_chars=ChatConfig.SUMMARY_MAX_CHARS):
+    """Fold turns into a summary without calling the LLM.
+
+    Keeps the most recent user questions and reply openings that fit.
+
+    Args:
+        summary (str): Existing summary
+        turns (list): (user_text, reply) pairs being compacted
+        max_chars (int): Summary length limit
+
+    Returns:
+        str: New summary
+    """
+    parts = [summary] if summary else []
+    for user_text, reply in turns:
+        parts.append(f"用户问：{user_text}；回答：{reply[:30]}")
+    text = ' '.join(parts)
+    return text[-max_chars:]
+
+
+class Conversation:
+    """Multi-turn history for one user, kept within a token budget.
+
+    Recent turns are sent verbatim; older turns are folded into a rolling
+    summary so each request stays roughly the same size however long the
+    session runs.
+    """
+
+    def __init__(self, user, token_budget=ChatConfig.HISTORY_TOKEN_BUDGET,
+                 summarizer=None, max_summary_chars=ChatConfig.SUMMARY_MAX_CHARS):
+        """Initialize an empty conversation.
+
+        Args:
+            user (str): Recognized user name
+            token_budget (int): Token budget for the summary plus recent turns
+            summarizer (callable): summarizer(summary, turns) -> new summary;
+                falls back to an extractive summary when it fails
+            max_summary_chars (int): Summary length limit
+        """
+        self.user = user
+        self.token_budget = token_budget
+        self.summarizer = summarizer
+        self.max_summary_chars = max_summary_chars
+        self.logger = logging.getLogger(__name__)
+
+        self.summary = ''
+        self.turns = []
+        self._lock = threading.Lock()
+        self._compacting = False
+
+    @property
+    def is_empty(self):
+        """bool: True if nothing has been said yet."""
+        return not self.turns and not self.summary
+
+    def _turn_tokens(self):
+        return sum(estimate_tokens(u) + estimate_tokens(r) for u, r in self.turns)
+
+    def messages(self, system_prompt, text):
+        """Build the message list for the next request.
+
+        Args:
+            system_prompt (str): System prompt
+            text (str): Current user text
+
+        Returns:
+            list: Chat completion messages
+        """
+        with self._lock:
+            messages = [{"role": "system", "content": system_prompt}]
+            if self.summary:
+                messages.append({"role": "system", "content": f"之前的对话摘要：{self.summary}"})
+
+            # Newest turns first until the budget is spent
+            budget = self.token_budget - estimate_tokens(self.summary)
+            recent = []
+            for user_text, reply in reversed(self.turns):
+                cost = estimate_tokens(user_text) + estimate_tokens(reply)
+                if cost > budget:
+                    break
+                budget -= cost
+                recent.append((user_text, reply))
+
+            for user_text, reply in reversed(recent):
+                messages.append({"role": "user", "content": user_text})
+                messages.append({"role": "assistant", "content": reply})
+
+            messages.append({"role": "user", "content": text})
+            return messages
+
+    def add_turn(self, text, reply):
+        """Record a completed turn and compact history if over budget.
+
+        Args:
+            text (str): User text
+            reply (str): Assistant reply
+        """
+        with self._lock:
+            self.turns.append((text, reply))
+            over_budget = self._turn_tokens() + estimate_tokens(self.summary) > self.token_budget
+            if not over_budget or self._compacting:
+                return
+            self._compacting = True
+
+        # Summarize off the request path so turn latency stays flat
+        threading.Thread(target=self._compact, daemon=True).start()
+
+    def _compact(self):
+        """Fold the older half of the turns into the rolling summary."""
+        try:
+            with self._lock:
+                count = max(1, len(self.turns) // 2)
+                old_turns = self.turns[:count]
+                summary = self.summary
+
+            new_summary = None
+            if self.summarizer is not None:
+                try:
+                    new_summary = self.summarizer(summary, old_turns)
+                except Exception as e:
+                    self.logger.warning(f"Conversation summary failed: {e}")
+            if not new_summary:
+                new_summary = extractive_summary(summary, old_turns, self.max_summary_chars)
+
+            with self._lock:
+                # Turns may have been reset while summarizing
+                if self.turns[:count] == old_turns:
+                    self.turns = self.turns[count:]
+                    self.summary = new_summary[:self.max_summary_chars]
+        finally:
+            with self._lock:
+                self._compacting = False
+
+
+class ConversationStore:
+    """Conversations keyed by recognized user."""
+
+    def __init__(self, summarizer=None):
+        """Initialize the store.
+
+        Args:
+            summarizer (callable): Summarizer passed to each Conversation
+        """
+        self.summarizer = summarizer
+        self._conversations = {}
+        self._lock = threading.Lock()
+
+    def get(self, user=None):
+        """Return the conversation for a user, creating it if needed.
+
+        Args:
+            user (str): Recognized user name, None for an unknown speaker
+
+        Returns:
+            Conversation: The user's conversation
+        """
+        user = user or 'guest'
+        with self._lock:
+            if user not in self._conversations:
+                self._conversations[user] = Conversation(user, summarizer=self.summarizer)
+            return self._conversations[user]
+
+    def reset(self, user=None):
+        """Forget a user's conversation.
+
+        Args:
+            user (str): Recognized user name, None for an unknown speaker
+        """
+        with self._lock:
+            self._conversations.pop(user or 'guest', None)
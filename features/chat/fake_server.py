@@ -0,0 +1,112 @@
+"""Local stand-in for the DeepSeek streaming chat API, for exercising the client offline.
+
+Usage:
+    python -m features.chat.fake_server [--port 8091] [--delay 0.2] [--split 7]
+
+Then point the client at it with DEEPSEEK_API_URL=http://127.0.0.1:8091/chat/completions.
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Content deltas of the canned reply; sentences end inside deltas, not at their edges
+CANNED_DELTAS = ["你好", "！今天天", "气晴，气温", "18度。", "出门记得", "带水"]
+
+
+def sse_events(deltas, after_done=(), model="deepseek-chat"):
+    """Encode content deltas as an OpenAI-compatible SSE stream ending in ``[DONE]``.
+
+    Args:
+        deltas (list): Content deltas
+        after_done (list): Deltas sent after ``[DONE]``, which clients must ignore
+        model (str): Model name reported in each chunk
+
+    Returns:
+        bytes: Event stream body
+    """
+    def event(delta):
+        chunk = {"object": "chat.completion.chunk", "model": model,
+                 "choices": [{"index": 0, "delta": {"content": delta}, "finish_reason": None}]}
+        return f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+
+    events = [event(delta) for delta in deltas]
+    events.append("data: [DONE]\n\n")
+    events.extend(event(delta) for delta in after_done)
+    return ''.join(events).encode('utf-8')
+
+
+def start_fake_server(port=0, deltas=None, after_done=(), split=None, delay=0.0, status=200,
+                      content_type='text/event-stream; charset=utf-8'):
+    """Serve a canned streaming chat completion on a background thread.
+
+    Args:
+        port (int): Port to listen on, 0 for any free port
+        deltas (list): Content deltas to stream, defaults to CANNED_DELTAS
+        after_done (list): Deltas to send after ``[DONE]``
+        split (int): Write the body in pieces of this many bytes, so pieces
+            end mid-line and mid-character; None writes one piece per event
+        delay (float): Seconds to wait between pieces
+        status (int): HTTP status to answer with; anything but 200 sends an error body
+        content_type (str): Content-Type of the stream, e.g. without a charset
+
+    Returns:
+        tuple: (server, chat completions URL); call server.shutdown() to stop it
+    """
+    body = sse_events(CANNED_DELTAS if deltas is None else deltas, after_done)
+    if split:
+        pieces = [body[i:i + split] for i in range(0, len(body), split)]
+    else:
+        pieces = [event + b'\n\n' for event in body.split(b'\n\n') if event]
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            if status != 200:
+                error = json.dumps({"error": {"message": "fake failure"}}).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(error)))
+                self.end_headers()
+                self.wfile.write(error)
+                return
+
+            # No Content-Length: the stream ends when the connection closes
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            for piece in pieces:
+                self.wfile.write(piece)
+                self.wfile.flush()
+                time.sleep(delay)
+            self.close_connection = True
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/chat/completions"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8091)
+    parser.add_argument('--delay', type=float, default=0.2, help="seconds between pieces")
+    parser.add_argument('--split', type=int, default=None, help="bytes per piece")
+    args = parser.parse_args()
+
+    server, url = start_fake_server(args.port, split=args.split, delay=args.delay)
+    print(f"Fake DeepSeek chat API at {url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
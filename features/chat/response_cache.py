@@ -0,0 +1,207 @@
+import json
+import logging
+import os
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+
+from .config import ChatConfig
+
+
+def normalize_text(text, filler_words=ChatConfig.FILLER_WORDS):
+    """Normalize user text for cache lookup.
+
+    Folds full-width characters to half-width, lowercases, and drops
+    punctuation, symbols, whitespace and ASR filler words.
+
+    Args:
+        text (str): Recognized user text
+        filler_words (list): Filler words to remove
+
+    Returns:
+        str: Normalized text
+    """
+    text = unicodedata.normalize('NFKC', text).lower()
+    text = ''.join(ch for ch in text if unicodedata.category(ch)[0] not in 'PSZC')
+    for word in filler_words:
+        text = text.replace(word, '')
+    return text
+
+
+def char_ngrams(text, n=2):
+    """Return the set of character n-grams of a text.
+
+    Args:
+        text (str): Normalized text
+        n (int): Gram length
+
+    Returns:
+        set: Character n-grams, or the text itself if shorter than n
+    """
+    if len(text) < n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class ResponseCache:
+    """LRU cache of chat replies keyed by normalized user text.
+
+    Entries expire after a TTL, the cache is bounded in size and persisted to a
+    JSON file so repeated daily questions survive restarts. An optional fuzzy
+    lookup matches near-duplicate questions by character bigram similarity.
+    """
+
+    def __init__(self, path=ChatConfig.CACHE_PATH, ttl=ChatConfig.CACHE_TTL,
+                 max_entries=ChatConfig.CACHE_MAX_ENTRIES,
+                 similarity=ChatConfig.CACHE_SIMILARITY):
+        """Initialize the cache and load persisted entries.
+
+        Args:
+            path (str): JSON file for persistence, None to keep it in memory only
+            ttl (float): Entry lifetime in seconds
+            max_entries (int): Maximum number of entries
+            similarity (float): Minimum Jaccard similarity for fuzzy hits, 0 to disable
+        """
+        self.path = Path(path) if path else None
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.similarity = similarity
+        self.logger = logging.getLogger(__name__)
+
+        self._entries = OrderedDict()  # key -> {'reply', 'expires', 'latency'}
+        self._grams = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.saved_latency = 0.0
+
+        self._load()
+
+    def _load(self):
+        """Load unexpired entries from disk."""
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Failed to load chat cache: {e}")
+            return
+
+        now = time.time()
+        for key, entry in entries.items():
+            if entry.get('expires', 0) > now:
+                self._entries[key] = entry
+                self._grams[key] = char_ngrams(key)
+        self._trim()
+
+    def _save(self):
+        """Write all entries to disk atomically."""
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"Failed to save chat cache: {e}")
+
+    def _trim(self):
+        while len(self._entries) > self.max_entries:
+            key, _ = self._entries.popitem(last=False)
+            self._grams.pop(key, None)
+
+    def _drop(self, key):
+        self._entries.pop(key, None)
+        self._grams.pop(key, None)
+
+    def _find_similar(self, key):
+        """Return the most similar live key above the similarity threshold."""
+        grams = char_ngrams(key)
+        if not grams:
+            return None
+
+        best_key, best_score = None, self.similarity
+        for other, other_grams in self._grams.items():
+            union = len(grams | other_grams)
+            score = len(grams & other_grams) / union if union else 0.0
+            if score >= best_score:
+                best_key, best_score = other, score
+        return best_key
+
+    def get(self, text):
+        """Look up a cached reply.
+
+        Args:
+            text (str): User text
+
+        Returns:
+            str: Cached reply, or None on a miss
+        """
+        key = normalize_text(text)
+        if not key:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            similar = False
+            if entry is None and self.similarity:
+                match = self._find_similar(key)
+                if match is not None:
+                    key, entry, similar = match, self._entries[match], True
+
+            if entry is not None and entry['expires'] <= time.time():
+                self._drop(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.similar_hits += similar
+            self.saved_latency += entry.get('latency', 0.0)
+            return entry['reply']
+
+    def put(self, text, reply, latency=0.0):
+        """Store a reply.
+
+        Args:
+            text (str): User text
+            reply (str): LLM reply
+            latency (float): Seconds the LLM took, counted as saved on later hits
+        """
+        key = normalize_text(text)
+        if not key or not reply:
+            return
+
+        with self._lock:
+            self._entries[key] = {'reply': reply, 'expires': time.time() + self.ttl, 'latency': latency}
+            self._entries.move_to_end(key)
+            self._grams[key] = char_ngrams(key)
+            self._trim()
+            self._save()
+
+    def stats(self):
+        """Return hit rate and saved latency.
+
+        Returns:
+            dict: Hits, fuzzy hits, misses, hit rate, saved seconds and entry count
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'similar_hits': self.similar_hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'saved_latency': self.saved_latency,
+                'entries': len(self._entries),
+            }
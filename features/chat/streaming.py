@@ -0,0 +1,110 @@
+import json
+import re
+
+# Sentence terminators: Chinese and Latin punctuation, plus newlines.
+# A Latin '.' only ends a sentence when followed by whitespace, so "3.5" stays whole.
+SENTENCE_END = re.compile(r'[。！？!?；;…\n]+|\.(?=\s)')
+CLAUSE_END = re.compile(r'[，,、：:]')
+
+
+class SentenceSegmenter:
+    """Splits streamed text deltas into complete sentences as soon as they end."""
+
+    def __init__(self, max_chars=40):
+        """Initialize the segmenter.
+
+        Args:
+            max_chars (int): Split long sentences at the last clause break past
+                this length so the first audio is not held back
+        """
+        self.max_chars = max_chars
+        self._buffer = ''
+
+    def feed(self, delta):
+        """Add a text delta.
+
+        Args:
+            delta (str): Text received from the stream
+
+        Returns:
+            list: Sentences completed by this delta
+        """
+        self._buffer += delta
+        sentences = []
+
+        while True:
+            match = SENTENCE_END.search(self._buffer)
+            if match:
+                end = match.end()
+            elif len(self._buffer) > self.max_chars:
+                clauses = list(CLAUSE_END.finditer(self._buffer))
+                if not clauses:
+                    break
+                end = clauses[-1].end()
+            else:
+                break
+
+            sentence = self._buffer[:end].strip()
+            self._buffer = self._buffer[end:]
+            if sentence:
+                sentences.append(sentence)
+
+        return sentences
+
+    def flush(self):
+        """Return whatever text is left once the stream ends.
+
+        Returns:
+            list: The trailing sentence, if any
+        """
+        sentence = self._buffer.strip()
+        self._buffer = ''
+        return [sentence] if sentence else []
+
+
+def iter_sse_content(response):
+    """Yield content deltas from an OpenAI-compatible chat completion SSE stream.
+
+    Args:
+        response: Streaming ``requests`` response
+
+    Yields:
+        str: Content delta of each event
+    """
+    # SSE is always UTF-8; requests would guess ISO-8859-1 for text/event-stream
+    # without a charset. A UTF-8 character never contains a newline byte, so
+    # each line can be decoded on its own.
+    for line in response.iter_lines():
+        line = line.decode('utf-8', errors='replace')
+        if not line or not line.startswith('data:'):
+            continue
+
+        data = line[len('data:'):].strip()
+        if data == '[DONE]':
+            break
+
+        try:
+            chunk = json.loads(data)
+        except ValueError:
+            continue
+
+        choices = chunk.get('choices') or [{}]
+        delta = choices[0].get('delta', {}).get('content')
+        if delta:
+            yield delta
+
+
+def iter_sentences(deltas, segmenter=None):
+    """Group streamed text deltas into sentences.
+
+    Args:
+        deltas (iterable): Text deltas
+        segmenter (SentenceSegmenter): Segmenter to use
+
+    Yields:
+        str: Each complete sentence as soon as it ends
+    """
+    segmenter = segmenter or SentenceSegmenter()
+    for delta in deltas:
+        yield from segmenter.feed(delta)
+    yield from segmenter.flush()
@@ -0,0 +1,148 @@
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncRuntime:
+    """Asyncio event loop on a background thread with executors for blocking calls.
+
+    Microphone, speaker and camera calls run on a small device executor and
+    network or model calls on a larger I/O executor, so a slow cloud request
+    never holds up the audio devices. Coroutines are submitted from ordinary
+    threads with submit() or run().
+    """
+
+    def __init__(self, device_workers=2, io_workers=4):
+        """Initialize the runtime without starting the loop.
+
+        Args:
+            device_workers (int): Threads for blocking audio and camera calls
+            io_workers (int): Threads for blocking network and model calls
+        """
+        self.logger = logging.getLogger(__name__)
+        self.loop = asyncio.new_event_loop()
+        self._device_pool = ThreadPoolExecutor(max_workers=device_workers, thread_name_prefix='async-device')
+        self._io_pool = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix='async-io')
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the event loop thread; later calls are no-ops."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.loop.run_forever, name='async-runtime', daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        """Stop the event loop and release the executors."""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._device_pool.shutdown(wait=False)
+        self._io_pool.shutdown(wait=False)
+
+    def submit(self, coro):
+        """Schedule a coroutine from any thread.
+
+        Returns:
+            concurrent.futures.Future: Result of the coroutine
+        """
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout=None):
+        """Run a coroutine on the loop and block until it finishes.
+
+        Args:
+            coro: Coroutine to run
+            timeout (float): Seconds to wait, None to wait indefinitely
+
+        Returns:
+            The coroutine's result
+        """
+        return self.submit(coro).result(timeout)
+
+    async def device(self, func, *args, **kwargs):
+        """Await a blocking microphone, speaker or camera call."""
+        return await self.loop.run_in_executor(self._device_pool, functools.partial(func, *args, **kwargs))
+
+    async def io(self, func, *args, **kwargs):
+        """Await a blocking network or model call."""
+        return await self.loop.run_in_executor(self._io_pool, functools.partial(func, *args, **kwargs))
+
+
+class Turn:
+    """In-flight work of one conversation turn, cancelled together.
+
+    Tasks started with spawn() are cancelled at their next await, and
+    blocking code running in an executor sees ``cancelled`` set and stops at
+    its next checkpoint, e.g. between two streamed sentences.
+    """
+
+    def __init__(self):
+        self.cancelled = threading.Event()
+        self._tasks = set()
+
+    def spawn(self, coro):
+        """Start a task that belongs to this turn.
+
+        Returns:
+            asyncio.Task: The started task
+        """
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def cancel(self):
+        """Cancel every task of the turn and signal blocking work to stop.
+
+        Returns:
+            int: Number of tasks that were still running
+        """
+        self.cancelled.set()
+        running = [task for task in self._tasks if not task.done()]
+        for task in running:
+            task.cancel()
+        return len(running)
+
+
+def cancellable(iterable, cancelled):
+    """Yield from an iterable until ``cancelled`` is set, then close it.
+
+    Closing a generator runs its cleanup, e.g. closing a streaming HTTP
+    response, on the thread that was consuming it.
+
+    Args:
+        iterable (iterable): Items to pass through, typically a generator
+        cancelled (threading.Event): Stops the iteration once set
+
+    Yields:
+        Items of the iterable
+    """
+    try:
+        for item in iterable:
+            if cancelled.is_set():
+                break
+            yield item
+    finally:
+        close = getattr(iterable, 'close', None)
+        if close is not None:
+            close()
+
+
+_shared_runtime = None
+_shared_lock = threading.Lock()
+
+
+def get_async_runtime():
+    """Return the process-wide async runtime, creating it on first use.
+
+    Returns:
+        AsyncRuntime: Shared runtime instance
+    """
+    global _shared_runtime
+    with _shared_lock:
+        if _shared_runtime is None:
+            _shared_runtime = AsyncRuntime()
+        return _shared_runtime
@@ -0,0 +1,225 @@
+"""Per-module import time of the mirror's entry point, attributed to our packages.
+
+Usage:
+    python -m features.common.import_profile [--module main] [--min-ms 5] [--budget-ms 1500]
+    python main.py --profile-startup [--min-ms 5] [--budget-ms 1500]
+
+Runs the import under ``python -X importtime`` in a fresh interpreter and
+prints the import tree. Our modules are marked with ``*`` and each one is
+charged with the third-party imports it triggers. With ``--budget-ms`` the
+exit status is 1 when importing the module takes longer than the budget.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+# Top-level packages and modules that belong to this repository
+OUR_PACKAGES = ('main', 'features', 'home_control', 'logger_config')
+
+_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$')
+
+# Prepended to the import when stubbing: a finder consulted after the real
+# ones that supplies empty stand-ins for the named packages, so importing them
+# still goes through the import system and shows up in the importtime output
+_STUB_FINDER = """
+import importlib.abc, importlib.util, sys
+
+class _Stub(type):
+    def __getattr__(cls, name):
+        return _Stub(name, (), {})
+
+    def __call__(cls, *args, **kwargs):
+        return _Stub(cls.__name__, (), {})
+
+class _StubLoader(importlib.abc.Loader):
+    def create_module(self, spec):
+        return None
+
+    def exec_module(self, module):
+        module.__path__ = []
+        module.__getattr__ = lambda name: _Stub(name, (), {})
+
+class _StubFinder(importlib.abc.MetaPathFinder):
+    def find_spec(self, fullname, path, target=None):
+        if fullname.split('.')[0] in _STUBBED:
+            return importlib.util.spec_from_loader(fullname, _StubLoader(), is_package=True)
+        return None
+
+sys.meta_path.append(_StubFinder())
+"""
+
+
+class ImportNode:
+    """One module in the import tree."""
+
+    def __init__(self, name, self_us, cumulative_us, depth):
+        self.name = name
+        self.self_us = self_us
+        self.cumulative_us = cumulative_us
+        self.depth = depth
+        self.children = []
+
+    @property
+    def package(self):
+        return self.name.split('.')[0]
+
+    def is_ours(self, packages=OUR_PACKAGES):
+        return self.package in packages
+
+
+def run_importtime(module='main', cwd=None, stub_missing=()):
+    """Import a module in a fresh interpreter with ``-X importtime``.
+
+    Args:
+        module (str): Module to import
+        cwd (str): Directory to run in, defaults to the repository root
+        stub_missing (tuple): Top-level packages replaced by empty stubs when
+            they are not installed, so the import tree can be checked without
+            every optional dependency
+
+    Returns:
+        tuple: (importtime lines, error output that is not importtime data)
+    """
+    cwd = cwd or str(Path(__file__).resolve().parents[2])
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    script = f'import {module}'
+    if stub_missing:
+        script = f'_STUBBED = {sorted(stub_missing)!r}\n' + _STUB_FINDER + script
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', script],
+        cwd=cwd, env=env, capture_output=True, text=True
+    )
+    lines, errors = [], []
+    for line in result.stderr.splitlines():
+        (lines if line.startswith('import time:') else errors).append(line)
+    return lines, '\n'.join(errors) if result.returncode else ''
+
+
+def build_tree(lines):
+    """Build the import tree from ``-X importtime`` output.
+
+    The output lists a module after everything it imported, indented by
+    two spaces per level, so children are collected until their parent's
+    line appears.
+
+    Args:
+        lines (list): importtime lines
+
+    Returns:
+        list: Top-level ImportNode objects in import order
+    """
+    pending = {}  # depth -> nodes waiting for their parent
+    roots = []
+    for line in lines:
+        match = _LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        depth = len(indent) // 2
+        node = ImportNode(name, int(self_us), int(cumulative_us), depth)
+        node.children = pending.pop(depth + 1, [])
+        if depth == 0:
+            roots.append(node)
+        else:
+            pending.setdefault(depth, []).append(node)
+    return roots
+
+
+def find(roots, name):
+    """Return the first node for a module, searching depth-first."""
+    for node in roots:
+        if node.name == name:
+            return node
+        found = find(node.children, name)
+        if found is not None:
+            return found
+    return None
+
+
+def attribute(roots, packages=OUR_PACKAGES):
+    """Charge each of our modules with the third-party imports it triggers.
+
+    Args:
+        roots (list): Import tree
+        packages (tuple): Our top-level packages
+
+    Returns:
+        dict: Our module -> (cumulative microseconds of third-party imports,
+            list of (third-party module, microseconds) sorted by cost)
+    """
+    attributed = {}
+
+    def visit(node):
+        if node.is_ours(packages):
+            foreign = sorted(((child.name, child.cumulative_us) for child in node.children
+                              if not child.is_ours(packages)), key=lambda item: -item[1])
+            if foreign:
+                attributed[node.name] = (sum(us for _, us in foreign), foreign)
+        for child in node.children:
+            visit(child)
+
+    for root in roots:
+        visit(root)
+    return attributed
+
+
+def format_tree(roots, min_ms=5.0, packages=OUR_PACKAGES):
+    """Render the import tree, hiding modules cheaper than ``min_ms``.
+
+    Returns:
+        str: One line per module with cumulative and self time in ms
+    """
+    lines = []
+
+    def visit(node, level):
+        if node.cumulative_us / 1000 < min_ms:
+            return
+        marker = '*' if node.is_ours(packages) else ' '
+        lines.append(f"{node.cumulative_us / 1000:9.1f} {node.self_us / 1000:8.1f} {marker} "
+                     f"{'  ' * level}{node.name}")
+        for child in node.children:
+            visit(child, level + 1)
+
+    lines.append(f"{'cum ms':>9} {'self ms':>8}   module")
+    for root in roots:
+        visit(root, 0)
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--module', default='main', help="module to import")
+    parser.add_argument('--min-ms', type=float, default=5.0, help="hide modules cheaper than this")
+    parser.add_argument('--budget-ms', type=float, default=None,
+                        help="fail if importing the module takes longer than this")
+    args = parser.parse_args(argv)
+
+    lines, error = run_importtime(args.module)
+    roots = build_tree(lines)
+    print(format_tree(roots, args.min_ms))
+
+    print(f"\nImports outside our packages triggered by our modules (>= {args.min_ms} ms):")
+    for name, (total_us, foreign) in sorted(attribute(roots).items(), key=lambda item: -item[1][0]):
+        if total_us / 1000 < args.min_ms:
+            continue
+        heaviest = ', '.join(f"{module} {us / 1000:.0f}" for module, us in foreign[:5])
+        print(f"{total_us / 1000:9.1f}   {name}: {heaviest}")
+
+    if error:
+        print(f"\nImporting {args.module} failed:\n{error}")
+        return 1
+
+    target = find(roots, args.module)
+    total_ms = target.cumulative_us / 1000 if target else 0.0
+    print(f"\nImporting {args.module} took {total_ms:.1f} ms")
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"Import time over budget: {total_ms:.1f} ms > {args.budget_ms:.1f} ms")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,78 @@
+import logging
+import socket
+import threading
+import time
+
+
+class NetworkProbe:
+    """Checks whether the internet is reachable, remembering the answer briefly.
+
+    Routing decisions ask before every utterance, so a result is reused for
+    ``ttl`` seconds instead of opening a connection each time, but a change
+    in connectivity is still noticed within that interval.
+    """
+
+    def __init__(self, host="baidu.com", port=80, timeout=3, ttl=15):
+        """Initialize the probe.
+
+        Args:
+            host (str): Host to connect to
+            port (int): TCP port to connect to
+            timeout (float): Connection timeout in seconds
+            ttl (float): Seconds a result is reused
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.ttl = ttl
+        self.logger = logging.getLogger(__name__)
+
+        self._online = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        try:
+            with socket.create_connection((self.host, self.port), timeout=self.timeout):
+                return True
+        except OSError:
+            return False
+
+    def is_online(self):
+        """Return True if the host was reachable at the last check within the TTL.
+
+        Returns:
+            bool: Whether the network is available
+        """
+        with self._lock:
+            if self._online is not None and time.monotonic() - self._checked_at < self.ttl:
+                return self._online
+
+            online = self._connect()
+            if online != self._online and self._online is not None:
+                self.logger.info("Network %s", "available again" if online else "unavailable")
+            self._online = online
+            self._checked_at = time.monotonic()
+            return online
+
+    def invalidate(self):
+        """Forget the last result so the next call checks again."""
+        with self._lock:
+            self._online = None
+
+
+_shared_probe = None
+_shared_lock = threading.Lock()
+
+
+def get_network_probe():
+    """Return the process-wide network probe, creating it on first use.
+
+    Returns:
+        NetworkProbe: Shared probe instance
+    """
+    global _shared_probe
+    with _shared_lock:
+        if _shared_probe is None:
+            _shared_probe = NetworkProbe()
+        return _shared_probe
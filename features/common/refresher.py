@@ -0,0 +1,246 @@
+import heapq
+import logging
+import threading
+import time
+
+
+class Snapshot:
+    """Last fetched value of a refresh job."""
+
+    def __init__(self, value=None, updated_at=None, error=None):
+        """Initialize the snapshot.
+
+        Args:
+            value: Last successfully fetched value, None before the first success
+            updated_at (float): Unix time of the last success
+            error (str): Error of the most recent failed refresh, if any
+        """
+        self.value = value
+        self.updated_at = updated_at
+        self.error = error
+
+    @property
+    def age(self):
+        """float: Seconds since the last success, None before the first one."""
+        return None if self.updated_at is None else time.time() - self.updated_at
+
+    def to_dict(self):
+        return {'value': self.value, 'updated_at': self.updated_at, 'age': self.age, 'error': self.error}
+
+
+class _Job:
+    def __init__(self, name, fetch, interval, backoff_on, max_backoff):
+        self.name = name
+        self.fetch = fetch
+        self.interval = interval
+        self.backoff_on = backoff_on
+        self.max_backoff = max_backoff
+        self.snapshot = Snapshot()
+        self.backoff = 0.0
+        self.retrying = False  # The last refresh failed; its retry delay stands
+        self.due = 0.0
+        self.running = False
+        self.ready = threading.Event()
+
+        self.refreshes = 0
+        self.failures = 0
+        self.backoffs = 0
+
+
+class BackgroundRefresher:
+    """Refreshes data ahead of expiry on a background thread.
+
+    Readers always get the latest snapshot immediately, even when it is
+    stale; a stale read only moves the next refresh forward
+    (stale-while-revalidate). A job whose last refresh failed is retried
+    after ``retry_interval`` regardless of reads, and jobs raising one of
+    their ``backoff_on`` exceptions, such as an API rate limit, are retried
+    with exponentially growing delays instead.
+    """
+
+    def __init__(self, retry_interval=60):
+        """Initialize the refresher.
+
+        Args:
+            retry_interval (float): Delay before retrying a job that failed
+                with an ordinary error, including an open circuit breaker
+        """
+        self.retry_interval = retry_interval
+        self.logger = logging.getLogger(__name__)
+
+        self._jobs = {}
+        self._heap = []  # (due, name)
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+
+    def register(self, name, fetch, interval, backoff_on=(), max_backoff=1800):
+        """Register a job; its first refresh runs as soon as the refresher starts.
+
+        Args:
+            name (str): Job name
+            fetch (callable): Returns the fresh value; raises on failure
+            interval (float): Seconds between successful refreshes; set it below
+                the data's TTL so the snapshot is refreshed ahead of expiry
+            backoff_on (tuple): Exception types that trigger exponential backoff
+            max_backoff (float): Longest delay between retries in seconds
+        """
+        with self._cond:
+            if name in self._jobs:
+                raise ValueError(f"Refresh job already registered: {name}")
+            job = _Job(name, fetch, interval, tuple(backoff_on), max_backoff)
+            self._jobs[name] = job
+            self._schedule(job, 0)
+
+    def _schedule(self, job, delay):
+        job.due = time.monotonic() + delay
+        heapq.heappush(self._heap, (job.due, job.name))
+        self._cond.notify()
+
+    def start(self):
+        """Start the background thread."""
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name='refresher', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background thread after the current refresh."""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                job = None
+                while self._running:
+                    if self._heap:
+                        due, name = self._heap[0]
+                        job = self._jobs[name]
+                        if due != job.due:
+                            heapq.heappop(self._heap)  # Rescheduled since
+                            continue
+                        wait = due - time.monotonic()
+                        if wait <= 0:
+                            heapq.heappop(self._heap)
+                            job.running = True
+                            break
+                    else:
+                        wait = None
+                    job = None
+                    self._cond.wait(wait)
+                if not self._running:
+                    return
+
+            self._refresh(job)
+
+    def _refresh(self, job):
+        """Run one job and schedule its next refresh."""
+        start = time.monotonic()
+        try:
+            value = job.fetch()
+        except job.backoff_on as e:
+            with self._cond:
+                job.failures += 1
+                job.backoffs += 1
+                job.backoff = min(job.max_backoff, max(job.interval, job.backoff * 2))
+                job.retrying = True
+                job.snapshot.error = str(e)
+                job.running = False
+                self._schedule(job, job.backoff)
+            self.logger.warning(f"Refresh of {job.name} backing off {job.backoff:.0f}s: {e}")
+        except Exception as e:
+            with self._cond:
+                job.failures += 1
+                job.retrying = True
+                job.snapshot.error = str(e)
+                job.running = False
+                self._schedule(job, min(job.interval, self.retry_interval))
+            self.logger.error(f"Refresh of {job.name} failed: {e}")
+        else:
+            with self._cond:
+                job.refreshes += 1
+                job.backoff = 0.0
+                job.retrying = False
+                job.snapshot = Snapshot(value, time.time())
+                job.running = False
+                self._schedule(job, job.interval)
+            self.logger.info(f"Refreshed {job.name} in {time.monotonic() - start:.2f}s")
+        finally:
+            job.ready.set()
+
+    def get(self, name, wait=0):
+        """Return a job's latest snapshot without blocking on the network.
+
+        A snapshot older than the job's interval is returned as is, and the
+        job is moved to the front of the queue unless its last refresh failed,
+        in which case it keeps its retry delay.
+
+        Args:
+            name (str): Job name
+            wait (float): Seconds to wait for the very first refresh if no
+                value has been fetched yet
+
+        Returns:
+            Snapshot: Latest snapshot; its value is None before the first success
+        """
+        job = self._jobs[name]
+        if wait and job.snapshot.updated_at is None:
+            job.ready.wait(wait)
+
+        with self._cond:
+            snapshot = job.snapshot
+            stale = snapshot.age is None or snapshot.age > job.interval
+            if stale and not job.running and not job.retrying and job.due > time.monotonic():
+                self._schedule(job, 0)
+            return snapshot
+
+    def snapshot(self):
+        """Return every job's latest snapshot.
+
+        Returns:
+            dict: Job name -> snapshot dict
+        """
+        with self._cond:
+            return {name: job.snapshot.to_dict() for name, job in self._jobs.items()}
+
+    def stats(self):
+        """Return refresh, failure and backoff counts per job.
+
+        Returns:
+            dict: Job name -> counters
+        """
+        with self._cond:
+            return {
+                name: {
+                    'refreshes': job.refreshes,
+                    'failures': job.failures,
+                    'backoffs': job.backoffs,
+                    'backoff': job.backoff,
+                    'age': job.snapshot.age,
+                }
+                for name, job in self._jobs.items()
+            }
+
+
+_shared_refresher = None
+_shared_lock = threading.Lock()
+
+
+def get_refresher():
+    """Return the process-wide background refresher, creating it on first use.
+
+    Returns:
+        BackgroundRefresher: Shared refresher instance
+    """
+    global _shared_refresher
+    with _shared_lock:
+        if _shared_refresher is None:
+            _shared_refresher = BackgroundRefresher()
+        return _shared_refresher
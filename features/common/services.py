@@ -0,0 +1,181 @@
+import logging
+import os
+import threading
+import time
+
+
+def process_rss_mb():
+    """Return the resident memory of this process in MB.
+
+    Reads /proc on Linux and falls back to the peak RSS elsewhere.
+
+    Returns:
+        float: Resident set size in MB, None if it cannot be determined
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    except (ImportError, OSError):
+        return None
+
+
+class _Service:
+    def __init__(self, name, factory):
+        self.name = name
+        self.factory = factory
+        self.instance = None
+        self.created = False
+        self.lock = threading.Lock()
+        self.init_seconds = None
+        self.rss_delta_mb = None
+
+
+class ServiceRegistry:
+    """Constructs subsystems on first use and shares one instance of each.
+
+    Each service has its own lock, so two threads asking for the same
+    service get the same instance while different services can be
+    constructed concurrently. Construction time and the change in resident
+    memory are recorded per service.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._services = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, factory):
+        """Register a service factory; nothing is constructed yet.
+
+        Args:
+            name (str): Service name
+            factory (callable): Builds the service instance, called at most once
+        """
+        with self._lock:
+            if name in self._services and self._services[name].created:
+                raise ValueError(f"Service already created: {name}")
+            self._services[name] = _Service(name, factory)
+
+    def get(self, name):
+        """Return the shared instance of a service, constructing it on first use.
+
+        Args:
+            name (str): Service name
+
+        Returns:
+            The service instance
+
+        Raises:
+            KeyError: If no service with this name is registered
+        """
+        service = self._services[name]
+        if service.created:
+            return service.instance
+
+        with service.lock:
+            if not service.created:
+                rss_before = process_rss_mb()
+                start = time.perf_counter()
+                service.instance = service.factory()
+                service.init_seconds = time.perf_counter() - start
+                rss_after = process_rss_mb()
+                if rss_before is not None and rss_after is not None:
+                    service.rss_delta_mb = rss_after - rss_before
+                service.created = True
+                self.logger.info("Created %s in %.2fs", name, service.init_seconds)
+            return service.instance
+
+    def is_created(self, name):
+        """Return True if the service has already been constructed."""
+        return self._services[name].created
+
+    def stats(self):
+        """Return construction time and memory growth per service.
+
+        Returns:
+            dict: Service name -> created flag, init seconds and RSS delta (MB)
+        """
+        with self._lock:
+            services = list(self._services.values())
+        return {
+            service.name: {
+                'created': service.created,
+                'init_seconds': service.init_seconds,
+                'rss_delta_mb': service.rss_delta_mb,
+            }
+            for service in services
+        }
+
+
+def _create_assistant():
+    from features.voice_feat_system import VoiceAssistant
+
+    return VoiceAssistant(
+        baidu_app_id=os.getenv("BAIDU_APP_ID"),
+        baidu_api_key=os.getenv("BAIDU_API_KEY"),
+        baidu_secret_key=os.getenv("BAIDU_SECRET_KEY"),
+        deepseek_api_key=os.getenv("DEEPSEEK_API_KEY"),
+    )
+
+
+def _create_speech_recognizer():
+    from features.speech_recognizer import RecognizeSpeech
+
+    return RecognizeSpeech()
+
+
+def _create_speech_output():
+    from features.speech import get_speech_output
+
+    return get_speech_output()
+
+
+def _create_ac_controller():
+    from home_control.ac_control import ACController
+
+    return ACController()
+
+
+_shared_registry = None
+_shared_lock = threading.Lock()
+
+
+def get_services():
+    """Return the process-wide service registry, creating it on first use.
+
+    The assistant, speech recognizer, speech output and AC controller are
+    registered by default; callers may register further services.
+
+    Returns:
+        ServiceRegistry: Shared registry instance
+    """
+    global _shared_registry
+    with _shared_lock:
+        if _shared_registry is None:
+            _shared_registry = ServiceRegistry()
+            _shared_registry.register('assistant', _create_assistant)
+            _shared_registry.register('speech_recognizer', _create_speech_recognizer)
+            _shared_registry.register('speech_output', _create_speech_output)
+            _shared_registry.register('ac_controller', _create_ac_controller)
+        return _shared_registry
+
+
+def get_assistant():
+    """Return the shared VoiceAssistant."""
+    return get_services().get('assistant')
+
+
+def get_speech_recognizer():
+    """Return the shared RecognizeSpeech instance."""
+    return get_services().get('speech_recognizer')
+
+
+def get_ac_controller():
+    """Return the shared ACController."""
+    return get_services().get('ac_controller')
@@ -0,0 +1,141 @@
+import logging
+import threading
+import time
+
+
+class _Step:
+    def __init__(self, name, init, requires):
+        self.name = name
+        self.init = init
+        self.requires = tuple(requires)
+        self.ready = threading.Event()  # set when init succeeded
+        self.done = threading.Event()  # set when init finished, successfully or not
+        self.result = None
+        self.error = None
+        self.started_at = None
+        self.seconds = None
+
+
+class StartupOrchestrator:
+    """Initializes independent subsystems concurrently.
+
+    Every step runs on its own thread as soon as the steps it requires have
+    finished, and publishes a readiness event. A failed requirement is
+    logged but does not block its dependents, since subsystems fall back
+    (cloud ASR without the offline model, offline TTS without the cache).
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._steps = {}
+        self._started_at = None
+
+    def add(self, name, init, requires=()):
+        """Add a startup step.
+
+        Args:
+            name (str): Step name
+            init (callable): Initializes the subsystem; its return value is kept
+            requires (iterable): Names of steps that must finish first
+        """
+        if self._started_at is not None:
+            raise RuntimeError("Cannot add steps after start()")
+        self._steps[name] = _Step(name, init, requires)
+
+    def start(self):
+        """Start every step; returns immediately."""
+        for step in self._steps.values():
+            missing = [name for name in step.requires if name not in self._steps]
+            if missing:
+                raise KeyError(f"{step.name} requires unknown steps: {missing}")
+
+        self._started_at = time.perf_counter()
+        for step in self._steps.values():
+            threading.Thread(target=self._run, args=(step,), name=f"startup-{step.name}", daemon=True).start()
+
+    def _run(self, step):
+        for name in step.requires:
+            required = self._steps[name]
+            required.done.wait()
+            if not required.ready.is_set():
+                self.logger.warning("%s starting without %s: %s", step.name, name, required.error)
+
+        step.started_at = time.perf_counter()
+        try:
+            step.result = step.init()
+            step.ready.set()
+        except Exception as e:
+            step.error = str(e)
+            self.logger.error("%s failed to initialize: %s", step.name, e)
+        finally:
+            step.seconds = time.perf_counter() - step.started_at
+            step.done.set()
+
+        self.logger.info("%s %s in %.2fs (%.2fs after start)", step.name,
+                         "ready" if step.ready.is_set() else "failed",
+                         step.seconds, time.perf_counter() - self._started_at)
+
+    def ready(self, name):
+        """Return the readiness event of a step, set once it initialized successfully."""
+        return self._steps[name].ready
+
+    def wait(self, name, timeout=None):
+        """Wait for a step to finish.
+
+        Args:
+            name (str): Step name
+            timeout (float): Seconds to wait, None to wait indefinitely
+
+        Returns:
+            bool: True if the step initialized successfully
+        """
+        step = self._steps[name]
+        step.done.wait(timeout)
+        return step.ready.is_set()
+
+    def wait_all(self, timeout=None):
+        """Wait for every step to finish.
+
+        Args:
+            timeout (float): Total seconds to wait, None to wait indefinitely
+
+        Returns:
+            bool: True if every step finished within the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for step in self._steps.values():
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not step.done.wait(remaining):
+                return False
+        return True
+
+    def result(self, name):
+        """Return what a step's init returned, None until it is ready."""
+        return self._steps[name].result
+
+    def stats(self):
+        """Return state and init time per step.
+
+        Returns:
+            dict: Step name -> status, init seconds, seconds from start to finish and error
+        """
+        stats = {}
+        for name, step in self._steps.items():
+            if step.ready.is_set():
+                status = 'ready'
+            elif step.done.is_set():
+                status = 'failed'
+            elif step.started_at is not None:
+                status = 'running'
+            else:
+                status = 'waiting'
+            finished_after = None
+            if step.done.is_set():
+                finished_after = step.started_at + step.seconds - self._started_at
+            stats[name] = {
+                'status': status,
+                'init_seconds': step.seconds,
+                'finished_after': finished_after,
+                'error': step.error,
+            }
+        return stats
@@ -0,0 +1,183 @@
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+class _Event:
+    __slots__ = ('name', 'payload', 'posted_at', 'generation')
+
+    def __init__(self, name, payload, generation):
+        self.name = name
+        self.payload = payload
+        self.posted_at = time.perf_counter()
+        self.generation = generation
+
+
+class StateMachine:
+    """Event-driven state machine with a fixed worker pool.
+
+    Events are posted to a queue and applied in order by a dispatcher
+    thread, which blocks on the queue instead of polling. Entering a state
+    submits that state's action to the worker pool; whatever event the
+    action returns is posted back. Events posted by the action of a state
+    that has since been left are dropped, so a slow job cannot move the
+    machine after it moved on.
+    """
+
+    def __init__(self, initial, transitions, workers=2, history=100):
+        """Initialize the machine without starting it.
+
+        Args:
+            initial (str): Initial state
+            transitions (dict): (state, event) -> next state
+            workers (int): Size of the worker pool running state actions
+            history (int): Number of recent transitions kept for stats()
+        """
+        self.initial = initial
+        self.transitions = dict(transitions)
+        self.logger = logging.getLogger(__name__)
+
+        self._state = initial
+        self._generation = 0
+        self._actions = {}
+        self._events = queue.Queue()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='state-worker')
+        self._dispatcher = None
+        self._stopped = threading.Event()
+        self._changed = threading.Condition()
+
+        self._history = deque(maxlen=history)
+        self._latencies = defaultdict(lambda: [0, 0.0, 0.0])  # (state, event, next state) -> [count, total ms, max ms]
+        self.dropped = 0
+
+    @property
+    def state(self):
+        """str: Current state."""
+        return self._state
+
+    @property
+    def stopped(self):
+        """threading.Event: Set once stop() is called; actions should return when it is set."""
+        return self._stopped
+
+    def on_enter(self, state, action):
+        """Run an action on the worker pool whenever the machine enters a state.
+
+        Args:
+            state (str): State name
+            action (callable): action(payload) returning None or an
+                (event, payload) tuple to post when it finishes
+        """
+        self._actions[state] = action
+
+    def post(self, event, payload=None):
+        """Post an event from any thread; returns immediately.
+
+        Args:
+            event (str): Event name
+            payload: Data passed to the next state's action
+        """
+        self._events.put(_Event(event, payload, None))
+
+    def start(self):
+        """Start the dispatcher and run the initial state's action."""
+        self._dispatcher = threading.Thread(target=self._dispatch, name='state-dispatcher', daemon=True)
+        self._dispatcher.start()
+        self._enter(self.initial, None)
+
+    def stop(self, timeout=None):
+        """Stop dispatching events and wait for running actions to return.
+
+        Args:
+            timeout (float): Seconds to wait for the dispatcher thread
+        """
+        self._stopped.set()
+        self._events.put(None)
+        if self._dispatcher is not None:
+            self._dispatcher.join(timeout)
+        self._pool.shutdown(wait=False)
+
+    def wait_for(self, state, timeout=None):
+        """Block until the machine is in a state.
+
+        Returns:
+            bool: True if the machine reached the state within the timeout
+        """
+        with self._changed:
+            return self._changed.wait_for(lambda: self._state == state, timeout)
+
+    def _enter(self, state, payload):
+        action = self._actions.get(state)
+        if action is None:
+            return
+        generation = self._generation
+        self._pool.submit(self._run_action, action, payload, generation)
+
+    def _run_action(self, action, payload, generation):
+        try:
+            result = action(payload)
+        except Exception as e:
+            self.logger.exception("Action for %s failed: %s", self._state, e)
+            result = ('error', str(e))
+        if result is not None and not self._stopped.is_set():
+            event, payload = result
+            self._events.put(_Event(event, payload, generation))
+
+    def _dispatch(self):
+        while not self._stopped.is_set():
+            event = self._events.get()
+            if event is None:
+                break
+
+            # Results of actions belonging to a state the machine has left
+            if event.generation is not None and event.generation != self._generation:
+                self.dropped += 1
+                continue
+
+            previous = self._state
+            state = self.transitions.get((previous, event.name))
+            if state is None:
+                self.dropped += 1
+                self.logger.debug("Ignoring %s in state %s", event.name, previous)
+                continue
+
+            with self._changed:
+                self._state = state
+                self._generation += 1
+                self._changed.notify_all()
+            self._enter(state, event.payload)
+
+            latency_ms = (time.perf_counter() - event.posted_at) * 1000
+            self._history.append((previous, event.name, state, latency_ms))
+            record = self._latencies[(previous, event.name, state)]
+            record[0] += 1
+            record[1] += latency_ms
+            record[2] = max(record[2], latency_ms)
+            self.logger.info("%s --%s--> %s in %.2f ms", previous, event.name, state, latency_ms)
+
+    def stats(self):
+        """Return transition counts and latencies.
+
+        Latency is measured from posting the event to the new state's action
+        being handed to the worker pool.
+
+        Returns:
+            dict: Current state, dropped events, per-transition count and
+                mean/max latency in ms, and recent transitions
+        """
+        transitions = {}
+        for (previous, event, state), (count, total_ms, max_ms) in list(self._latencies.items()):
+            transitions[f"{previous} --{event}--> {state}"] = {
+                'count': count,
+                'mean_ms': total_ms / count,
+                'max_ms': max_ms,
+            }
+        return {
+            'state': self._state,
+            'dropped': self.dropped,
+            'transitions': transitions,
+            'recent': list(self._history)[-10:],
+        }
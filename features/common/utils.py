@@ -6,23 +6,53 @@ import sys
 import threading
 import wave
 
-import pyaudio
-import pyttsx3
 from dotenv import load_dotenv
 import shutil
-from aip import AipSpeech
-from datetime import datetime
 from pathlib import Path
-import playsound
-import cv2
-from features.speech_recognizer import RecognizeSpeech
+from features.common.services import get_speech_recognizer
+from features.speech import SpeechConfig, SpeechPriority, get_speech_output
 
 load_dotenv()
 
-# Baidu API credentials
-APP_ID = os.getenv('BAIDU_APP_ID')
-API_KEY = os.getenv('BAIDU_API_KEY')
-SECRET_KEY = os.getenv('BAIDU_SECRET_KEY')
+# Fixed phrases spoken every session, synthesized ahead of time
+KNOWN_PHRASES = [
+    "你好！有什么我可以帮您？",
+    "等待唤醒...",
+    "拜拜，下次再见！",
+    "好的，正在处理空调指令。",
+]
+
+_audio_interface = None
+_audio_lock = threading.Lock()
+
+
+def get_audio_interface():
+    """Return the process-wide PyAudio instance, initializing PortAudio on first use.
+
+    Initializing PortAudio enumerates every audio device, which takes a
+    noticeable time on the Pi, so it is done once and shared by all streams.
+
+    Returns:
+        pyaudio.PyAudio: Shared PyAudio instance
+    """
+    global _audio_interface
+    with _audio_lock:
+        if _audio_interface is None:
+            import pyaudio
+            _audio_interface = pyaudio.PyAudio()
+        return _audio_interface
+
+
+def init_audio_capture():
+    """Initialize PortAudio and check that a microphone is available.
+
+    Returns:
+        dict: Info of the default input device
+
+    Raises:
+        IOError: If there is no input device
+    """
+    return get_audio_interface().get_default_input_device_info()
 
 
 def create_directory_if_not_exists(directory: str):
@@ -44,6 +74,8 @@ def copy_image_to_directory(image_path: str, target_dir: str):
 
 def _draw_face_annotations(frame, top, right, bottom, left, display_text):
     """Draw stable bounding box and text for detected faces"""
+    import cv2
+
     # Calculate box thickness based on frame size
     thickness = max(1, min(2, int(frame.shape[1] / 640)))
 
@@ -89,68 +121,114 @@ def _draw_face_annotations(frame, top, right, bottom, left, display_text):
     )
 
 
-def read_text_baidu(
-        text,
-        baidu_app_id=os.getenv('BAIDU_APP_ID'),
-        baidu_api_key=os.getenv('BAIDU_API_KEY'),
-        baidu_secret_key=os.getenv('BAIDU_SECRET_KEY'),
-        temp_audio_dir='temp_audio'
-):
+def read_text_baidu(text, priority=SpeechPriority.ANSWER, barge_in=False):
     """
-    Convert text to speech using Baidu TTS and play the audio.
+    Speak text through the shared speech output service (Baidu TTS, offline fallback).
+
+    Blocks until the text has been spoken so the microphone does not pick it up.
+
+    Args:
+        text (str): Text to be read.
+        priority (int): One of the SpeechPriority values.
+        barge_in (bool): Stop speaking early if the user starts talking.
+    """
+    request = get_speech_output().say(text, priority=priority)
+    if barge_in:
+        wait_with_barge_in(request)
+    else:
+        request.wait()
+
+
+def read_texts_baidu(texts, priority=SpeechPriority.ANSWER, barge_in=True):
+    """
+    Speak several sentences in order, synthesizing the next ones while the current one plays.
 
     Args:
-        text (str): Text to be converted to speech.
-        app_id (str): Baidu APP ID.
-        api_key (str): Baidu API Key.
-        secret_key (str): Baidu Secret Key.
-        temp_audio_dir (str): Directory to save temporary audio files.
-        :param temp_audio_dir: temporary audio directory
-        :param baidu_secret_key: baidu secret key
-        :param baidu_api_key: baidu api key
-        :param text: text to be read
-        :param baidu_app_id: baidu app id
+        texts (iterable): Sentences to be read.
+        priority (int): One of the SpeechPriority values.
+        barge_in (bool): Stop speaking early if the user starts talking.
+    """
+    request = get_speech_output().say_many(list(texts), priority=priority)
+    if barge_in:
+        wait_with_barge_in(request)
+    else:
+        request.wait()
+
+
+def read_stream_baidu(sentences, priority=SpeechPriority.ANSWER, barge_in=True):
     """
+    Speak sentences as they are produced, e.g. a streaming chat reply.
 
-    # Check if the credentials are not None
-    if not all([baidu_app_id, baidu_api_key, baidu_secret_key]):
-        raise ValueError("Baidu API credentials are not set properly.")
-
-    # Initialize Baidu Speech Client
-    client = AipSpeech(baidu_app_id.strip(), baidu_api_key.strip(), baidu_secret_key.strip())
-
-    # Create temp directory if it doesn't exist
-    temp_audio_path = Path(temp_audio_dir)
-    temp_audio_path.mkdir(exist_ok=True)
-
-    # Synthesize speech
-    result = client.synthesis(text, 'zh', 1, {
-        'spd': 5,  # Speed
-        'pit': 5,  # Pitch
-        'vol': 5,  # Volume
-        'per': 4  # Voice type
-    })
-
-    # Check if synthesis was successful
-    if not isinstance(result, dict):
-        # Save the audio to a temporary file
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        temp_file = temp_audio_path / f'tts_{timestamp}.mp3'
-        with open(temp_file, 'wb') as f:
-            f.write(result)
-
-        # Play the audio
-        playsound.playsound(str(temp_file), True)
-
-        # Remove the temporary file
-        os.remove(temp_file)
+    Args:
+        sentences (iterable): Generator of sentences.
+        priority (int): One of the SpeechPriority values.
+        barge_in (bool): Stop speaking early if the user starts talking.
+    """
+    request = get_speech_output().say_stream(sentences, priority=priority)
+    if barge_in:
+        wait_with_barge_in(request)
     else:
-        print("Error in speech synthesis:", result)
+        request.wait()
+
+
+def wait_with_barge_in(request, threshold=SpeechConfig.BARGE_IN_THRESHOLD,
+                       min_chunks=SpeechConfig.BARGE_IN_CHUNKS):
+    """
+    Wait for a speech request to finish, listening for the user talking over it.
+
+    The threshold sits well above the silence threshold so the mirror's own
+    voice picked up by the microphone does not trigger a barge-in.
+
+    Args:
+        request (SpeechRequest): Request returned by the speech output service.
+        threshold (int): RMS energy that counts as the user speaking.
+        min_chunks (int): Consecutive loud chunks required.
+
+    Returns:
+        bool: True if the user barged in
+    """
+    CHUNK = 512
+    RATE = 16000
+    try:
+        import pyaudio
+        p = get_audio_interface()
+        stream = p.open(format=pyaudio.paInt16, channels=1, rate=RATE, input=True, frames_per_buffer=CHUNK)
+    except Exception as e:
+        print(f"Barge-in listening unavailable: {e}")
+        request.wait()
+        return False
+
+    loud_chunks = 0
+    try:
+        while not request.done.is_set():
+            data = stream.read(CHUNK, exception_on_overflow=False)
+            if audioop.rms(data, 2) >= threshold:
+                loud_chunks += 1
+                if loud_chunks >= min_chunks:
+                    get_speech_output().barge_in()
+                    return True
+            else:
+                loud_chunks = 0
+        return False
+    finally:
+        stream.stop_stream()
+        stream.close()
+
+
+def prewarm_tts_cache(phrases=None):
+    """Synthesize the fixed session phrases into the TTS cache ahead of time.
+
+    Args:
+        phrases (list): Phrases to pre-warm, defaults to KNOWN_PHRASES
+
+    Returns:
+        int: Number of phrases newly synthesized
+    """
+    return get_speech_output().prewarm(phrases or KNOWN_PHRASES)
 
 
 def user_speech_recognition() -> str:
-    speech_recognition = RecognizeSpeech()
-    recognized_text = speech_recognition.recognize_from_microphone()
+    recognized_text = get_speech_recognizer().recognize_from_microphone()
     return recognized_text
 
 
@@ -158,12 +236,13 @@ def user_speech_recognition() -> str:
 
 def record_audio_until_silence():
         CHUNK = 1024
+        import pyaudio
         FORMAT = pyaudio.paInt16
         CHANNELS = 1
         RATE = 16000
         SILENCE_THRESHOLD = 500
         SILENCE_DURATION = 2  # seconds
-        p = pyaudio.PyAudio()
+        p = get_audio_interface()
 
         stream = p.open(format=FORMAT, channels=CHANNELS, rate=RATE, input=True, frames_per_buffer=CHUNK)
 
@@ -218,43 +297,27 @@ def record_audio_until_silence():
         finally:
             stream.stop_stream()
             stream.close()
-            p.terminate()
 
 
 def speech_to_text(audio):
-    client = AipSpeech(APP_ID, API_KEY, SECRET_KEY)
+    """Recognize a recorded WAV file, in the cloud or on-device depending on the network.
 
-    with open(audio, "rb") as f:
-        audio_data = f.read()
-    result = client.asr(audio_data, "wav", 16000, {"dev_pid": 1537})  # 1537 for Mandarin
-    if "result" in result:
-        return result["result"][0]
-    else:
-        print("Error in STT:", result)
-        return None
+    Goes through the shared recognition router, so the wake word is still
+    heard while Baidu is unreachable.
+    """
+    with wave.open(audio, "rb") as wf:
+        pcm_data = wf.readframes(wf.getnframes())
+    return get_speech_recognizer().asr_router.recognize(pcm_data)
 
 
 # Text-to-Speech (TTS)
-def speak_text(text):
-    engine = pyttsx3.init()
-    engine.setProperty("voice", "HKEY_LOCAL_MACHINE\\SOFTWARE\\Microsoft\\Speech\\Voices\\Tokens\\TTS_MS_ZH-CN_HUIHUI_11.0")
-    engine.setProperty("rate", 150)
-    engine.say(text)
-    engine.runAndWait()
-    engine.stop()
-
-
-def text_to_speech_chinese(text):
-    t = threading.Thread(target=speak_text, args=(text,))
-    t.start()
-    t.join(timeout=10)  # Wait 10 seconds max
-
-    if t.is_alive():
-        print("⚠️ Speech timed out. Something went wrong.")
-        # Optional: Kill or cleanup logic here
-        return True
-    else:
-        print("✅ Done speaking.")
+def speak_text(text, priority=SpeechPriority.PROMPT):
+    get_speech_output().say(text, online=False, priority=priority)
+
+
+def text_to_speech_chinese(text, priority=SpeechPriority.PROMPT):
+    """Queue text on the offline engine and return immediately."""
+    speak_text(text, priority)
 
 
 def audio_to_text():
@@ -0,0 +1,28 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class PresenceConfig:
+    # Camera used for presence detection and face verification
+    CAMERA_INDEX = int(os.getenv("PRESENCE_CAMERA_INDEX", "0"))
+
+    # Idle motion check on small frames
+    IDLE_WIDTH = int(os.getenv("PRESENCE_IDLE_WIDTH", "160"))
+    IDLE_HEIGHT = int(os.getenv("PRESENCE_IDLE_HEIGHT", "120"))
+    IDLE_MAX_FPS = float(os.getenv("PRESENCE_IDLE_MAX_FPS", "4"))
+    MOTION_THRESHOLD = float(os.getenv("PRESENCE_MOTION_THRESHOLD", "6"))  # mean absolute pixel change
+
+    # Speculative recognition once someone approaches
+    ACTIVE_WIDTH = int(os.getenv("PRESENCE_ACTIVE_WIDTH", "640"))
+    ACTIVE_HEIGHT = int(os.getenv("PRESENCE_ACTIVE_HEIGHT", "480"))
+    WARM_SECONDS = float(os.getenv("PRESENCE_WARM_SECONDS", "20"))  # keep encoding after the last motion
+    # A speculative match is re-checked on every active frame; one not confirmed within this
+    # many seconds is discarded, so a face that has left the frame is never accepted
+    RESULT_TTL = float(os.getenv("PRESENCE_RESULT_TTL", "3"))
+
+    # Fraction of one core the detector may use while idle and while encoding speculatively;
+    # verification after the wake word runs at full rate
+    IDLE_DUTY_CYCLE = float(os.getenv("PRESENCE_IDLE_DUTY_CYCLE", "0.05"))
+    ACTIVE_DUTY_CYCLE = float(os.getenv("PRESENCE_ACTIVE_DUTY_CYCLE", "0.5"))
@@ -3,17 +3,13 @@ import cv2
 import numpy as np
 from collections import defaultdict
 import shutil
-import pyttsx3
 from datetime import datetime
 import logging
-import threading
-import queue
 import json
 from pathlib import Path
 from typing import List
-import time
 
-from features.common.utils import read_text_baidu
+from features.speech import SpeechPriority, get_speech_output
 
 
 class FaceRecognition:
@@ -41,11 +37,10 @@ class FaceRecognition:
         self.known_face_names = []
         self.face_encodings_dict = defaultdict(list)
         self.last_recognition_time = defaultdict(float)
+        self.last_recognized_name = None
 
-        # Set up voice engine in a separate thread
-        self.voice_queue = queue.Queue()
-        self.engine = pyttsx3.init()
-        self.setup_voice_engine()
+        # Shared speech output service
+        self.speech_output = get_speech_output()
 
         # Set up logging
         self._setup_logging()
@@ -53,11 +48,6 @@ class FaceRecognition:
         # Load known faces
         self.load_known_faces()
 
-        # Start voice processing thread
-        self.voice_thread = threading.Thread(target=self.
-                                             _process_voice_queue, daemon=True)
-        self.voice_thread.start()
-
     def _setup_logging(self):
         """Configure logging system"""
         self.log_dir.mkdir(exist_ok=True)
@@ -73,24 +63,6 @@ class FaceRecognition:
         )
         self.logger = logging.getLogger(__name__)
 
-    def setup_voice_engine(self):
-        """Configure text-to-speech engine with optimal settings"""
-        voices = self.engine.getProperty('voices')
-        self.engine.setProperty('voice', voices[1].id)  # Female voice
-        self.engine.setProperty('rate', 150)  # Slightly faster than default
-        self.engine.setProperty('volume', 0.8)  # 80% volume
-
-    def _process_voice_queue(self):
-        """Process voice messages in a separate thread"""
-        while True:
-            try:
-                message = self.voice_queue.get()
-                self.engine.say(message)
-                self.engine.runAndWait()
-                self.voice_queue.task_done()
-            except Exception as e:
-                self.logger.error(f"Voice processing error: {e}")
-
     def load_known_faces(self):
         """Load known faces with improved error handling and validation"""
         self.known_faces_dir.mkdir(exist_ok=True)
@@ -179,6 +151,54 @@ class FaceRecognition:
 
         return successful_adds
 
+    def recognize_frame(self, frame, confidence_threshold: float = 0.6, scale: float = 0.5):
+        """Recognize a known person in one camera frame without announcing it.
+
+        Args:
+            frame: BGR camera frame
+            confidence_threshold: Minimum confidence (0-1) to accept a match
+            scale: Factor the frame is resized by before detection
+
+        Returns:
+            Name of the recognized person, or None
+        """
+        # Resize frame for faster processing
+        small_frame = cv2.resize(frame, (0, 0), fx=scale, fy=scale) if scale != 1 else frame
+        rgb_small_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
+
+        face_locations = face_recognition.face_locations(
+            rgb_small_frame,
+            model="cnn" if self._has_gpu() else "hog"
+        )
+        face_encodings = face_recognition.face_encodings(rgb_small_frame, face_locations)
+
+        # Process each face
+        for face_encoding in face_encodings:
+            matches = face_recognition.compare_faces(
+                self.known_face_encodings,
+                face_encoding,
+                tolerance=self.recognition_threshold
+            )
+            face_distances = face_recognition.face_distance(self.known_face_encodings, face_encoding)
+
+            if len(face_distances) > 0:
+                best_match_index = np.argmin(face_distances)
+                confidence = (1 - face_distances[best_match_index]) * 100
+
+                if matches[best_match_index] and confidence >= confidence_threshold * 100:
+                    name = self.known_face_names[best_match_index]
+                    self.last_recognized_name = name
+
+                    # Log the recognition
+                    self.logger.info(f"Recognized: {name} with confidence {confidence:.1f}%")
+                    return name
+
+        return None
+
+    def announce(self, name: str):
+        """Greet a recognized person"""
+        self.speech_output.say(f"您好 {name}", priority=SpeechPriority.GREETING)
+
     def start_recognition(self, confidence_threshold: float = 0.6) -> bool:
         """Start real-time face recognition without displaying the camera frame
         Returns True if a known person is recognized, False otherwise"""
@@ -205,51 +225,16 @@ class FaceRecognition:
 
             # Process face detection every N frames
             if frame_count % recognition_interval == 0:
-                # Resize frame for faster processing
-                small_frame = cv2.resize(frame, (0, 0), fx=0.5, fy=0.5)
-                rgb_small_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
-
-                face_locations = face_recognition.face_locations(
-                    rgb_small_frame,
-                    model="cnn" if self._has_gpu() else "hog"
-                )
-                face_encodings = face_recognition.face_encodings(rgb_small_frame, face_locations)
-
-                # Process each face
-                for (top, right, bottom, left), face_encoding in zip(face_locations, face_encodings):
-                    # Scale back up face locations
-                    top *= 2
-                    right *= 2
-                    bottom *= 2
-                    left *= 2
-
-                    matches = face_recognition.compare_faces(
-                        self.known_face_encodings,
-                        face_encoding,
-                        tolerance=self.recognition_threshold
-                    )
-                    face_distances = face_recognition.face_distance(self.known_face_encodings, face_encoding)
-
-                    if len(face_distances) > 0:
-                        best_match_index = np.argmin(face_distances)
-                        confidence = (1 - face_distances[best_match_index]) * 100
-
-                        if matches[best_match_index] and confidence >= confidence_threshold * 100:
-                            name = self.known_face_names[best_match_index]
-
-                            # Log the recognition
-                            self.logger.info(f"Recognized: {name} with confidence {confidence:.1f}%")
-
-                            # Voice announcement
-                            read_text_baidu(f"您好 {name}")
-                            # self.voice_queue.put(f"Hello {name}")
-                            time.sleep(1)
-
-                            # Clean up resources before returning
-                            video_capture.release()
-
-                            # Return True since we recognized someone
-                            return True
+                name = self.recognize_frame(frame, confidence_threshold)
+                if name:
+                    # Voice announcement
+                    self.announce(name)
+
+                    # Clean up resources before returning
+                    video_capture.release()
+
+                    # Return True since we recognized someone
+                    return True
 
         # If we've reached the maximum attempts without recognition
         video_capture.release()
@@ -0,0 +1,281 @@
+import logging
+import threading
+import time
+
+from .config import PresenceConfig
+
+
+class PresenceDetector:
+    """Watches for someone approaching while the mirror is idle.
+
+    While idle the camera is read at low resolution and low rate, and frames
+    are compared for motion. When someone approaches, the camera switches to
+    recognition resolution and faces are encoded speculatively, so by the time
+    the wake word is confirmed a recognition result is usually waiting. The
+    result is re-checked on every active frame and dropped as soon as the
+    face is no longer recognized, so only someone still in front of the
+    mirror is accepted.
+    Every cycle sleeps long enough that the detector's busy time stays within
+    the configured duty cycle.
+    """
+
+    # Seconds between attempts to open an unavailable camera
+    RETRY_INTERVAL = 5
+
+    def __init__(self, get_face_system, camera_index=PresenceConfig.CAMERA_INDEX,
+                 idle_duty_cycle=PresenceConfig.IDLE_DUTY_CYCLE,
+                 active_duty_cycle=PresenceConfig.ACTIVE_DUTY_CYCLE):
+        """Initialize the detector without opening the camera.
+
+        Args:
+            get_face_system (callable): Returns the loaded FaceRecognition gallery
+            camera_index (int): OpenCV camera index
+            idle_duty_cycle (float): Fraction of time spent working while idle
+            active_duty_cycle (float): Fraction of time spent working while
+                encoding speculatively
+        """
+        self.get_face_system = get_face_system
+        self.camera_index = camera_index
+        self.idle_duty_cycle = idle_duty_cycle
+        self.active_duty_cycle = active_duty_cycle
+        self.logger = logging.getLogger(__name__)
+
+        self.available = True
+        self._mode = 'idle'  # idle, active or paused
+        self._demand = 0  # callers waiting in recognize()
+        self._active_until = 0.0
+        self._result = None  # (name, monotonic time)
+        self._capture = None
+        self._resolution = None
+        self._previous = None
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = None
+
+        self.frames = 0
+        self.motion_triggers = 0
+        self.speculative_recognitions = 0
+        self.speculative_hits = 0
+        self.busy_time = 0.0
+        self._started_at = None
+
+    def start(self):
+        """Start watching on a background thread."""
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._started_at = time.monotonic()
+            self._thread = threading.Thread(target=self._run, name='presence', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop watching and release the camera."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+    def pause(self):
+        """Release the camera, e.g. during a conversation."""
+        with self._cond:
+            self._mode = 'paused'
+            self._result = None
+            self._cond.notify_all()
+
+    def resume(self):
+        """Go back to idle motion checks after pause()."""
+        with self._cond:
+            if self._mode == 'paused':
+                self._mode = 'idle'
+                self._cond.notify_all()
+
+    def _fresh_result_locked(self):
+        if self._result is None:
+            return None
+        name, recognized_at = self._result
+        if time.monotonic() - recognized_at > PresenceConfig.RESULT_TTL:
+            self._result = None
+            return None
+        return name
+
+    def recognize(self, timeout=60):
+        """Return the recognized person, waiting for recognition if needed.
+
+        A speculative result confirmed within the last few seconds, i.e. a
+        face still in frame, is returned at once; otherwise the detector encodes frames at full rate until someone is
+        recognized or the timeout passes. The result is consumed.
+
+        Args:
+            timeout (float): Seconds to wait
+
+        Returns:
+            str: Name of the recognized person, None if nobody was recognized
+        """
+        with self._cond:
+            name = self._fresh_result_locked()
+            if name is not None:
+                self.speculative_hits += 1
+                self._result = None
+                return name
+
+            self._demand += 1
+            self._mode = 'active'
+            self._cond.notify_all()
+            try:
+                self._cond.wait_for(lambda: (self._stopped or not self.available
+                                             or self._fresh_result_locked() is not None), timeout)
+                name = self._fresh_result_locked()
+                self._result = None
+                return name
+            finally:
+                self._demand -= 1
+
+    def _open(self, mode):
+        import cv2
+
+        if self._capture is None:
+            capture = cv2.VideoCapture(self.camera_index)
+            if not capture.isOpened():
+                if self.available:
+                    self.logger.error("Could not open camera %s for presence detection", self.camera_index)
+                self.available = False
+                return False
+            capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # read the newest frame, not a stale buffered one
+            self._capture = capture
+            self._resolution = None
+            self.available = True
+
+        # The camera stays open (warm) across modes; only the resolution changes
+        resolution = ((PresenceConfig.ACTIVE_WIDTH, PresenceConfig.ACTIVE_HEIGHT) if mode == 'active'
+                      else (PresenceConfig.IDLE_WIDTH, PresenceConfig.IDLE_HEIGHT))
+        if resolution != self._resolution:
+            self._capture.set(cv2.CAP_PROP_FRAME_WIDTH, resolution[0])
+            self._capture.set(cv2.CAP_PROP_FRAME_HEIGHT, resolution[1])
+            self._resolution = resolution
+        return True
+
+    def _release(self):
+        if self._capture is not None:
+            self._capture.release()
+            self._capture = None
+            self._previous = None
+
+    def _motion(self, frame):
+        """Return True if the frame differs enough from the previous one."""
+        import cv2
+
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if gray.shape[1] != PresenceConfig.IDLE_WIDTH:
+            gray = cv2.resize(gray, (PresenceConfig.IDLE_WIDTH, PresenceConfig.IDLE_HEIGHT))
+        previous, self._previous = self._previous, gray
+        if previous is None:
+            return False
+        return cv2.absdiff(gray, previous).mean() >= PresenceConfig.MOTION_THRESHOLD
+
+    def _step(self, mode, demanded):
+        """Process one frame.
+
+        Returns:
+            tuple: (whether a frame was read, whether it was encoded)
+        """
+        ok, frame = self._capture.read()
+        if not ok:
+            return False, False
+        self.frames += 1
+
+        now = time.monotonic()
+        if self._motion(frame):
+            with self._cond:
+                # Movement keeps the camera warm; the first one switches to recognition
+                self._active_until = now + PresenceConfig.WARM_SECONDS
+                if self._mode == 'idle':
+                    self._mode = 'active'
+                    self.motion_triggers += 1
+                    self.logger.info("Presence detected, warming up face recognition")
+
+        # Idle frames are too small to recognize; the next frame is read at full resolution
+        if mode != 'active':
+            return True, False
+
+        # Every active frame is encoded, also after a match, to confirm the face is still there
+        name = self.get_face_system().recognize_frame(frame)
+        with self._cond:
+            # A result that arrives after pause() belongs to a finished session
+            if self._mode != 'paused':
+                previous = self._fresh_result_locked()
+                self._result = (name, time.monotonic()) if name is not None else None
+                if name is not None:
+                    if not demanded and name != previous:
+                        self.speculative_recognitions += 1
+                    self._cond.notify_all()
+
+            if self._mode == 'active' and not self._demand and now > self._active_until:
+                self._mode = 'idle'
+                self._result = None
+        return True, True
+
+    def _delay(self, mode, work, encoded):
+        """Seconds to sleep after ``work`` seconds of processing to keep within the duty cycle."""
+        duty = self.active_duty_cycle if mode == 'active' else self.idle_duty_cycle
+        delay = work * (1 - duty) / duty
+        if not encoded:
+            # Only watching for motion while idle
+            delay = max(delay, 1 / PresenceConfig.IDLE_MAX_FPS - work)
+        return delay
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._mode == 'paused' and not self._stopped:
+                    self._release()
+                    self._cond.wait()
+                if self._stopped:
+                    break
+                mode = self._mode
+                demanded = self._demand > 0
+
+            start = time.perf_counter()
+            opened = ok = encoded = False
+            try:
+                opened = self._open(mode)
+                if opened:
+                    ok, encoded = self._step(mode, demanded)
+            except Exception as e:
+                self.logger.error("Presence detection error: %s", e)
+            work = time.perf_counter() - start
+            self.busy_time += work
+
+            if not opened:
+                with self._cond:
+                    self._cond.notify_all()  # recognize() gives up on an unavailable camera
+                    self._cond.wait_for(lambda: self._stopped or self._mode == 'paused', self.RETRY_INTERVAL)
+            elif demanded:
+                # Verification runs at full rate
+                if not ok:
+                    time.sleep(0.01)
+            else:
+                with self._cond:
+                    # Woken early by recognize(), pause() and stop()
+                    self._cond.wait_for(lambda: self._stopped or self._demand or self._mode == 'paused',
+                                        self._delay(mode, work, encoded))
+
+        self._release()
+
+    def stats(self):
+        """Return frame counts, speculative hits and the measured duty cycle.
+
+        Returns:
+            dict: Detector counters
+        """
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        with self._cond:
+            return {
+                'mode': self._mode,
+                'available': self.available,
+                'frames': self.frames,
+                'motion_triggers': self.motion_triggers,
+                'speculative_recognitions': self.speculative_recognitions,
+                'speculative_hits': self.speculative_hits,
+                'duty_cycle': self.busy_time / elapsed if elapsed else 0.0,
+            }
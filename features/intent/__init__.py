@@ -0,0 +1,15 @@
+# Import essential classes for convenient package-level access
+from .matcher import AhoCorasick
+from .engine import Intent, IntentEngine, normalize_utterance
+from .skills import BUILTIN_INTENTS, create_intent_engine, parse_number
+
+# Define what gets exposed when importing the package
+__all__ = [
+    "AhoCorasick",
+    "BUILTIN_INTENTS",
+    "Intent",
+    "IntentEngine",
+    "create_intent_engine",
+    "normalize_utterance",
+    "parse_number"
+]
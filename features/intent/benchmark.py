@@ -0,0 +1,92 @@
+"""Measure intent resolution accuracy and latency over an utterance corpus.
+
+Usage:
+    python -m features.intent.benchmark [corpus.tsv] [--repeat N]
+
+The corpus has one utterance per line followed by a tab and the expected
+intent name, or "-" for utterances that should fall through to the LLM.
+"""
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+from .skills import create_intent_engine
+
+DEFAULT_CORPUS = Path(__file__).parent / 'data' / 'utterances.tsv'
+
+
+def load_corpus(path):
+    """Load (utterance, expected intent) pairs.
+
+    Args:
+        path (str): Corpus file
+
+    Returns:
+        list: (text, intent name or None) pairs
+    """
+    corpus = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if not line or line.startswith('#'):
+                continue
+            text, _, expected = line.partition('\t')
+            expected = expected.strip()
+            corpus.append((text, None if expected in ('', '-') else expected))
+    return corpus
+
+
+def run_benchmark(corpus, repeat=1000):
+    """Resolve every utterance repeatedly and collect accuracy and timings.
+
+    Args:
+        corpus (list): (text, expected intent) pairs
+        repeat (int): Timing repetitions per utterance
+
+    Returns:
+        dict: Accuracy, mismatches and per-utterance latency percentiles in microseconds
+    """
+    engine = create_intent_engine()
+    mismatches = []
+    timings = []
+
+    for text, expected in corpus:
+        intent = engine.parse(text)
+        name = intent.name if intent else None
+        if name != expected:
+            mismatches.append((text, expected, name))
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            engine.parse(text)
+        timings.append((time.perf_counter() - start) / repeat * 1e6)
+
+    timings.sort()
+    return {
+        'utterances': len(corpus),
+        'accuracy': 1 - len(mismatches) / len(corpus) if corpus else 0.0,
+        'mismatches': mismatches,
+        'mean_us': statistics.mean(timings) if timings else 0.0,
+        'p50_us': timings[len(timings) // 2] if timings else 0.0,
+        'max_us': timings[-1] if timings else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('corpus', nargs='?', default=DEFAULT_CORPUS)
+    parser.add_argument('--repeat', type=int, default=1000)
+    args = parser.parse_args()
+
+    result = run_benchmark(load_corpus(args.corpus), args.repeat)
+    print(f"Utterances: {result['utterances']}")
+    print(f"Accuracy:   {result['accuracy']:.1%}")
+    print(f"Latency:    mean {result['mean_us']:.1f}us, p50 {result['p50_us']:.1f}us, "
+          f"max {result['max_us']:.1f}us")
+    for text, expected, actual in result['mismatches']:
+        print(f"  {text!r}: expected {expected}, got {actual}")
+
+
+if __name__ == '__main__':
+    main()
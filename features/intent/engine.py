@@ -0,0 +1,181 @@
+import logging
+import threading
+import time
+import unicodedata
+
+from .matcher import AhoCorasick, longest_matches
+
+
+def normalize_utterance(text):
+    """Normalize recognized text before matching.
+
+    Folds full-width characters, lowercases and removes whitespace so keyword
+    tables only need one spelling.
+
+    Args:
+        text (str): Recognized text
+
+    Returns:
+        str: Normalized text
+    """
+    text = unicodedata.normalize('NFKC', text).lower()
+    return ''.join(text.split())
+
+
+class Intent:
+    """A resolved intent with its extracted slots."""
+
+    def __init__(self, name, text, slots=None, keyword=None):
+        """Initialize the intent.
+
+        Args:
+            name (str): Intent name
+            text (str): Normalized utterance
+            slots (dict): Extracted slot values
+            keyword (str): Keyword that triggered the intent
+        """
+        self.name = name
+        self.text = text
+        self.slots = slots or {}
+        self.keyword = keyword
+
+    def __repr__(self):
+        return f"Intent({self.name!r}, slots={self.slots!r})"
+
+
+class IntentEngine:
+    """Resolves utterances to registered intents without a network round-trip.
+
+    Keywords and slot synonyms of every intent are compiled into a single
+    Aho-Corasick automaton, so resolution is one pass over the utterance.
+    Overlapping keywords are reduced to the leftmost-longest ones; when
+    several intents still match, the one registered first wins, which keeps
+    the precedence of the old if/elif chain.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._intents = {}  # name -> {'order', 'handler', 'extractors'}
+        self._matcher = AhoCorasick()
+        self._lock = threading.Lock()
+
+        self.resolved = 0
+        self.unresolved = 0
+        self.match_time = 0.0
+
+    def register(self, name, keywords, handler=None, slots=None, extractors=None, require_slots=False):
+        """Register an intent.
+
+        Args:
+            name (str): Intent name
+            keywords (list): Phrases that trigger the intent
+            handler (callable): handler(intent, **context) run by dispatch
+            slots (dict): Slot name -> {synonym: value} tables
+            extractors (list): extractor(text, slots) callables that fill slots
+                which cannot be expressed as synonym tables, such as numbers
+            require_slots (bool): Only resolve when at least one slot was
+                filled, for keywords too generic to trigger the intent alone
+        """
+        with self._lock:
+            if name in self._intents:
+                raise ValueError(f"Intent already registered: {name}")
+            self._intents[name] = {
+                'order': len(self._intents),
+                'handler': handler,
+                'extractors': list(extractors or []),
+                'require_slots': require_slots,
+            }
+            for keyword in keywords:
+                self._matcher.add(normalize_utterance(keyword), ('intent', name, keyword))
+            for slot, table in (slots or {}).items():
+                for synonym, value in table.items():
+                    self._matcher.add(normalize_utterance(synonym), ('slot', name, (slot, value)))
+
+    def set_handler(self, name, handler):
+        """Attach or replace the handler of a registered intent.
+
+        Args:
+            name (str): Intent name
+            handler (callable): handler(intent, **context)
+        """
+        self._intents[name]['handler'] = handler
+
+    def parse(self, text):
+        """Resolve an utterance to an intent.
+
+        Args:
+            text (str): Recognized text
+
+        Returns:
+            Intent: The matched intent, or None if no keyword matched
+        """
+        start = time.perf_counter()
+        text = normalize_utterance(text or '')
+        matches = self._matcher.find_all(text)
+
+        # Overlapping keywords are resolved before precedence applies, so the 气温
+        # straddling "冷气温度" does not make it a weather question
+        keywords = longest_matches([m for m in matches if m[2][0] == 'intent'])
+        candidates = {}  # intent name -> first keyword matched
+        for _, _, (_, name, keyword) in keywords:
+            candidates.setdefault(name, keyword)
+
+        intent = None
+        for name in sorted(candidates, key=lambda name: self._intents[name]['order']):
+            slots = self._extract_slots(name, text, matches)
+            if slots or not self._intents[name]['require_slots']:
+                intent = Intent(name, text, slots, candidates[name])
+                break
+
+        self.match_time += time.perf_counter() - start
+        if intent is None:
+            self.unresolved += 1
+        else:
+            self.resolved += 1
+        return intent
+
+    def _extract_slots(self, name, text, matches):
+        # Keywords take part in overlap resolution so "空调高风" is not read as "调高"
+        own_matches = [m for m in matches if m[2][1] == name]
+        slots = {}
+        for _, _, (kind, _, value) in longest_matches(own_matches):
+            if kind == 'slot':
+                slots.setdefault(*value)
+        for extractor in self._intents[name]['extractors']:
+            extractor(text, slots)
+        return slots
+
+    def dispatch(self, text, **context):
+        """Resolve an utterance and run the intent's handler.
+
+        Args:
+            text (str): Recognized text
+            **context: Passed through to the handler
+
+        Returns:
+            Intent: The handled intent, or None if no intent with a handler matched
+        """
+        intent = self.parse(text)
+        if intent is None:
+            return None
+
+        handler = self._intents[intent.name]['handler']
+        if handler is None:
+            return None
+
+        self.logger.info(f"Resolved locally: {intent}")
+        handler(intent, **context)
+        return intent
+
+    def stats(self):
+        """Return resolution counts and mean match time.
+
+        Returns:
+            dict: Resolved and unresolved counts and mean match time in microseconds
+        """
+        total = self.resolved + self.unresolved
+        return {
+            'resolved': self.resolved,
+            'unresolved': self.unresolved,
+            'mean_match_us': self.match_time / total * 1e6 if total else 0.0,
+        }
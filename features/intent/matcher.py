@@ -0,0 +1,101 @@
+from collections import deque
+
+
+class AhoCorasick:
+    """Multi-pattern substring matcher.
+
+    All patterns are compiled into one automaton, so a single pass over the
+    text finds every occurrence of every pattern regardless of how many
+    keywords are registered.
+    """
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._patterns = [[]]  # state -> [(length, value)] of patterns ending exactly here
+        self._output = [[]]  # state -> patterns ending here, including via failure links
+        self._built = True
+
+    def add(self, pattern, value):
+        """Add a pattern.
+
+        Args:
+            pattern (str): Substring to find
+            value: Value reported for each occurrence
+        """
+        if not pattern:
+            return
+        state = 0
+        for ch in pattern:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._patterns.append([])
+                self._output.append([])
+                self._goto[state][ch] = next_state
+            state = next_state
+        self._patterns[state].append((len(pattern), value))
+        self._built = False
+
+    def build(self):
+        """Compute failure links; called automatically before the first search."""
+        queue = deque()
+        for state in self._goto[0].values():
+            self._fail[state] = 0
+            self._output[state] = list(self._patterns[state])
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(ch, 0)
+                # Patterns ending at the failure state also end here
+                self._output[next_state] = self._patterns[next_state] + self._output[self._fail[next_state]]
+        self._built = True
+
+    def find_all(self, text):
+        """Find every pattern occurrence in a text.
+
+        Args:
+            text (str): Text to search
+
+        Returns:
+            list: (start, end, value) for each occurrence, ordered by end position
+        """
+        if not self._built:
+            self.build()
+
+        goto, fail, output = self._goto, self._fail, self._output
+        matches = []
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, value in output[state]:
+                matches.append((i + 1 - length, i + 1, value))
+        return matches
+
+
+def longest_matches(matches):
+    """Select non-overlapping matches, preferring the leftmost then longest.
+
+    Args:
+        matches (list): (start, end, value) tuples
+
+    Returns:
+        list: Selected matches in text order
+    """
+    selected = []
+    last_end = 0
+    for start, end, value in sorted(matches, key=lambda m: (m[0], m[0] - m[1])):
+        if start >= last_end:
+            selected.append((start, end, value))
+            last_end = end
+    return selected
@@ -0,0 +1,122 @@
+import re
+
+from .engine import IntentEngine
+
+CHINESE_DIGITS = {'零': 0, '一': 1, '二': 2, '两': 2, '三': 3, '四': 4,
+                  '五': 5, '六': 6, '七': 7, '八': 8, '九': 9}
+NUMBER_PATTERN = re.compile(r'\d+|[零一二两三四五六七八九十]+')
+
+
+def parse_number(token):
+    """Convert an Arabic or Chinese numeral below 100 to an int.
+
+    Args:
+        token (str): Numeral such as "25", "二十五" or "十八"
+
+    Returns:
+        int: Parsed value, or None if the token is not a numeral
+    """
+    if token.isdigit():
+        return int(token)
+    if '十' in token:
+        tens, _, ones = token.partition('十')
+        if len(tens) > 1 or len(ones) > 1:
+            return None
+        value = CHINESE_DIGITS.get(tens, 1 if not tens else None)
+        unit = CHINESE_DIGITS.get(ones, 0 if not ones else None)
+        if value is None or unit is None:
+            return None
+        return value * 10 + unit
+    if len(token) == 1:
+        return CHINESE_DIGITS.get(token)
+    return None
+
+
+def extract_temperature(text, slots):
+    """Fill the AC temperature slot from a number in the utterance.
+
+    Absolute targets within 16-30 set ``temperature``; numbers given with
+    a raise/lower verb set ``temperature_delta`` instead.
+
+    Args:
+        text (str): Normalized utterance
+        slots (dict): Slots extracted so far, updated in place
+    """
+    direction = slots.pop('direction', None)
+    number = None
+    for token in NUMBER_PATTERN.findall(text):
+        number = parse_number(token)
+        if number is not None:
+            break
+
+    if direction is not None:
+        slots['temperature_delta'] = direction * (number if number and number < 16 else 1)
+    elif number is not None and 16 <= number <= 30:
+        slots['temperature'] = number
+
+
+AC_SLOTS = {
+    'power': {'开': 'on', '打开': 'on', '开启': 'on', '启动': 'on',
+              '关': 'off', '关闭': 'off', '关掉': 'off', '关上': 'off'},
+    'mode': {'制冷': 'cool', '冷风': 'cool', '制热': 'heat', '暖风': 'heat',
+             '自动': 'auto', '自动模式': 'auto', '除湿': 'dry', '抽湿': 'dry', '送风': 'fan'},
+    'fan_speed': {'风速自动': 'auto', '自动风': 'auto', '风速低': 'low', '低风': 'low',
+                  '小风': 'low', '风速中': 'medium', '中风速': 'medium',
+                  '风速高': 'high', '高风': 'high', '大风': 'high'},
+    'direction': {'调高': 1, '升高': 1, '高一点': 1, '热一点': 1,
+                  '调低': -1, '降低': -1, '低一点': -1, '冷一点': -1},
+}
+
+# Intents in precedence order, matching the order the assistant used to check them
+BUILTIN_INTENTS = {
+    'weather': {
+        'keywords': ['天气', '气温', '下雨', '下雪', '冷不冷', '热不热', '带伞', '刮风'],
+        'slots': {
+            'day': {'今天': 0, '明天': 1, '后天': 2},
+        },
+    },
+    'time': {
+        # Bare '时间' would catch "我没时间" and "你有时间吗"
+        'keywords': ['几点', '现在时间', '现在是什么时间', '什么时间了', '几时', '钟点'],
+    },
+    'ac': {
+        'keywords': ['空调', '冷气'],
+        'slots': AC_SLOTS,
+        'extractors': [extract_temperature],
+    },
+    # Follow-ups such as "温度26度" or "风速高" that no longer say 空调; only an
+    # actual setting counts, so "外面温度多少" still goes to the LLM
+    'ac_adjust': {
+        'keywords': ['温度', '风速'],
+        'slots': AC_SLOTS,
+        'extractors': [extract_temperature],
+        'require_slots': True,
+    },
+    'goodbye': {
+        'keywords': ['拜拜', '再见', '退下', '没事了'],
+    },
+}
+
+
+def create_intent_engine(handlers=None):
+    """Build an intent engine with the built-in skills registered.
+
+    Args:
+        handlers (dict): Intent name -> handler; intents without a handler
+            are still parsed but not dispatched
+
+    Returns:
+        IntentEngine: The engine
+    """
+    handlers = handlers or {}
+    engine = IntentEngine()
+    for name, spec in BUILTIN_INTENTS.items():
+        engine.register(
+            name,
+            spec['keywords'],
+            handler=handlers.get(name),
+            slots=spec.get('slots'),
+            extractors=spec.get('extractors'),
+            require_slots=spec.get('require_slots', False),
+        )
+    return engine
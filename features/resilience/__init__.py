@@ -0,0 +1,22 @@
+# Import essential classes for convenient package-level access
+from .config import ResilienceConfig
+from .exceptions import CircuitOpenError, RateLimitedError, ResilienceError
+from .token_bucket import TokenBucket
+from .circuit_breaker import CircuitBreaker
+from .retry import backoff_delay, retry_call
+from .policy import ServicePolicy, get_policy, resilience_stats
+
+# Define what gets exposed when importing the package
+__all__ = [
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "RateLimitedError",
+    "ResilienceConfig",
+    "ResilienceError",
+    "ServicePolicy",
+    "TokenBucket",
+    "backoff_delay",
+    "get_policy",
+    "resilience_stats",
+    "retry_call"
+]
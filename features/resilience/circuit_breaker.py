@@ -0,0 +1,85 @@
+import logging
+import threading
+import time
+
+
+class CircuitBreaker:
+    """Stops calling a failing service until it has had time to recover.
+
+    closed: calls go through; consecutive failures are counted
+    open: calls are refused without touching the network
+    half_open: after the reset timeout one trial call is let through; its
+               outcome closes or re-opens the breaker
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name, failure_threshold, reset_timeout):
+        """Initialize a closed breaker.
+
+        Args:
+            name (str): Service name used in logs
+            failure_threshold (int): Consecutive failures that open the breaker
+            reset_timeout (float): Seconds open before a trial call is allowed
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.logger = logging.getLogger(__name__)
+
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+        self.opened = 0
+
+    @property
+    def state(self):
+        """str: Current state, moving from open to half_open once the timeout passes."""
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+            return self._state
+
+    def allow(self):
+        """Decide whether a call may go ahead.
+
+        Returns:
+            bool: False if the breaker is open or a trial call is already running
+        """
+        state = self.state
+        with self._lock:
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self._state != self.CLOSED:
+                self.logger.info(f"Circuit for {self.name} closed")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.opened += 1
+                    self.logger.warning(f"Circuit for {self.name} opened after {self._failures} failures")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def release(self):
+        """Give back a trial slot taken by allow() when the call never ran."""
+        with self._lock:
+            self._trial_running = False
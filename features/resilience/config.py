@@ -0,0 +1,27 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class ResilienceConfig:
+    # Per-provider call budgets (token bucket refill rate per second and burst size)
+    # and attempts for idempotent calls; non-idempotent calls are never retried
+    PROVIDERS = {
+        'baidu_asr': {'rate': 2.0, 'burst': 5, 'attempts': 2},
+        'baidu_tts': {'rate': 5.0, 'burst': 10, 'attempts': 2},
+        'deepseek': {'rate': 1.0, 'burst': 3, 'attempts': 1},
+        'qweather': {'rate': 1.0, 'burst': 10, 'attempts': 3},
+        'tuya': {'rate': 2.0, 'burst': 5, 'attempts': 2},
+    }
+
+    # Seconds a call may wait for a budget token before it is rejected
+    TOKEN_WAIT = float(os.getenv("RESILIENCE_TOKEN_WAIT", "1.0"))
+
+    # Jittered exponential retry delays
+    RETRY_BASE_DELAY = float(os.getenv("RESILIENCE_RETRY_BASE_DELAY", "0.3"))  # seconds
+    RETRY_MAX_DELAY = float(os.getenv("RESILIENCE_RETRY_MAX_DELAY", "3.0"))  # seconds
+
+    # Circuit breaker: consecutive failures that open it, and seconds before a trial call
+    BREAKER_FAILURES = int(os.getenv("RESILIENCE_BREAKER_FAILURES", "3"))
+    BREAKER_RESET = float(os.getenv("RESILIENCE_BREAKER_RESET", "30"))
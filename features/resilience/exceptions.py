@@ -0,0 +1,13 @@
+class ResilienceError(Exception):
+    """Base class for calls refused by the resilience layer."""
+    pass
+
+
+class CircuitOpenError(ResilienceError):
+    """Raised when a service's circuit breaker is open and the call fails fast."""
+    pass
+
+
+class RateLimitedError(ResilienceError):
+    """Raised when a provider's call budget is exhausted."""
+    pass
@@ -0,0 +1,165 @@
+import logging
+import threading
+
+from .circuit_breaker import CircuitBreaker
+from .config import ResilienceConfig
+from .exceptions import CircuitOpenError, RateLimitedError
+from .retry import retry_call
+from .token_bucket import TokenBucket
+
+
+class ServicePolicy:
+    """Rate budget, retry and circuit breaker for calls to one provider.
+
+    Calls are refused without touching the network while the breaker is open
+    or the budget is exhausted, so callers can switch to their offline
+    fallback immediately instead of waiting for a timeout.
+    """
+
+    def __init__(self, name, rate, burst, attempts=1,
+                 token_wait=ResilienceConfig.TOKEN_WAIT,
+                 base_delay=ResilienceConfig.RETRY_BASE_DELAY,
+                 max_delay=ResilienceConfig.RETRY_MAX_DELAY,
+                 failure_threshold=ResilienceConfig.BREAKER_FAILURES,
+                 reset_timeout=ResilienceConfig.BREAKER_RESET):
+        """Initialize the policy.
+
+        Args:
+            name (str): Provider name
+            rate (float): Calls per second the budget refills at
+            burst (int): Calls allowed in a burst
+            attempts (int): Attempts for idempotent calls
+            token_wait (float): Seconds a call may wait for budget
+            base_delay (float): First retry delay ceiling in seconds
+            max_delay (float): Largest retry delay ceiling in seconds
+            failure_threshold (int): Consecutive failed calls that open the breaker
+            reset_timeout (float): Seconds the breaker stays open
+        """
+        self.name = name
+        self.attempts = attempts
+        self.token_wait = token_wait
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(name, failure_threshold, reset_timeout)
+        self.logger = logging.getLogger(__name__)
+
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+        self.rejected_open = 0
+        self.rejected_rate = 0
+
+    @property
+    def available(self):
+        """bool: False while the breaker is open, so callers can skip straight to a fallback."""
+        return self.breaker.state != CircuitBreaker.OPEN
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _attempt(self, func):
+        if not self.bucket.acquire(self.token_wait):
+            self._count('rejected_rate')
+            raise RateLimitedError(f"{self.name} call budget exhausted")
+        return func()
+
+    def _on_retry(self, error):
+        self._count('retries')
+        self.logger.info(f"Retrying {self.name} call after error: {error}")
+
+    def call(self, func, idempotent=False, retry_on=(Exception,), failed=None):
+        """Call a provider through the budget and breaker.
+
+        Args:
+            func (callable): Zero-argument function making the call
+            idempotent (bool): Retry failures with jittered exponential backoff
+            retry_on (tuple): Exception types worth retrying; an exhausted
+                budget is never retried
+            failed (callable): Returns True for results that count as a service
+                failure without raising, e.g. HTTP 5xx responses
+
+        Returns:
+            The function's result
+
+        Raises:
+            CircuitOpenError: If the breaker is open
+            RateLimitedError: If no budget became available in time
+            Exception: Whatever the function raised
+        """
+        if not self.breaker.allow():
+            self._count('rejected_open')
+            raise CircuitOpenError(f"{self.name} is unavailable")
+
+        self._count('calls')
+        try:
+            if idempotent and self.attempts > 1:
+                result = retry_call(lambda: self._attempt(func), self.attempts, self.base_delay,
+                                    self.max_delay, retry_on=retry_on, give_up_on=(RateLimitedError,),
+                                    on_retry=self._on_retry)
+            else:
+                result = self._attempt(func)
+        except RateLimitedError:
+            # Nothing was sent, so this says nothing about the service's health
+            self.breaker.release()
+            raise
+        except Exception:
+            self._count('failures')
+            self.breaker.record_failure()
+            raise
+
+        if failed is not None and failed(result):
+            self._count('failures')
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return result
+
+    def stats(self):
+        """Return breaker state and call counters.
+
+        Returns:
+            dict: State, calls, failures, retries, rejected counts and available tokens
+        """
+        with self._lock:
+            return {
+                'state': self.breaker.state,
+                'calls': self.calls,
+                'failures': self.failures,
+                'retries': self.retries,
+                'rejected_open': self.rejected_open,
+                'rejected_rate': self.rejected_rate,
+                'tokens': round(self.bucket.tokens, 2),
+            }
+
+
+_policies = {}
+_policies_lock = threading.Lock()
+
+
+def get_policy(name):
+    """Return the process-wide policy of a provider, creating it on first use.
+
+    Args:
+        name (str): Provider name, a key of ResilienceConfig.PROVIDERS
+
+    Returns:
+        ServicePolicy: Shared policy instance
+    """
+    with _policies_lock:
+        if name not in _policies:
+            _policies[name] = ServicePolicy(name, **ResilienceConfig.PROVIDERS[name])
+        return _policies[name]
+
+
+def resilience_stats():
+    """Return the stats of every policy created so far.
+
+    Returns:
+        dict: Provider name -> stats
+    """
+    with _policies_lock:
+        policies = dict(_policies)
+    return {name: policy.stats() for name, policy in policies.items()}
@@ -0,0 +1,49 @@
+import random
+import time
+
+
+def backoff_delay(attempt, base_delay, max_delay):
+    """Return a "full jitter" exponential backoff delay.
+
+    Args:
+        attempt (int): Number of the retry, starting at 1
+        base_delay (float): Delay ceiling of the first retry in seconds
+        max_delay (float): Upper bound of the delay ceiling
+
+    Returns:
+        float: Seconds to sleep before the retry
+    """
+    return random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+
+
+def retry_call(func, attempts, base_delay, max_delay, retry_on=(Exception,), give_up_on=(), on_retry=None):
+    """Call a function, retrying with jittered exponential backoff.
+
+    Only use this for idempotent calls.
+
+    Args:
+        func (callable): Zero-argument function to call
+        attempts (int): Total attempts including the first
+        base_delay (float): Delay ceiling of the first retry in seconds
+        max_delay (float): Upper bound of the delay ceiling
+        retry_on (tuple): Exception types worth retrying
+        give_up_on (tuple): Exception types raised at once even if they match ``retry_on``
+        on_retry (callable): Called with the exception before each retry
+
+    Returns:
+        The function's result
+
+    Raises:
+        Exception: The last exception once attempts are exhausted
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return func()
+        except give_up_on:
+            raise
+        except retry_on as e:
+            if attempt >= attempts:
+                raise
+            if on_retry is not None:
+                on_retry(e)
+            time.sleep(backoff_delay(attempt, base_delay, max_delay))
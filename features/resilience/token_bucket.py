@@ -0,0 +1,53 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every caller of one provider."""
+
+    def __init__(self, rate, capacity):
+        """Initialize a full bucket.
+
+        Args:
+            rate (float): Tokens added per second
+            capacity (int): Maximum tokens, i.e. the allowed burst
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout=0.0):
+        """Take one token, waiting up to a timeout for it to be refilled.
+
+        Args:
+            timeout (float): Seconds to wait; 0 to fail immediately
+
+        Returns:
+            bool: True if a token was taken
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+                remaining = deadline - time.monotonic()
+                if wait > remaining:
+                    return False
+                self._cond.wait(wait)
+
+    @property
+    def tokens(self):
+        """float: Tokens currently available."""
+        with self._cond:
+            self._refill()
+            return self._tokens
@@ -0,0 +1,36 @@
+# Import essential classes for convenient package-level access
+from .config import SpeechConfig
+from .baidu import BaiduServiceError
+from .offline_asr import OfflineRecognizer, get_offline_recognizer
+from .asr_router import RecognitionRouter
+from .recognition import CloudRecognizer, create_recognition_router
+from .audio_preprocess import ASRMetrics, UploadPreparer, trim_silence
+from .tts_cache import TTSCache, get_tts_cache
+from .speech_pipeline import SpeechPipeline
+from .playback import AudioPlayer, get_audio_player
+from .scheduler import SpeechPriority, SpeechRequest, SpeechScheduler
+from .speech_output import SpeechOutput, get_speech_output
+
+# Define what gets exposed when importing the package
+__all__ = [
+    "ASRMetrics",
+    "AudioPlayer",
+    "BaiduServiceError",
+    "CloudRecognizer",
+    "OfflineRecognizer",
+    "RecognitionRouter",
+    "SpeechConfig",
+    "SpeechOutput",
+    "SpeechPipeline",
+    "SpeechPriority",
+    "SpeechRequest",
+    "SpeechScheduler",
+    "TTSCache",
+    "UploadPreparer",
+    "create_recognition_router",
+    "get_audio_player",
+    "get_offline_recognizer",
+    "get_speech_output",
+    "get_tts_cache",
+    "trim_silence"
+]
@@ -0,0 +1,141 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from .config import SpeechConfig
+
+
+class RecognitionRouter:
+    """Chooses between cloud and on-device speech recognition for each utterance.
+
+    Modes:
+        cloud: Cloud only, offline used when the cloud call fails
+        offline: On-device only
+        race: Run both and take the first answer within the deadline
+        auto: Offline when the network is down, race when the cloud is slower
+              than the latency budget, cloud otherwise
+    """
+
+    MODES = ('auto', 'cloud', 'offline', 'race')
+
+    def __init__(self, cloud_recognize, offline_recognizer, network_check,
+                 mode=SpeechConfig.ASR_MODE,
+                 latency_budget=SpeechConfig.ASR_LATENCY_BUDGET,
+                 race_deadline=SpeechConfig.ASR_RACE_DEADLINE):
+        """Initialize the router.
+
+        Args:
+            cloud_recognize (callable): Takes PCM bytes, returns text or None
+            offline_recognizer (OfflineRecognizer): On-device recognizer
+            network_check (callable): Returns True if the network is available
+            mode (str): Routing mode, one of MODES
+            latency_budget (float): Cloud latency in seconds above which auto mode races
+            race_deadline (float): Seconds to wait for any answer when racing
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown recognition mode: {mode}")
+
+        self.cloud_recognize = cloud_recognize
+        self.offline_recognizer = offline_recognizer
+        self.network_check = network_check
+        self.mode = mode
+        self.latency_budget = latency_budget
+        self.race_deadline = race_deadline
+        self.logger = logging.getLogger(__name__)
+
+        # Smoothed cloud latency, None until the first cloud call finishes
+        self.cloud_latency = None
+        self._latency_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='asr')
+
+    def _record_cloud_latency(self, elapsed, alpha=0.3):
+        """Update the exponentially weighted cloud latency estimate."""
+        with self._latency_lock:
+            if self.cloud_latency is None:
+                self.cloud_latency = elapsed
+            else:
+                self.cloud_latency = alpha * elapsed + (1 - alpha) * self.cloud_latency
+
+    def _timed_cloud(self, pcm_data):
+        """Run cloud recognition and record how long it took."""
+        start = time.monotonic()
+        try:
+            return self.cloud_recognize(pcm_data)
+        finally:
+            self._record_cloud_latency(time.monotonic() - start)
+
+    def select_mode(self):
+        """Resolve the routing mode for the next utterance.
+
+        Returns:
+            str: One of 'cloud', 'offline' or 'race'
+        """
+        offline_ready = self.offline_recognizer is not None and self.offline_recognizer.available
+        cloud_ready = self.cloud_recognize is not None and self.network_check()
+
+        if self.mode == 'offline' or not cloud_ready:
+            return 'offline'
+        if self.mode in ('cloud', 'race'):
+            return self.mode
+
+        # auto
+        if offline_ready and self.cloud_latency is not None and self.cloud_latency > self.latency_budget:
+            return 'race'
+        return 'cloud'
+
+    def recognize(self, pcm_data):
+        """Recognize PCM audio using the selected backend.
+
+        Args:
+            pcm_data (bytes): 16 kHz 16-bit mono PCM audio
+
+        Returns:
+            str: Recognized text, or None if recognition fails
+        """
+        mode = self.select_mode()
+        self.logger.info(f"Recognition mode: {mode}")
+
+        if mode == 'race':
+            return self._race(pcm_data)
+
+        if mode == 'cloud':
+            result = self._timed_cloud(pcm_data)
+            if result:
+                return result
+            self.logger.info("Cloud recognition failed, falling back to offline recognition")
+
+        return self._recognize_offline(pcm_data)
+
+    def _recognize_offline(self, pcm_data):
+        if self.offline_recognizer is None:
+            return None
+        return self.offline_recognizer.recognize(pcm_data)
+
+    def _race(self, pcm_data):
+        """Run cloud and offline recognition together and take the first answer."""
+        pending = {
+            self._executor.submit(self._timed_cloud, pcm_data): 'cloud',
+            self._executor.submit(self._recognize_offline, pcm_data): 'offline',
+        }
+        deadline = time.monotonic() + self.race_deadline
+
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                source = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    self.logger.error(f"{source} recognition error: {e}")
+                    continue
+                if result:
+                    self.logger.info(f"Race won by {source} recognition")
+                    return result
+
+        self.logger.warning(f"No recognition result within {self.race_deadline}s")
+        return None
@@ -0,0 +1,153 @@
+import audioop
+import io
+import logging
+import threading
+from collections import namedtuple
+
+from .config import SpeechConfig
+
+PreparedAudio = namedtuple('PreparedAudio', ['data', 'format', 'raw_bytes', 'speech_ms'])
+
+
+def trim_silence(pcm_data, sample_rate=16000, sample_width=2, frame_ms=30,
+                 threshold=SpeechConfig.ASR_TRIM_THRESHOLD,
+                 padding_ms=SpeechConfig.ASR_TRIM_PADDING_MS):
+    """Trim leading and trailing non-speech from PCM audio using frame energy.
+
+    Args:
+        pcm_data (bytes): Mono PCM audio
+        sample_rate (int): Sample rate in Hz
+        sample_width (int): Bytes per sample
+        frame_ms (int): Analysis frame length in milliseconds
+        threshold (int): RMS energy at or above which a frame counts as speech
+        padding_ms (int): Audio kept on each side of the detected speech
+
+    Returns:
+        bytes: Trimmed PCM audio, empty if no frame reaches the threshold
+    """
+    frame_bytes = int(sample_rate * frame_ms / 1000) * sample_width
+    if not pcm_data or frame_bytes <= 0:
+        return b''
+
+    first = last = None
+    for offset in range(0, len(pcm_data), frame_bytes):
+        frame = pcm_data[offset:offset + frame_bytes]
+        if len(frame) % sample_width:
+            frame = frame[:len(frame) - len(frame) % sample_width]
+        if frame and audioop.rms(frame, sample_width) >= threshold:
+            if first is None:
+                first = offset
+            last = offset + len(frame)
+
+    if first is None:
+        return b''
+
+    padding = int(sample_rate * padding_ms / 1000) * sample_width
+    return pcm_data[max(0, first - padding):min(len(pcm_data), last + padding)]
+
+
+def encode_for_upload(pcm_data, codec='pcm', sample_rate=16000):
+    """Encode PCM audio with a codec accepted by Baidu ASR.
+
+    Args:
+        pcm_data (bytes): 16-bit mono PCM audio
+        codec (str): 'pcm' to send raw audio, 'amr' for AMR-WB compression
+        sample_rate (int): Sample rate in Hz
+
+    Returns:
+        tuple: (encoded bytes, Baidu format name)
+    """
+    if codec == 'pcm' or not pcm_data:
+        return pcm_data, 'pcm'
+
+    if codec != 'amr':
+        raise ValueError(f"Unsupported upload codec: {codec}")
+
+    from pydub import AudioSegment
+    segment = AudioSegment(data=pcm_data, sample_width=2, frame_rate=sample_rate, channels=1)
+    buffer = io.BytesIO()
+    segment.export(buffer, format='amr', codec='libvo_amrwbenc',
+                   parameters=['-ar', str(sample_rate), '-b:a', '23850'])
+    return buffer.getvalue(), 'amr'
+
+
+class UploadPreparer:
+    """Pre-upload stage for cloud ASR: trims non-speech, then optionally compresses."""
+
+    def __init__(self, codec=SpeechConfig.ASR_UPLOAD_CODEC, trim=True, sample_rate=16000):
+        """Initialize the preparer.
+
+        Args:
+            codec (str): Upload codec, 'pcm' or 'amr'
+            trim (bool): Whether to trim leading and trailing non-speech
+            sample_rate (int): Sample rate of the PCM audio
+        """
+        self.codec = codec
+        self.trim = trim
+        self.sample_rate = sample_rate
+        self.logger = logging.getLogger(__name__)
+
+    def prepare(self, pcm_data):
+        """Prepare PCM audio for upload.
+
+        Args:
+            pcm_data (bytes): 16-bit mono PCM audio
+
+        Returns:
+            PreparedAudio: Payload, its Baidu format name and size details
+        """
+        speech = trim_silence(pcm_data, self.sample_rate) if self.trim else pcm_data
+        speech_ms = len(speech) * 1000 // (self.sample_rate * 2)
+
+        try:
+            data, fmt = encode_for_upload(speech, self.codec, self.sample_rate)
+        except Exception as e:
+            self.logger.warning(f"Audio compression failed, uploading PCM: {e}")
+            data, fmt = speech, 'pcm'
+
+        return PreparedAudio(data, fmt, len(pcm_data), speech_ms)
+
+
+class ASRMetrics:
+    """Per-request and cumulative upload size and latency for cloud ASR."""
+
+    def __init__(self, logger=None):
+        self.logger = logger or logging.getLogger(__name__)
+        self.requests = 0
+        self.raw_bytes = 0
+        self.uploaded_bytes = 0
+        self.total_latency = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, prepared, latency):
+        """Record one ASR request and log its report.
+
+        Args:
+            prepared (PreparedAudio): Audio that was uploaded
+            latency (float): End-to-end ASR latency in seconds
+        """
+        with self._lock:
+            self.requests += 1
+            self.raw_bytes += prepared.raw_bytes
+            self.uploaded_bytes += len(prepared.data)
+            self.total_latency += latency
+
+        self.logger.info(
+            f"ASR request: {prepared.raw_bytes} -> {len(prepared.data)} bytes "
+            f"({prepared.format}, {prepared.speech_ms} ms speech), latency {latency * 1000:.0f} ms"
+        )
+
+    def summary(self):
+        """Return cumulative statistics.
+
+        Returns:
+            dict: Request count, byte totals, compression ratio and mean latency
+        """
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'raw_bytes': self.raw_bytes,
+                'uploaded_bytes': self.uploaded_bytes,
+                'ratio': self.uploaded_bytes / self.raw_bytes if self.raw_bytes else 1.0,
+                'mean_latency': self.total_latency / self.requests if self.requests else 0.0,
+            }
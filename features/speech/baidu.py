@@ -0,0 +1,49 @@
+from .config import SpeechConfig
+
+
+class BaiduServiceError(Exception):
+    """Raised when Baidu answers with an error of the service rather than the request.
+
+    The AipSpeech SDK reports timeouts and connection failures as result
+    dicts carrying an ``error_code`` (e.g. SDK108) instead of raising, so
+    results are checked inside the wrapped call; raising lets the
+    provider's retry and circuit breaker see these failures.
+    """
+    pass
+
+
+def check_asr_result(result):
+    """Raise for ASR results that mean the service, not the audio, failed.
+
+    Args:
+        result (dict): Result of AipSpeech.asr
+
+    Returns:
+        dict: The result, which may still report an audio error such as 3301
+
+    Raises:
+        BaiduServiceError: For an empty result, an SDK error code or one of
+            SpeechConfig.ASR_SERVICE_ERRORS
+    """
+    if not result:
+        raise BaiduServiceError("Empty ASR response")
+    if 'error_code' in result or result.get('err_no') in SpeechConfig.ASR_SERVICE_ERRORS:
+        raise BaiduServiceError(f"Baidu ASR error: {result}")
+    return result
+
+
+def check_tts_result(result):
+    """Raise unless a TTS result is audio.
+
+    Args:
+        result (bytes | dict): Result of AipSpeech.synthesis, audio on success
+
+    Returns:
+        bytes: The synthesized audio
+
+    Raises:
+        BaiduServiceError: For an error dict, including SDK error codes
+    """
+    if isinstance(result, dict) or not result:
+        raise BaiduServiceError(f"Baidu TTS error: {result}")
+    return result
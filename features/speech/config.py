@@ -0,0 +1,53 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class SpeechConfig:
+    # On-device recognition (Vosk)
+    VOSK_MODEL_PATH = os.getenv("VOSK_MODEL_PATH", "models/vosk-model-small-cn-0.22")
+
+    # Recognition routing: auto, cloud, offline or race
+    ASR_MODE = os.getenv("ASR_MODE", "auto")
+    ASR_LATENCY_BUDGET = float(os.getenv("ASR_LATENCY_BUDGET", "1.5"))  # seconds
+    ASR_RACE_DEADLINE = float(os.getenv("ASR_RACE_DEADLINE", "4.0"))  # seconds
+
+    # Baidu ASR error numbers that mean the service, not the audio, is at fault
+    # (auth failure, server error, QPS or daily quota exceeded, recognition server error)
+    ASR_SERVICE_ERRORS = (3302, 3303, 3304, 3305, 3307)
+
+    # Pre-upload stage: energy-based trimming and optional compression (pcm or amr)
+    ASR_UPLOAD_CODEC = os.getenv("ASR_UPLOAD_CODEC", "pcm")
+    ASR_TRIM_THRESHOLD = int(os.getenv("ASR_TRIM_THRESHOLD", "500"))  # RMS energy
+    ASR_TRIM_PADDING_MS = int(os.getenv("ASR_TRIM_PADDING_MS", "200"))
+
+    # Synthesized speech cache
+    TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "cache/tts")
+    TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+    TTS_CACHE_MEMORY_ITEMS = int(os.getenv("TTS_CACHE_MEMORY_ITEMS", "64"))
+
+    # Pipelined speech output
+    TTS_LOOKAHEAD = int(os.getenv("TTS_LOOKAHEAD", "3"))  # sentences synthesized ahead
+    TTS_WORKERS = int(os.getenv("TTS_WORKERS", "2"))
+
+    # Audio output; Baidu synthesis with aue=4 returns 16 kHz 16-bit mono PCM
+    PLAYBACK_RATE = 16000
+    PLAYBACK_CHUNK_FRAMES = int(os.getenv("PLAYBACK_CHUNK_FRAMES", "512"))
+
+    # Speech output: Baidu synthesis options and preferred offline (pyttsx3) voice
+    TTS_OPTIONS = {
+        'spd': 5,  # Speed (0-9)
+        'pit': 5,  # Pitch (0-9)
+        'vol': 5,  # Volume (0-15)
+        'per': 4,  # Voice selection
+        'aue': 4,  # 16 kHz 16-bit PCM, played without decoding
+    }
+    OFFLINE_VOICE = os.getenv("OFFLINE_VOICE", "HUIHUI")
+
+    # Speech scheduling: unspoken requests older than this are dropped
+    SPEECH_MAX_AGE = float(os.getenv("SPEECH_MAX_AGE", "30"))  # seconds
+
+    # Barge-in: mic energy while speaking that counts as the user talking
+    BARGE_IN_THRESHOLD = int(os.getenv("BARGE_IN_THRESHOLD", "2000"))  # RMS energy
+    BARGE_IN_CHUNKS = int(os.getenv("BARGE_IN_CHUNKS", "3"))  # consecutive chunks
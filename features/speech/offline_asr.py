@@ -0,0 +1,96 @@
+import json
+import logging
+import threading
+
+from .config import SpeechConfig
+
+
+class OfflineRecognizer:
+    """On-device speech recognition backed by a Vosk model kept warm in memory."""
+
+    def __init__(self, model_path=SpeechConfig.VOSK_MODEL_PATH, sample_rate=16000):
+        """Initialize the recognizer without loading the model.
+
+        Args:
+            model_path (str): Directory of the Vosk model
+            sample_rate (int): Sample rate of the PCM audio passed to recognize()
+        """
+        self.model_path = model_path
+        self.sample_rate = sample_rate
+        self.logger = logging.getLogger(__name__)
+
+        self._model = None
+        self._load_failed = False
+        self._lock = threading.Lock()
+
+    @property
+    def available(self):
+        """bool: True once the model is loaded and ready."""
+        return self._model is not None
+
+    def load(self):
+        """Load the Vosk model once; later calls are no-ops.
+
+        Returns:
+            bool: True if the model is ready, False otherwise
+        """
+        with self._lock:
+            if self._model is not None or self._load_failed:
+                return self._model is not None
+
+            try:
+                from vosk import Model, SetLogLevel
+                SetLogLevel(-1)
+                self._model = Model(str(self.model_path))
+                self.logger.info(f"Offline recognition model loaded from {self.model_path}")
+            except Exception as e:
+                self._load_failed = True
+                self.logger.error(f"Failed to load offline recognition model: {e}")
+
+            return self._model is not None
+
+    def warm_up(self):
+        """Load the model on a background thread so callers never block on it."""
+        threading.Thread(target=self.load, daemon=True).start()
+
+    def recognize(self, pcm_data):
+        """Recognize 16-bit mono PCM audio on-device.
+
+        Args:
+            pcm_data (bytes): PCM audio data at ``sample_rate``
+
+        Returns:
+            str: Recognized text, or None if recognition fails
+        """
+        if not self.load():
+            return None
+
+        try:
+            from vosk import KaldiRecognizer
+            recognizer = KaldiRecognizer(self._model, self.sample_rate)
+            recognizer.AcceptWaveform(pcm_data)
+            result = json.loads(recognizer.FinalResult())
+
+            # Chinese models separate words with spaces
+            text = result.get('text', '').replace(' ', '')
+            return text or None
+        except Exception as e:
+            self.logger.error(f"Offline recognition error: {e}")
+            return None
+
+
+_shared_recognizer = None
+_shared_lock = threading.Lock()
+
+
+def get_offline_recognizer():
+    """Return the process-wide offline recognizer, creating it on first use.
+
+    Returns:
+        OfflineRecognizer: Shared recognizer instance
+    """
+    global _shared_recognizer
+    with _shared_lock:
+        if _shared_recognizer is None:
+            _shared_recognizer = OfflineRecognizer()
+        return _shared_recognizer
@@ -0,0 +1,158 @@
+import io
+import logging
+import threading
+import time
+
+from .config import SpeechConfig
+
+
+# Audio format returned by Baidu synthesis for each aue option
+AUE_FORMATS = {3: 'mp3', 4: 'pcm', 5: 'pcm', 6: 'wav'}
+
+
+def audio_format_for(options):
+    """Return the format ('pcm', 'mp3' or 'wav') of audio synthesized with these Baidu options."""
+    return AUE_FORMATS.get(options.get('aue', 3), 'mp3')
+
+
+class AudioPlayer:
+    """Plays synthesized speech through one long-lived PyAudio output stream.
+
+    Audio is written straight from memory: raw PCM (Baidu ``aue=4``) is played as-is
+    and MP3 is decoded in memory, so playback touches no files and spawns nothing
+    per clip once the stream is open.
+    """
+
+    def __init__(self, sample_rate=SpeechConfig.PLAYBACK_RATE, channels=1, sample_width=2,
+                 chunk_frames=SpeechConfig.PLAYBACK_CHUNK_FRAMES):
+        """Initialize the player without opening the device.
+
+        Args:
+            sample_rate (int): Output sample rate in Hz
+            channels (int): Output channel count
+            sample_width (int): Bytes per sample
+            chunk_frames (int): Frames written per stream write
+        """
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.sample_width = sample_width
+        self.chunk_frames = chunk_frames
+        self.logger = logging.getLogger(__name__)
+
+        self._pyaudio = None
+        self._stream = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+
+        # Latency measurements in seconds
+        self.open_latency = None
+        self.last_first_sample_latency = None
+
+    def open(self):
+        """Open the output stream if it is not open yet."""
+        if self._stream is not None:
+            return
+
+        import pyaudio
+        start = time.monotonic()
+        self._pyaudio = pyaudio.PyAudio()
+        self._stream = self._pyaudio.open(
+            format=self._pyaudio.get_format_from_width(self.sample_width),
+            channels=self.channels,
+            rate=self.sample_rate,
+            output=True,
+            frames_per_buffer=self.chunk_frames
+        )
+        self.open_latency = time.monotonic() - start
+        self.logger.info(f"Audio output stream opened in {self.open_latency * 1000:.0f} ms")
+
+    def _to_pcm(self, audio, audio_format='pcm'):
+        """Convert encoded audio to PCM in memory; PCM is returned unchanged.
+
+        The format is passed by the caller, which knows what it requested:
+        raw PCM has no header, so sniffing its first bytes is unreliable.
+        """
+        if audio_format == 'pcm':
+            return audio
+
+        from pydub import AudioSegment
+        segment = AudioSegment.from_file(io.BytesIO(audio), format=audio_format)
+        segment = (segment.set_frame_rate(self.sample_rate)
+                   .set_channels(self.channels)
+                   .set_sample_width(self.sample_width))
+        return segment.raw_data
+
+    def play(self, audio, audio_format='pcm'):
+        """Play audio, blocking until it finishes or stop() is called.
+
+        Args:
+            audio (bytes): Raw PCM, MP3 or WAV audio
+            audio_format (str): 'pcm', 'mp3' or 'wav'
+
+        Returns:
+            bool: True if the clip played to the end
+        """
+        start = time.monotonic()
+        pcm = self._to_pcm(audio, audio_format)
+        chunk_bytes = self.chunk_frames * self.channels * self.sample_width
+
+        with self._lock:
+            self.open()
+            self._stop.clear()
+            self._idle.clear()
+            try:
+                for offset in range(0, len(pcm), chunk_bytes):
+                    if self._stop.is_set():
+                        return False
+                    self._stream.write(pcm[offset:offset + chunk_bytes])
+                    if offset == 0:
+                        self.last_first_sample_latency = time.monotonic() - start
+                        self.logger.debug(
+                            f"First sample after {self.last_first_sample_latency * 1000:.1f} ms"
+                        )
+            finally:
+                self._idle.set()
+
+        return True
+
+    def stop(self):
+        """Stop the clip currently playing; the stream stays open."""
+        self._stop.set()
+
+    def wait_stopped(self, timeout=None):
+        """Block until no clip is being written to the stream.
+
+        Returns:
+            bool: True if playback is idle
+        """
+        return self._idle.wait(timeout)
+
+    def close(self):
+        """Close the output stream and release the device."""
+        with self._lock:
+            if self._stream is not None:
+                self._stream.stop_stream()
+                self._stream.close()
+                self._stream = None
+            if self._pyaudio is not None:
+                self._pyaudio.terminate()
+                self._pyaudio = None
+
+
+_shared_player = None
+_shared_lock = threading.Lock()
+
+
+def get_audio_player():
+    """Return the process-wide audio player, creating it on first use.
+
+    Returns:
+        AudioPlayer: Shared player instance
+    """
+    global _shared_player
+    with _shared_lock:
+        if _shared_player is None:
+            _shared_player = AudioPlayer()
+        return _shared_player
@@ -0,0 +1,108 @@
+import logging
+import time
+
+from features.common.network import get_network_probe
+from features.resilience import ResilienceError, get_policy
+from .asr_router import RecognitionRouter
+from .audio_preprocess import ASRMetrics, UploadPreparer
+from .baidu import check_asr_result
+from .offline_asr import get_offline_recognizer
+
+
+class CloudRecognizer:
+    """Baidu speech recognition behind the provider's budget, retry and breaker.
+
+    Audio is trimmed and optionally compressed before upload, and each call
+    is recorded in the ASR metrics.
+    """
+
+    def __init__(self, speech_client, options=None, metrics=None, preparer=None, network_check=None):
+        """Initialize the recognizer.
+
+        Args:
+            speech_client (AipSpeech): Baidu speech client
+            options (dict): Baidu recognition options, Mandarin by default
+            metrics (ASRMetrics): Upload size and latency metrics
+            preparer (UploadPreparer): Pre-upload stage
+            network_check (callable): Returns True if the network is available
+        """
+        self.speech_client = speech_client
+        self.options = options or {'dev_pid': 1537}  # Mandarin with simple English
+        self.metrics = metrics or ASRMetrics()
+        self.preparer = preparer or UploadPreparer()
+        self.network_check = network_check or get_network_probe().is_online
+        self.policy = get_policy('baidu_asr')
+        self.logger = logging.getLogger(__name__)
+
+    def ready(self):
+        """Check whether cloud recognition is worth trying.
+
+        Returns:
+            bool: False while the Baidu ASR breaker is open or the network is down
+        """
+        return self.policy.available and self.network_check()
+
+    def recognize(self, pcm_data):
+        """Send PCM audio to the Baidu Speech Recognition API.
+
+        Args:
+            pcm_data (bytes): 16 kHz 16-bit mono PCM audio
+
+        Returns:
+            str: Recognized text, or None if recognition fails
+        """
+        try:
+            start = time.monotonic()
+
+            # Trim non-speech and compress before upload
+            prepared = self.preparer.prepare(pcm_data)
+            if not prepared.data:
+                self.logger.info("No speech found in audio, skipping upload")
+                return None
+
+            options = dict(self.options, format=prepared.format)
+
+            # Recognition is idempotent, so transient errors, including SDK
+            # timeouts reported as error dicts, are retried
+            result = self.policy.call(
+                lambda: check_asr_result(self.speech_client.asr(prepared.data, prepared.format, 16000, options)),
+                idempotent=True
+            )
+            self.metrics.record(prepared, time.monotonic() - start)
+
+            if result and result.get('err_no') == 0:
+                return result.get('result')[0]
+
+            self.logger.error(f"Baidu Speech Recognition failed: {result}")
+            return None
+
+        except ResilienceError as e:
+            self.logger.warning(f"Online recognition skipped: {e}")
+            return None
+        except Exception as e:
+            self.logger.error(f"Online recognition error: {e}")
+            return None
+
+
+def create_recognition_router(speech_client=None, options=None, metrics=None):
+    """Build a router between Baidu and the shared on-device recognizer.
+
+    The offline model starts loading in the background; until it is ready
+    the router uses the cloud alone.
+
+    Args:
+        speech_client (AipSpeech): Baidu speech client, None for on-device only
+        options (dict): Baidu recognition options
+        metrics (ASRMetrics): Upload size and latency metrics
+
+    Returns:
+        RecognitionRouter: The router
+    """
+    offline_recognizer = get_offline_recognizer()
+    offline_recognizer.warm_up()
+
+    if speech_client is None:
+        return RecognitionRouter(None, offline_recognizer, network_check=lambda: False)
+
+    cloud = CloudRecognizer(speech_client, options, metrics)
+    return RecognitionRouter(cloud.recognize, offline_recognizer, network_check=cloud.ready)
@@ -0,0 +1,161 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+from .config import SpeechConfig
+
+
+class SpeechPriority:
+    """Speech priorities; lower values are spoken first and preempt higher ones."""
+
+    ALERT = 0
+    GREETING = 1
+    PROMPT = 2
+    ANSWER = 3
+
+
+class SpeechRequest:
+    """One queued utterance: a list of sentences spoken back to back."""
+
+    def __init__(self, sentences, online=True, priority=SpeechPriority.ANSWER,
+                 max_age=SpeechConfig.SPEECH_MAX_AGE, stream=False):
+        """Initialize the request.
+
+        Args:
+            sentences (iterable): Sentences to speak in order
+            online (bool): Use Baidu TTS when available
+            priority (int): One of the SpeechPriority values
+            max_age (float): Seconds after which an unspoken request is stale
+            stream (bool): Sentences is a generator consumed while speaking
+        """
+        self.stream = stream
+        self.sentences = sentences if stream else [s for s in sentences if s and s.strip()]
+        self.online = online
+        self.priority = priority
+        self.created_at = time.monotonic()
+        self.max_age = max_age
+        self.cancelled = False
+        self.done = threading.Event()
+
+    @property
+    def key(self):
+        """tuple: Identity used to collapse duplicate pending requests."""
+        if self.stream:
+            return 'stream', id(self)
+        return tuple(self.sentences), self.online
+
+    @property
+    def stale(self):
+        """bool: True once the request has waited longer than max_age."""
+        return self.max_age is not None and time.monotonic() - self.created_at > self.max_age
+
+    def cancel(self):
+        """Cancel the request; waiters are released."""
+        self.cancelled = True
+        self.done.set()
+
+    def wait(self, timeout=None):
+        """Block until the utterance has been spoken or cancelled.
+
+        Returns:
+            bool: True if it finished within the timeout
+        """
+        return self.done.wait(timeout)
+
+
+class SpeechScheduler:
+    """Priority queue of speech requests with duplicate collapsing and expiry."""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._heap = []
+        self._pending = {}  # key -> request
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+
+        self.collapsed = 0
+        self.expired = 0
+        self.cancelled = 0
+
+    def put(self, request):
+        """Queue a request, collapsing it into an identical pending one.
+
+        Args:
+            request (SpeechRequest): Request to queue
+
+        Returns:
+            SpeechRequest: The queued request, or the pending duplicate it joined
+        """
+        with self._cond:
+            existing = self._pending.get(request.key)
+            if existing is not None and not existing.cancelled:
+                self.collapsed += 1
+                if request.priority < existing.priority:
+                    existing.priority = request.priority
+                    heapq.heappush(self._heap, (existing.priority, next(self._counter), existing))
+                return existing
+
+            self._pending[request.key] = request
+            heapq.heappush(self._heap, (request.priority, next(self._counter), request))
+            self._cond.notify()
+            return request
+
+    def get(self):
+        """Block until a live request is available and return it.
+
+        Cancelled and stale requests are dropped on the way.
+
+        Returns:
+            SpeechRequest: Highest-priority live request
+        """
+        with self._cond:
+            while True:
+                while not self._heap:
+                    self._cond.wait()
+
+                priority, _, request = heapq.heappop(self._heap)
+                if priority != request.priority or self._pending.get(request.key) is not request:
+                    continue  # Superseded heap entry
+
+                del self._pending[request.key]
+                if request.cancelled:
+                    continue
+                if request.stale:
+                    self.expired += 1
+                    self.logger.info(f"Dropping stale speech: {request.sentences}")
+                    request.cancel()
+                    continue
+                return request
+
+    def cancel(self, min_priority=SpeechPriority.ALERT):
+        """Cancel pending requests at or below a priority.
+
+        Args:
+            min_priority (int): Requests with priority >= this value are cancelled
+
+        Returns:
+            int: Number of requests cancelled
+        """
+        with self._cond:
+            cancelled = [r for r in self._pending.values() if r.priority >= min_priority]
+            for request in cancelled:
+                del self._pending[request.key]
+                request.cancel()
+            self.cancelled += len(cancelled)
+            return len(cancelled)
+
+    def stats(self):
+        """Return pending and dropped request counts.
+
+        Returns:
+            dict: Pending, collapsed, expired and cancelled counts
+        """
+        with self._cond:
+            return {
+                'pending': len(self._pending),
+                'collapsed': self.collapsed,
+                'expired': self.expired,
+                'cancelled': self.cancelled,
+            }
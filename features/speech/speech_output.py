@@ -0,0 +1,331 @@
+import logging
+import os
+import threading
+import time
+
+from features.resilience import ResilienceError, get_policy
+from .baidu import check_tts_result
+from .config import SpeechConfig
+from .playback import audio_format_for, get_audio_player
+from .scheduler import SpeechPriority, SpeechRequest, SpeechScheduler
+from .speech_pipeline import SpeechPipeline
+from .tts_cache import get_tts_cache
+
+
+class SpeechOutput:
+    """Process-wide speech output with one online TTS client and one offline engine.
+
+    Callers enqueue text and return immediately; a single worker thread owns the
+    pyttsx3 engine and the audio device, so utterances never overlap. Requests are
+    ordered by priority, a more urgent request preempts the one playing, and
+    barge_in() silences output when the user starts speaking.
+    """
+
+    def __init__(self, app_id=None, api_key=None, secret_key=None,
+                 options=None, offline_voice=SpeechConfig.OFFLINE_VOICE):
+        """Initialize the service and start its worker thread.
+
+        Args:
+            app_id (str): Baidu APP ID, defaults to BAIDU_APP_ID
+            api_key (str): Baidu API Key, defaults to BAIDU_API_KEY
+            secret_key (str): Baidu Secret Key, defaults to BAIDU_SECRET_KEY
+            options (dict): Baidu synthesis options
+            offline_voice (str): Substring of the preferred pyttsx3 voice name or id
+        """
+        self.logger = logging.getLogger(__name__)
+        self.options = dict(options or SpeechConfig.TTS_OPTIONS)
+        self.offline_voice = offline_voice
+
+        app_id = app_id or os.getenv('BAIDU_APP_ID')
+        api_key = api_key or os.getenv('BAIDU_API_KEY')
+        secret_key = secret_key or os.getenv('BAIDU_SECRET_KEY')
+
+        self.client = None
+        if all([app_id, api_key, secret_key]):
+            from aip import AipSpeech
+            self.client = AipSpeech(app_id.strip(), api_key.strip(), secret_key.strip())
+        self.tts_policy = get_policy('baidu_tts')
+
+        self.player = get_audio_player()
+        self.audio_format = audio_format_for(self.options)
+        self.pipeline = SpeechPipeline(self.synthesize, self._play)
+        self.engine = None
+
+        self.scheduler = SpeechScheduler()
+        self._current = None
+        self._current_lock = threading.Lock()
+        self.preempted = 0
+        self.barge_ins = 0
+
+        self._worker = threading.Thread(target=self._run, name='speech-output', daemon=True)
+        self._worker.start()
+
+    def say(self, text, online=True, wait=False, priority=SpeechPriority.ANSWER):
+        """Queue text to be spoken.
+
+        Args:
+            text (str): Text to speak
+            online (bool): Use Baidu TTS when available, else the offline engine
+            wait (bool): Block until the text has been spoken
+            priority (int): One of the SpeechPriority values
+
+        Returns:
+            SpeechRequest: Handle that can be waited on
+        """
+        return self.say_many([text], online, wait, priority)
+
+    def say_many(self, sentences, online=True, wait=False, priority=SpeechPriority.ANSWER):
+        """Queue several sentences to be spoken back to back without gaps.
+
+        Args:
+            sentences (list): Sentences to speak in order
+            online (bool): Use Baidu TTS when available, else the offline engine
+            wait (bool): Block until all sentences have been spoken
+            priority (int): One of the SpeechPriority values
+
+        Returns:
+            SpeechRequest: Handle that can be waited on; a pending duplicate
+                is returned instead of queueing the same text twice
+        """
+        request = SpeechRequest(sentences, online, priority)
+        if request.sentences:
+            request = self.scheduler.put(request)
+            self._preempt_for(request)
+        else:
+            request.done.set()
+
+        if wait:
+            request.wait()
+        return request
+
+    def say_stream(self, sentences, online=True, wait=False, priority=SpeechPriority.ANSWER):
+        """Queue sentences that are still being produced, e.g. a streaming chat reply.
+
+        Each sentence is synthesized as soon as the generator yields it.
+
+        Args:
+            sentences (iterable): Generator of sentences
+            online (bool): Use Baidu TTS when available, else the offline engine
+            wait (bool): Block until the stream has been spoken
+            priority (int): One of the SpeechPriority values
+
+        Returns:
+            SpeechRequest: Handle that can be waited on
+        """
+        request = self.scheduler.put(SpeechRequest(sentences, online, priority, stream=True))
+        self._preempt_for(request)
+        if wait:
+            request.wait()
+        return request
+
+    @property
+    def is_speaking(self):
+        """bool: True while a request is being played."""
+        return self._current is not None
+
+    def _preempt_for(self, request):
+        """Interrupt the request playing if the new one is more urgent."""
+        with self._current_lock:
+            current = self._current
+            if current is None or request.priority >= current.priority:
+                return
+            self.preempted += 1
+        self.logger.info(f"Preempting speech: {current.sentences}")
+        self._interrupt(current)
+
+    def _interrupt(self, request):
+        """Cancel a playing request and stop the audio immediately."""
+        request.cancel()
+        self.player.stop()
+        if self.engine is not None:
+            try:
+                self.engine.stop()
+            except Exception:
+                pass
+
+    def barge_in(self):
+        """Stop speaking because the user started talking.
+
+        The current utterance and every pending non-alert request are cancelled.
+
+        Returns:
+            float: Seconds between the call and playback stopping, None if silent
+        """
+        start = time.monotonic()
+        cancelled = self.scheduler.cancel(SpeechPriority.GREETING)
+
+        with self._current_lock:
+            current = self._current
+        if current is None:
+            return None
+
+        self.barge_ins += 1
+        self._interrupt(current)
+        current_stopped = self.player.wait_stopped(timeout=1)
+        latency = time.monotonic() - start
+        self.logger.info(f"Barge-in: playback stopped in {latency * 1000:.0f} ms, "
+                         f"{cancelled} pending request(s) cancelled"
+                         + ("" if current_stopped else " (stop timed out)"))
+        return latency
+
+    def stats(self):
+        """Return scheduler and preemption counters.
+
+        Returns:
+            dict: Scheduler stats plus preempted and barge-in counts
+        """
+        stats = self.scheduler.stats()
+        stats.update(preempted=self.preempted, barge_ins=self.barge_ins)
+        return stats
+
+    def synthesize(self, text):
+        """Synthesize text with Baidu TTS, reusing cached audio.
+
+        Args:
+            text (str): Text to synthesize
+
+        Returns:
+            bytes: Audio, or None if synthesis fails
+        """
+        if self.client is None:
+            return None
+
+        try:
+            result = get_tts_cache().get_or_synthesize(text, self.options, self._synthesize_online)
+        except ResilienceError as e:
+            self.logger.warning(f"Speech synthesis skipped: {e}")
+            return None
+        except Exception as e:
+            self.logger.error(f"Speech synthesis error: {e}")
+            return None
+        return result
+
+    def prewarm(self, phrases):
+        """Synthesize fixed phrases into the TTS cache ahead of time.
+
+        Args:
+            phrases (list): Phrases to pre-warm
+
+        Returns:
+            int: Number of phrases newly synthesized
+        """
+        if self.client is None:
+            self.logger.info("Baidu API credentials are not set, skipping TTS pre-warm")
+            return 0
+        return get_tts_cache().prewarm(phrases, self.options, self._synthesize_online)
+
+    def _synthesize_online(self, text, options):
+        """Call Baidu TTS within its budget; synthesis is idempotent, so transient errors are retried."""
+        return self.tts_policy.call(
+            lambda: check_tts_result(self.client.synthesis(text, 'zh', 1, options)),
+            idempotent=True
+        )
+
+    def _init_engine(self):
+        """Create the offline engine on the worker thread that will drive it."""
+        try:
+            import pyttsx3
+            self.engine = pyttsx3.init()
+            voices = self.engine.getProperty('voices')
+            for voice in voices:
+                if self.offline_voice and (self.offline_voice in voice.name or self.offline_voice in voice.id):
+                    self.engine.setProperty('voice', voice.id)
+                    break
+            else:
+                if len(voices) > 1:
+                    self.engine.setProperty('voice', voices[1].id)  # Female voice
+            self.engine.setProperty('rate', 150)
+            self.engine.setProperty('volume', 0.8)
+        except Exception as e:
+            self.engine = None
+            self.logger.error(f"Offline speech engine unavailable: {e}")
+
+    def _speak_offline(self, request):
+        """Speak a request on the offline engine."""
+        if self.engine is None:
+            self.logger.warning(f"No speech engine available, dropping: {request.sentences}")
+            return
+        for sentence in request.sentences:
+            if request.cancelled:
+                return
+            if sentence and sentence.strip():
+                self.engine.say(sentence)
+                if request.stream:
+                    self.engine.runAndWait()
+        if not request.stream:
+            self.engine.runAndWait()
+
+    def _speak_sentence_offline(self, request, sentence):
+        """Speak one sentence on the offline engine, e.g. in place of failed synthesis.
+
+        Returns:
+            bool: False if there is no offline engine or the request was cancelled
+        """
+        if self.engine is None or request.cancelled:
+            return False
+        self.engine.say(sentence)
+        self.engine.runAndWait()
+        return True
+
+    def _play(self, audio):
+        """Play synthesized audio in the format requested from Baidu."""
+        return self.player.play(audio, self.audio_format)
+
+    def _speak(self, request):
+        """Speak one request online, falling back to the offline engine."""
+        # An open breaker goes straight to the offline engine instead of waiting on timeouts
+        if request.online and self.client is not None and self.tts_policy.available:
+            if request.stream or len(request.sentences) > 1:
+                # Sentences whose synthesis fails are spoken offline in their place; the
+                # pipeline consumes the input, so a stream could not be replayed afterwards
+                result = self.pipeline.speak(
+                    request.sentences,
+                    cancelled=lambda: request.cancelled,
+                    fallback=lambda sentence: self._speak_sentence_offline(request, sentence)
+                )
+                if result['unplayed'] and not request.cancelled:
+                    self.logger.warning(f"No speech engine available, dropping: {result['unplayed']}")
+                return
+            else:
+                audio = self.synthesize(request.sentences[0])
+                if request.cancelled:
+                    return
+                if audio:
+                    self._play(audio)
+                    return
+            self.logger.info("Online speech synthesis failed, using offline engine")
+
+        self._speak_offline(request)
+
+    def _run(self):
+        """Worker loop: owns the offline engine and plays requests by priority."""
+        self._init_engine()
+        while True:
+            request = self.scheduler.get()
+            with self._current_lock:
+                self._current = request
+            try:
+                self._speak(request)
+            except Exception as e:
+                self.logger.error(f"Speech output error: {e}")
+            finally:
+                with self._current_lock:
+                    self._current = None
+                request.done.set()
+
+
+_shared_output = None
+_shared_lock = threading.Lock()
+
+
+def get_speech_output():
+    """Return the process-wide speech output service, creating it on first use.
+
+    Returns:
+        SpeechOutput: Shared service instance
+    """
+    global _shared_output
+    with _shared_lock:
+        if _shared_output is None:
+            _shared_output = SpeechOutput()
+        return _shared_output
@@ -0,0 +1,120 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .config import SpeechConfig
+
+
+class SpeechPipeline:
+    """Plays a sequence of sentences while synthesizing the ones after it.
+
+    A feeder thread pulls sentences from the input, which may be a slow
+    generator such as a streaming LLM reply, and submits synthesis to a worker
+    pool at most ``lookahead`` sentences ahead of playback. Playback happens
+    strictly in order on the calling thread, so the gap between clips is only
+    as long as synthesis (or the producer) falls behind playback.
+    """
+
+    def __init__(self, synthesize, play,
+                 lookahead=SpeechConfig.TTS_LOOKAHEAD,
+                 workers=SpeechConfig.TTS_WORKERS):
+        """Initialize the pipeline.
+
+        Args:
+            synthesize (callable): Takes a sentence, returns audio bytes or None
+            play (callable): Plays audio bytes, blocking until done
+            lookahead (int): Maximum sentences synthesized ahead of playback
+            workers (int): Number of synthesis threads
+        """
+        self.synthesize = synthesize
+        self.play = play
+        self.lookahead = max(1, lookahead)
+        self.logger = logging.getLogger(__name__)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tts')
+
+    def _feed(self, sentences, futures, slots, cancelled):
+        """Submit synthesis for each sentence, bounded by the lookahead slots."""
+        try:
+            for sentence in sentences:
+                if cancelled():
+                    break
+                if not sentence or not sentence.strip():
+                    continue
+                while not slots.acquire(timeout=0.1):
+                    if cancelled():
+                        return
+                futures.put((sentence, self._executor.submit(self.synthesize, sentence)))
+        except Exception as e:
+            self.logger.error(f"Sentence source error: {e}")
+        finally:
+            futures.put(None)
+
+    def speak(self, sentences, cancelled=None, fallback=None):
+        """Speak sentences in order.
+
+        Args:
+            sentences (iterable): Sentences to speak; may be a generator
+            cancelled (callable): Returns True to abandon the remaining sentences
+            fallback (callable): Speaks a sentence whose synthesis failed, in its
+                place in the order; returns False if it could not
+
+        Returns:
+            dict: Sentences played, sentences spoken by the fallback, total time,
+                time spent waiting on synthesis, and ``unplayed``: every sentence
+                that was neither played nor spoken by the fallback, in order
+        """
+        cancelled = cancelled or (lambda: False)
+        start = time.monotonic()
+        first_audio = None
+        stalled = 0.0
+        played = 0
+        fell_back = 0
+        unplayed = []
+
+        futures = queue.Queue()
+        slots = threading.Semaphore(self.lookahead)
+        threading.Thread(
+            target=self._feed, args=(iter(sentences), futures, slots, cancelled), daemon=True
+        ).start()
+
+        wait_start = time.monotonic()
+        while not cancelled():
+            try:
+                item = futures.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is None:
+                break
+            slots.release()
+            sentence, future = item
+
+            try:
+                audio = future.result()
+            except Exception as e:
+                self.logger.error(f"Speech synthesis error: {e}")
+                audio = None
+            stalled += time.monotonic() - wait_start
+
+            if audio and not cancelled():
+                if first_audio is None:
+                    first_audio = time.monotonic() - start
+                finished = self.play(audio) is not False
+                played += finished
+            elif cancelled():
+                break
+            elif fallback is not None and fallback(sentence) is not False:
+                fell_back += 1
+            else:
+                unplayed.append(sentence)
+            wait_start = time.monotonic()
+
+        total = time.monotonic() - start
+        self.logger.info(f"Spoke {played} sentences in {total:.2f}s ({stalled:.2f}s waiting on synthesis"
+                         + (f", first audio after {first_audio:.2f}s)" if first_audio is not None else ")"))
+        if fell_back or unplayed:
+            self.logger.warning(f"Synthesis failed for {fell_back + len(unplayed)} sentences, "
+                                f"{fell_back} spoken by the fallback")
+        return {'played': played, 'fallback': fell_back, 'total': total, 'stalled': stalled,
+                'first_audio': first_audio, 'unplayed': unplayed}
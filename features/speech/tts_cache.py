@@ -0,0 +1,238 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from .config import SpeechConfig
+
+
+class TTSCache:
+    """Content-addressed cache of synthesized speech.
+
+    Entries are keyed by the text plus the voice parameters (spd, pit, vol, per)
+    and the audio encoding (aue).
+    A small in-memory LRU tier sits in front of a size-bounded on-disk tier whose
+    files are evicted least-recently-used first.
+    """
+
+    VOICE_KEYS = ('spd', 'pit', 'vol', 'per', 'aue')
+
+    def __init__(self, cache_dir=SpeechConfig.TTS_CACHE_DIR,
+                 max_disk_bytes=SpeechConfig.TTS_CACHE_MAX_BYTES,
+                 max_memory_items=SpeechConfig.TTS_CACHE_MEMORY_ITEMS):
+        """Initialize the cache and index any audio already on disk.
+
+        Args:
+            cache_dir (str): Directory for cached audio files
+            max_disk_bytes (int): Size limit of the on-disk tier
+            max_memory_items (int): Number of clips kept in memory
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_disk_bytes = max_disk_bytes
+        self.max_memory_items = max_memory_items
+        self.logger = logging.getLogger(__name__)
+
+        self._memory = OrderedDict()
+        self._disk = OrderedDict()  # key -> size, least recently used first
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+        self._load_index()
+
+    def _load_index(self):
+        """Index existing cache files ordered by last access time."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            files = sorted(self.cache_dir.glob('*.audio'), key=lambda f: f.stat().st_mtime)
+        except OSError as e:
+            self.logger.warning(f"TTS cache directory unavailable: {e}")
+            return
+
+        for path in files:
+            size = path.stat().st_size
+            self._disk[path.stem] = size
+            self._disk_bytes += size
+
+    @classmethod
+    def key(cls, text, options):
+        """Build the cache key for a text and its voice parameters.
+
+        Args:
+            text (str): Text to be spoken
+            options (dict): Baidu synthesis options
+
+        Returns:
+            str: Hex digest identifying the audio
+        """
+        voice = {k: options.get(k) for k in cls.VOICE_KEYS}
+        payload = json.dumps([text, voice], ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return self.cache_dir / f'{key}.audio'
+
+    def _remember(self, key, audio):
+        """Add audio to the memory tier, evicting the oldest entry if full."""
+        self._memory[key] = audio
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def get(self, text, options):
+        """Look up cached audio.
+
+        Args:
+            text (str): Text to be spoken
+            options (dict): Baidu synthesis options
+
+        Returns:
+            bytes: Cached audio, or None on a miss
+        """
+        key = self.key(text, options)
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return audio
+
+            if key in self._disk:
+                try:
+                    audio = self._path(key).read_bytes()
+                    os.utime(self._path(key))
+                    self._disk.move_to_end(key)
+                    self._remember(key, audio)
+                    self.hits += 1
+                    return audio
+                except OSError:
+                    self._disk_bytes -= self._disk.pop(key)
+
+            self.misses += 1
+            return None
+
+    def put(self, text, options, audio):
+        """Store synthesized audio in both tiers.
+
+        Args:
+            text (str): Text that was spoken
+            options (dict): Baidu synthesis options
+            audio (bytes): Audio returned by synthesis
+        """
+        key = self.key(text, options)
+        with self._lock:
+            self._remember(key, audio)
+
+            if key in self._disk or len(audio) > self.max_disk_bytes:
+                return
+
+            try:
+                tmp_path = self._path(key).with_suffix('.tmp')
+                tmp_path.write_bytes(audio)
+                os.replace(tmp_path, self._path(key))
+            except OSError as e:
+                self.logger.warning(f"Failed to write TTS cache entry: {e}")
+                return
+
+            self._disk[key] = len(audio)
+            self._disk_bytes += len(audio)
+            self._evict()
+
+    def _evict(self):
+        """Delete least recently used files until the disk tier fits its limit."""
+        while self._disk_bytes > self.max_disk_bytes and self._disk:
+            key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+    def get_or_synthesize(self, text, options, synthesize):
+        """Return cached audio, synthesizing and storing it on a miss.
+
+        Args:
+            text (str): Text to be spoken
+            options (dict): Baidu synthesis options
+            synthesize (callable): Called as synthesize(text, options) on a miss;
+                returns audio bytes or an error dict
+
+        Returns:
+            bytes or dict: Audio, or the error dict returned by synthesize
+        """
+        audio = self.get(text, options)
+        if audio is not None:
+            return audio
+
+        result = synthesize(text, options)
+        if not isinstance(result, dict):
+            self.put(text, options, result)
+        return result
+
+    def prewarm(self, phrases, options, synthesize):
+        """Synthesize any of the given phrases that are not cached yet.
+
+        Args:
+            phrases (list): Fixed phrases spoken every session
+            options (dict): Baidu synthesis options
+            synthesize (callable): Called as synthesize(text, options)
+
+        Returns:
+            int: Number of phrases newly synthesized
+        """
+        synthesized = 0
+        for text in phrases:
+            with self._lock:
+                cached = self.key(text, options) in self._disk
+            if cached:
+                continue
+            try:
+                result = synthesize(text, options)
+            except Exception as e:
+                self.logger.warning(f"TTS pre-warm failed for '{text}': {e}")
+                continue
+            if not isinstance(result, dict):
+                self.put(text, options, result)
+                synthesized += 1
+
+        self.logger.info(f"TTS cache pre-warmed: {synthesized} new of {len(phrases)} phrases")
+        return synthesized
+
+    def stats(self):
+        """Return hit rate and tier sizes.
+
+        Returns:
+            dict: Hits, misses, hit rate, memory entries, disk entries and bytes
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'memory_entries': len(self._memory),
+                'disk_entries': len(self._disk),
+                'disk_bytes': self._disk_bytes,
+            }
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_tts_cache():
+    """Return the process-wide TTS cache, creating it on first use.
+
+    Returns:
+        TTSCache: Shared cache instance
+    """
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = TTSCache()
+        return _shared_cache
@@ -4,13 +4,13 @@ import speech_recognition as sr
 import io
 import wave
 import audioop
-import socket
 import logging
-from functools import lru_cache
 from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
 
+from features.speech import ASRMetrics, create_recognition_router
+
 load_dotenv()
 
 
@@ -39,6 +39,10 @@ class RecognizeSpeech:
         # Configure speech recognition parameters
         self.configure_recognizer()
 
+        # Route between Baidu and the shared on-device recognizer
+        self.asr_metrics = ASRMetrics(self.logger)
+        self.asr_router = create_recognition_router(self.speech_client, self._get_asr_config(), self.asr_metrics)
+
     def _setup_logger(self, name, log_dir):
         """Set up logger configuration.
 
@@ -88,22 +92,6 @@ class RecognizeSpeech:
         self.recognizer.phrase_threshold = 0.3
         self.recognizer.non_speaking_duration = 0.5
 
-    @lru_cache(maxsize=1)
-    def _check_network_connection(self, timeout=3):
-        """Check network connection status with caching.
-
-        Args:
-            timeout (int): Connection timeout in seconds
-
-        Returns:
-            bool: True if network is available, False otherwise
-        """
-        try:
-            socket.create_connection(("baidu.com", 80), timeout=timeout)
-            return True
-        except (OSError, socket.timeout):
-            return False
-
     def _get_asr_config(self):
         """Get Baidu Speech Recognition API parameters.
 
@@ -176,11 +164,6 @@ class RecognizeSpeech:
                 self.logger.error("No microphone detected or accessible")
                 return None
 
-            # Check network connection for Baidu API
-            if not self._check_network_connection():
-                self.logger.error("Network unavailable for Baidu Speech Recognition")
-                return None
-
             with sr.Microphone() as source:
                 self.logger.info("Listening for speech...")
 
@@ -232,33 +215,16 @@ class RecognizeSpeech:
         Returns:
             str: Recognized text, or None if recognition fails
         """
-        # Check network availability
-        if not self._check_network_connection():
-            self.logger.error("Network unavailable for speech recognition")
-            return None
-
         self.logger.info("Recognizing speech...")
 
         try:
             # Convert audio to PCM
             pcm_data = self._convert_to_pcm(audio)
-
-            # Get ASR configuration
-            asr_config = self._get_asr_config()
-
-            # Call Baidu Speech Recognition API
-            result = self.speech_client.asr(pcm_data, 'pcm', 16000, asr_config)
-
-            if result and result.get('err_no') == 0:
-                recognized_text = result.get('result')[0]
-                self.logger.info(f"Recognition successful: {recognized_text}")
-                return recognized_text
-
-            self.logger.error(f"Baidu Speech Recognition failed: {result}")
-            return None
-
         except Exception as e:
             self.logger.error(f"Speech recognition processing error: {e}")
             return None
 
-
+        recognized_text = self.asr_router.recognize(pcm_data)
+        if recognized_text:
+            self.logger.info(f"Recognition successful: {recognized_text}")
+        return recognized_text
@@ -3,9 +3,6 @@ import os
 import speech_recognition as sr
 import json
 import wave
-import queue
-import threading
-import pyttsx3
 from aip import AipSpeech
 from datetime import datetime
 import logging
@@ -14,13 +11,21 @@ import time
 import io
 import audioop
 import requests
-import socket
-from functools import lru_cache
+
+from features.chat import ConversationStore, ResponseCache, iter_sentences, iter_sse_content
+from features.common.network import get_network_probe
+from features.resilience import ResilienceError, get_policy
+from features.speech import ASRMetrics, create_recognition_router, get_speech_output
 
 
 class VoiceAssistant:
     """Voice assistant that handles speech recognition, speech synthesis, and conversation."""
 
+    SYSTEM_PROMPT = ("You are a friendly, professional assistant named 小朋友 who provides concise "
+                     "responses under 30 words. For unclear or incomplete questions, "
+                     "politely ask for clarification in the user input language. Never mention your word "
+                     "count limit.")
+
     def __init__(self, log_dir="logs", baidu_app_id=None, baidu_api_key=None,
                  baidu_secret_key=None, deepseek_api_key=None):
         """Initialize voice assistant with necessary components.
@@ -43,22 +48,19 @@ class VoiceAssistant:
         if all([baidu_app_id, baidu_api_key, baidu_secret_key]):
             self.speech_client = AipSpeech(baidu_app_id, baidu_api_key, baidu_secret_key)
 
+        # Route between Baidu and the shared on-device recognizer, loaded once in the background
+        self.asr_metrics = ASRMetrics(self.logger)
+        self.asr_router = create_recognition_router(self.speech_client, self._get_asr_config(), self.asr_metrics)
+
         # Initialize DeepSeek API
         self.deepseek_api_key = os.getenv('DEEPSEEK_API_KEY')
         self.deepseek_api_url = os.getenv('DEEPSEEK_API_URL')
+        self.chat_policy = get_policy('deepseek')
+        self.response_cache = ResponseCache()
+        self.conversations = ConversationStore(summarizer=self._summarize_turns)
 
-        # Initialize TTS engine
-        self.voice_queue = queue.Queue()
-        self.engine = pyttsx3.init()
-        self._setup_voice_engine()
-
-        # Start speech processing thread
-        self.voice_thread = threading.Thread(target=self._process_voice_queue, daemon=True)
-        self.voice_thread.start()
-
-        # Create temp directory for audio files
-        self.temp_audio_dir = Path(__file__).parent / 'temp_audio'
-        self.temp_audio_dir.mkdir(exist_ok=True)
+        # Shared speech output (one online client, one offline engine)
+        self.speech_output = get_speech_output()
 
     def _setup_logger(self, name, log_dir):
         """Set up logger configuration.
@@ -98,39 +100,13 @@ class VoiceAssistant:
 
         return logger
 
-    def _setup_voice_engine(self):
-        """Configure text-to-speech engine."""
-        voices = self.engine.getProperty('voices')
-        self.engine.setProperty('voice', voices[1].id)  # Female voice
-        self.engine.setProperty('rate', 150)  # Speech rate
-        self.engine.setProperty('volume', 0.8)  # Volume
-
-    def _process_voice_queue(self):
-        """Process the speech synthesis queue."""
-        while True:
-            try:
-                message = self.voice_queue.get()
-                self.engine.say(message)
-                self.engine.runAndWait()
-                self.voice_queue.task_done()
-            except Exception as e:
-                self.logger.error(f"Voice queue processing error: {e}")
-
-    @lru_cache(maxsize=1)
-    def _check_network_connection(self, timeout=3):
-        """Check network connection status with caching.
-
-        Args:
-            timeout (int): Connection timeout in seconds
+    def _check_network_connection(self):
+        """Check network connection status, reusing a recent result.
 
         Returns:
             bool: True if network is available, False otherwise
         """
-        try:
-            socket.create_connection(("baidu.com", 80), timeout=timeout)
-            return True
-        except (OSError, socket.timeout):
-            return False
+        return get_network_probe().is_online()
 
     def _setup_audio_source(self, source):
         """Configure audio source parameters.
@@ -188,18 +164,18 @@ class VoiceAssistant:
         Returns:
             str: Recognized text, or None if recognition fails
         """
-        # Check network and online recognition availability
-        network_available = self._check_network_connection()
         self.logger.info("Recognizing speech...")
 
-        if network_available and self.speech_client:
-            result = self._online_recognition(audio)
-            if result:
-                self.logger.info(f"Online recognition successful: {result}")
-                return result
+        try:
+            pcm_data = self._convert_to_pcm(audio)
+        except Exception as e:
+            self.logger.error(f"Audio conversion error: {e}")
+            return None
 
-        self.logger.info("Using offline recognition")
-        return None  # No online recognition successful
+        result = self.asr_router.recognize(pcm_data)
+        if result:
+            self.logger.info(f"Recognition successful: {result}")
+        return result
 
     def _get_asr_config(self):
         """Get Baidu Speech Recognition API parameters.
@@ -257,127 +233,118 @@ class VoiceAssistant:
 
         return pcm_data
 
-    def _online_recognition(self, audio):
-        """Perform online speech recognition using Baidu API.
+    def speak(self, text, wait=True):
+        """Convert text to speech.
 
         Args:
-            audio: Audio data
+            text (str): Text to be converted to speech
+            wait (bool): Block until the text has been spoken
+        """
+        if not text:
+            return
+
+        online = bool(self._check_network_connection())
+        self.speech_output.say(text, online=online, wait=wait)
+
+    def _chat_headers(self):
+        """Build DeepSeek API request headers.
 
         Returns:
-            str: Recognized text, or None if recognition fails
+            dict: HTTP headers
         """
-        try:
-            # Convert audio to PCM
-            pcm_data = self._convert_to_pcm(audio)
+        return {
+            "Authorization": f"Bearer {self.deepseek_api_key}",
+            "Content-Type": "application/json"
+        }
+
+    def _build_chat_payload(self, messages, stream=False, max_tokens=100):
+        """Build the DeepSeek chat completion request body.
 
-            # Get ASR configuration
-            asr_config = self._get_asr_config()
+        Args:
+            messages (list): Chat messages, system prompt first
+            stream (bool): Request a server-sent-event stream
+            max_tokens (int): Reply length limit
+
+        Returns:
+            dict: Request body
+        """
+        data = {
+            "model": "deepseek-chat",
+            "messages": messages,
+            "temperature": 0.7,
+            "max_tokens": max_tokens
+        }
+        if stream:
+            data["stream"] = True
+        return data
 
-            # Call Baidu Speech Recognition API
-            result = self.speech_client.asr(pcm_data, 'pcm', 16000, asr_config)
+    def _summarize_turns(self, summary, turns):
+        """Fold older conversation turns into a short summary using DeepSeek.
 
-            if result and result.get('err_no') == 0:
-                return result.get('result')[0]
+        Args:
+            summary (str): Existing summary
+            turns (list): (user_text, reply) pairs to fold in
 
-            self.logger.error(f"Baidu Speech Recognition failed: {result}")
+        Returns:
+            str: New summary, or None if the request fails
+        """
+        if self._chat_unavailable_reason():
             return None
 
-        except Exception as e:
-            self.logger.error(f"Online recognition error: {e}")
+        history = "\n".join(f"用户：{u}\n助手：{r}" for u, r in turns)
+        messages = [
+            {"role": "system", "content": "用不超过80个字总结以下对话中的关键信息，供后续对话参考。"},
+            {"role": "user", "content": f"已有摘要：{summary or '无'}\n新对话：\n{history}"}
+        ]
+        response = self.chat_policy.call(
+            lambda: requests.post(
+                self.deepseek_api_url,
+                headers=self._chat_headers(),
+                json=self._build_chat_payload(messages, max_tokens=120),
+                timeout=10
+            ),
+            failed=self._chat_failed
+        )
+        if response.status_code != 200:
             return None
+        return response.json()['choices'][0]['message']['content'].strip()
 
-    def speak(self, text):
-        """Convert text to speech.
+    def reset_conversation(self, user=None):
+        """Forget the conversation history of a user.
 
         Args:
-            text (str): Text to be converted to speech
+            user (str): Recognized user name, None for an unknown speaker
         """
-        if not text:
-            return
+        self.conversations.reset(user)
 
-        if self._check_network_connection() and self.speech_client:
-            self._online_speak(text)
-        else:
-            self._offline_speak(text)
+    @staticmethod
+    def _chat_failed(response):
+        """Whether a DeepSeek response counts against the service's circuit breaker."""
+        return response.status_code >= 500 or response.status_code == 429
 
-    def _online_speak(self, text):
-        """Use Baidu TTS for speech synthesis.
+    def _chat_unavailable_reason(self):
+        """Check whether DeepSeek chat can be reached.
 
-        Args:
-            text (str): Text to be spoken
+        Returns:
+            str: Message to speak if chat is unavailable, None otherwise
         """
-        try:
-            result = self.speech_client.synthesis(text, 'zh', 1, {
-                'spd': 6,  # Speed (0-9)
-                'pit': 5,  # Pitch (0-9)
-                'vol': 5,  # Volume (0-15)
-                'per': 4,  # Voice selection
-            })
-
-            # Check if synthesis was successful
-            if not isinstance(result, dict):
-                # Create temporary file with a simple name (avoiding path issues)
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                temp_file = self.temp_audio_dir / f'tts_{timestamp}.mp3'
-
-                with open(temp_file, 'wb') as f:
-                    f.write(result)
-
-                # Play audio using a different approach
-                try:
-                    # Try with playsound 1.2.2 (different argument handling)
-                    from playsound import playsound
-                    playsound(str(temp_file), True)  # True = blocking
-                except Exception as play_error:
-                    self.logger.warning(f"First playback method failed: {play_error}")
-                    try:
-                        # Alternative playback method using winsound on Windows
-                        import platform
-                        if platform.system() == 'Windows':
-                            import winsound
-                            # Convert mp3 to wav first
-                            from pydub import AudioSegment
-                            sound = AudioSegment.from_mp3(temp_file)
-                            wav_file = temp_file.with_suffix('.wav')
-                            sound.export(wav_file, format="wav")
-                            winsound.PlaySound(str(wav_file), winsound.SND_FILENAME)
-                            # Clean up the WAV file
-                            os.remove(wav_file)
-                        else:
-                            # On non-Windows systems, try alternative method
-                            import subprocess
-                            subprocess.call(['mpg123', str(temp_file)], stdout=subprocess.DEVNULL,
-                                            stderr=subprocess.DEVNULL)
-                    except Exception as alt_error:
-                        self.logger.warning(f"Alternative playback method failed: {alt_error}")
-                        self._offline_speak(text)
-
-                # Remove temporary file
-                try:
-                    os.remove(temp_file)
-                except Exception as e:
-                    self.logger.warning(f"Failed to delete temporary audio file: {e}")
-            else:
-                self.logger.error(f"Speech synthesis failed: {result}")
-                self._offline_speak(text)
-        except Exception as e:
-            self.logger.error(f"Online speech synthesis error: {e}")
-            self._offline_speak(text)
+        if not self.chat_policy.available:
+            return "抱歉，聊天服务暂时不可用，请稍后再试。"
 
-    def _offline_speak(self, text):
-        """Use pyttsx3 for offline speech synthesis.
+        if not self._check_network_connection():
+            return "Sorry, I am currently unable to connect to the internet."
 
-        Args:
-            text (str): Text to be spoken
-        """
-        self.voice_queue.put(text)
-        self.logger.info(f"Using offline speech synthesis")
+        if not self.deepseek_api_key or not self.deepseek_api_url:
+            return "Sorry, I am not properly configured for chat functionality."
+
+        return None
 
-    def chat(self, text):
+    def chat(self, text, user=None):
         """Process user input text using DeepSeek AI chat.
 
         Args:
             text (str): User input text
+            user (str): Recognized user name whose conversation continues
 
         Returns:
             str: System response text
@@ -385,37 +352,33 @@ class VoiceAssistant:
         if not text:
             return "I didn't hear anything. Could you please try again?"
 
-        if not self._check_network_connection():
-            return "Sorry, I am currently unable to connect to the internet."
+        # Cached replies only answer a conversation's opening question
+        conversation = self.conversations.get(user)
+        first_turn = conversation.is_empty
+        cached = self.response_cache.get(text) if first_turn else None
+        if cached:
+            self.logger.info("Chat response served from cache")
+            conversation.add_turn(text, cached)
+            return cached
 
-        if not self.deepseek_api_key or not self.deepseek_api_url:
-            return "Sorry, I am not properly configured for chat functionality."
+        unavailable = self._chat_unavailable_reason()
+        if unavailable:
+            return unavailable
 
         try:
-            headers = {
-                "Authorization": f"Bearer {self.deepseek_api_key}",
-                "Content-Type": "application/json"
-            }
-
-            data = {
-                "model": "deepseek-chat",
-                "messages": [
-                    {"role": "system",
-                     "content": "You are a friendly, professional assistant named 小朋友 who provides concise "
-                                "responses under 30 words. For unclear or incomplete questions, "
-                                "politely ask for clarification in the user input language. Never mention your word "
-                                "count limit."},
-                    {"role": "user", "content": text}
-                ],
-                "temperature": 0.7,
-                "max_tokens": 100
-            }
-
-            response = requests.post(
-                self.deepseek_api_url,
-                headers=headers,
-                json=data,
-                timeout=10
+            start = time.monotonic()
+            headers = self._chat_headers()
+            data = self._build_chat_payload(conversation.messages(self.SYSTEM_PROMPT, text))
+
+            # Chat completions are not idempotent, so they are never retried
+            response = self.chat_policy.call(
+                lambda: requests.post(
+                    self.deepseek_api_url,
+                    headers=headers,
+                    json=data,
+                    timeout=10
+                ),
+                failed=self._chat_failed
             )
 
             if response.status_code == 200:
@@ -426,13 +389,21 @@ class VoiceAssistant:
                 if reply:
                     sentences = reply.split('.')
                     shortened_reply = '.'.join(sentences[:1]) + '.' if len(sentences) > 2 else reply  # Keep the first 2 sentences
-                    return shortened_reply.strip()
+                    reply = shortened_reply.strip()
+                # An empty reply is not worth remembering
+                if reply:
+                    if first_turn:
+                        self.response_cache.put(text, reply, time.monotonic() - start)
+                    conversation.add_turn(text, reply)
                 return reply
             else:
                 self.logger.error(f"API request failed: {response.status_code}, {response.text}")
                 # return "Sorry, I couldn't process your request. Please try again."
                 return "抱歉，我无法将代码注释或内容翻译成中文。如果您需要技术帮助或代码修改，请告诉我！"
 
+        except ResilienceError as e:
+            self.logger.warning(f"Chat request refused: {e}")
+            return "抱歉，聊天服务暂时不可用，请稍后再试。"
         except requests.exceptions.Timeout:
             # return "Sorry, the request timed out. Please try again."
             return "抱歉，请求超时。请再试一次。"
@@ -444,7 +415,81 @@ class VoiceAssistant:
             # return "I encountered an error while processing your request."
             return "处理您的请求时遇到错误。"
 
+    def chat_stream(self, text, user=None):
+        """Stream a DeepSeek AI chat reply sentence by sentence.
+
+        Each sentence is yielded as soon as its closing punctuation arrives, so it
+        can be handed to speech synthesis while the rest is still generating.
+
+        Args:
+            text (str): User input text
+            user (str): Recognized user name whose conversation continues
+
+        Yields:
+            str: Reply sentences, or a single error message
+        """
+        if not text:
+            yield self.chat(text)
+            return
+
+        conversation = self.conversations.get(user)
+        first_turn = conversation.is_empty
+        cached = self.response_cache.get(text) if first_turn else None
+        if cached:
+            self.logger.info("Chat response served from cache")
+            conversation.add_turn(text, cached)
+            yield from iter_sentences([cached])
+            return
+
+        unavailable = self._chat_unavailable_reason()
+        if unavailable:
+            yield unavailable
+            return
 
+        start = time.monotonic()
+        first_sentence = True
+        reply = []
+        try:
+            payload = self._build_chat_payload(conversation.messages(self.SYSTEM_PROMPT, text), stream=True)
+            with self.chat_policy.call(
+                lambda: requests.post(
+                    self.deepseek_api_url,
+                    headers=self._chat_headers(),
+                    json=payload,
+                    timeout=10,
+                    stream=True
+                ),
+                failed=self._chat_failed
+            ) as response:
+                if response.status_code != 200:
+                    self.logger.error(f"API request failed: {response.status_code}, {response.text}")
+                    yield "抱歉，我无法将代码注释或内容翻译成中文。如果您需要技术帮助或代码修改，请告诉我！"
+                    return
+
+                for sentence in iter_sentences(iter_sse_content(response)):
+                    if first_sentence:
+                        first_sentence = False
+                        self.logger.info(f"First chat sentence after {time.monotonic() - start:.2f}s")
+                    reply.append(sentence)
+                    yield sentence
+
+            self.logger.info(f"Chat stream finished after {time.monotonic() - start:.2f}s")
+            # An empty reply is not worth remembering
+            if reply:
+                if first_turn:
+                    self.response_cache.put(text, ' '.join(reply), time.monotonic() - start)
+                conversation.add_turn(text, ' '.join(reply))
+
+        except ResilienceError as e:
+            self.logger.warning(f"Chat request refused: {e}")
+            yield "抱歉，聊天服务暂时不可用，请稍后再试。"
+        except requests.exceptions.Timeout:
+            yield "抱歉，请求超时。请再试一次。"
+        except requests.exceptions.ConnectionError:
+            yield "抱歉，我无法连接到服务器。"
+        except Exception as e:
+            self.logger.error(f"Chat stream processing error: {e}")
+            yield "处理您的请求时遇到错误。"
 
 
 def main():
@@ -1,14 +1,21 @@
 # Import essential classes for convenient package-level access
 from .config import Config
-from .exception import APILimitExceededError, InvalidResponseError
+from .exception import APIError, APILimitExceededError, APIUnavailableError, InvalidResponseError
 from .api_client import APIClient
-from .weather_service import WeatherService
+from .location import Location, LocationProvider, get_location_provider
+from .weather_service import WeatherService, get_weather_service
 
 # Define what gets exposed when importing the package
 __all__ = [
     "APIClient",
+    "APIError",
     "APILimitExceededError",
+    "APIUnavailableError",
     "Config",
     "InvalidResponseError",
-    "WeatherService"
+    "Location",
+    "LocationProvider",
+    "WeatherService",
+    "get_location_provider",
+    "get_weather_service"
 ]
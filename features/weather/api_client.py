@@ -1,26 +1,101 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 from .config import Config
-from .exception import APILimitExceededError, InvalidResponseError
+from features.resilience import get_policy
+from .exception import APILimitExceededError, APIUnavailableError, InvalidResponseError
 
 
 class APIClient:
     """"Handles API requests for weather data."""
 
-    def __init__(self, base_url=Config.BASE_URL, api_key=Config.API_KEY):
-        self.base_url = base_url
+    def __init__(self, host=Config.API_HOST, api_key=Config.API_KEY, timeout=Config.REQUEST_TIMEOUT):
+        """Initialize the client.
+
+        Args:
+            host (str): QWeather API host, e.g. a local fake server for testing
+            api_key (str): QWeather API key
+            timeout (float): Timeout of each request in seconds
+        """
+        self.host = host.rstrip('/')
         self.api_key = api_key
+        self.timeout = timeout
+        # Keep-alive connections are reused across endpoints and refreshes
+        self.session = requests.Session()
+        self.policy = get_policy('qweather')
+        self._executor = ThreadPoolExecutor(max_workers=len(Config.ENDPOINTS), thread_name_prefix='weather')
+
+    def get(self, longitude, latitude, endpoint="now"):
+        """Fetch weather data for a given location from one endpoint.
+
+        Args:
+            longitude (float): Longitude
+            latitude (float): Latitude
+            endpoint (str): Key of Config.ENDPOINTS
 
-    def get(self, latitude, longitude):
-        """Fetch weather data for a given location."""
+        Returns:
+            dict: Decoded JSON response
+
+        Raises:
+            APILimitExceededError: If the API rate limit is exceeded
+            APIUnavailableError: If the API cannot be reached after retries
+            InvalidResponseError: If the API returns an error
+            ResilienceError: If the call is refused by the breaker or budget
+        """
         params = {
-            "location": f"{latitude},{longitude}",
+            "location": f"{longitude},{latitude}",
             "key": self.api_key,
         }
-        response = requests.get(self.base_url, params=params)
-
-        if response.status_code == 200:
-            return response.json()
-        elif response.status_code == 429:
-            raise APILimitExceededError("API rate limit exceeded. Try again later.")
-        else:
-            raise InvalidResponseError(f"Invalid response from API: {response.text}")
+        url = self.host + Config.ENDPOINTS[endpoint]
+
+        def request():
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except requests.RequestException as e:
+                raise APIUnavailableError(f"Request to {endpoint} failed: {e}") from e
+
+            if response.status_code == 200:
+                data = response.json()
+                if "code" in data and data["code"] != "200":
+                    if data["code"] == "429":
+                        raise APILimitExceededError("API rate limit exceeded. Try again later.")
+                    raise InvalidResponseError(f"API returned error code: {data['code']}")
+                return data
+            elif response.status_code == 429:
+                raise APILimitExceededError("API rate limit exceeded. Try again later.")
+            elif response.status_code >= 500:
+                raise APIUnavailableError(f"Server error from API: {response.status_code}")
+            else:
+                raise InvalidResponseError(f"Invalid response from API: {response.text}")
+
+        # Reads are idempotent: transient failures are retried within the provider budget
+        return self.policy.call(request, idempotent=True, retry_on=(APIUnavailableError,))
+
+    def get_many(self, longitude, latitude, endpoints=None):
+        """Fetch several endpoints concurrently.
+
+        One failing or slow endpoint does not hold back the others; each is
+        bounded by the per-request timeout.
+
+        Args:
+            longitude (float): Longitude
+            latitude (float): Latitude
+            endpoints (list): Keys of Config.ENDPOINTS, all of them by default
+
+        Returns:
+            tuple: (results, errors) dicts keyed by endpoint; errors holds the
+                exception raised for each endpoint that failed
+        """
+        endpoints = list(endpoints or Config.ENDPOINTS)
+        futures = {
+            endpoint: self._executor.submit(self.get, longitude, latitude, endpoint)
+            for endpoint in endpoints
+        }
+
+        results, errors = {}, {}
+        for endpoint, future in futures.items():
+            try:
+                results[endpoint] = future.result()
+            except Exception as e:
+                errors[endpoint] = e
+        return results, errors
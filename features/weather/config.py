@@ -6,4 +6,21 @@ load_dotenv()
 
 class Config:
     API_KEY = os.getenv("WEATHER_API_KEY")
-    BASE_URL = "https://api.qweather.com/v7/weather/now"
+    API_HOST = os.getenv("WEATHER_API_HOST", "https://api.qweather.com")
+
+    # QWeather endpoints fetched together and merged into one result
+    ENDPOINTS = {
+        "now": "/v7/weather/now",
+        "hourly": "/v7/weather/24h",
+        "air": "/v7/air/now",
+    }
+    REQUEST_TIMEOUT = float(os.getenv("WEATHER_REQUEST_TIMEOUT", "5"))  # seconds per request
+    HOURLY_HOURS = int(os.getenv("WEATHER_HOURLY_HOURS", "6"))  # forecast hours kept
+
+    # Background refresh interval; rate limits back off up to the maximum
+    REFRESH_INTERVAL = float(os.getenv("WEATHER_REFRESH_INTERVAL", "480"))  # seconds
+    REFRESH_MAX_BACKOFF = float(os.getenv("WEATHER_REFRESH_MAX_BACKOFF", "3600"))  # seconds
+
+    # IP geolocation is looked up once and persisted; the mirror rarely moves
+    LOCATION_CACHE_PATH = os.getenv("LOCATION_CACHE_PATH", "cache/location.json")
+    LOCATION_REFRESH = float(os.getenv("LOCATION_REFRESH", str(24 * 3600)))  # seconds
@@ -11,3 +11,8 @@ class InvalidResponseError(APIError):
 class APILimitExceededError(APIError):
     """Raised when API rate limits are exceeded."""
     pass
+
+
+class APIUnavailableError(APIError):
+    """Raised when the API cannot be reached or fails server-side."""
+    pass
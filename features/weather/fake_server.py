@@ -0,0 +1,105 @@
+"""Local stand-in for the QWeather API, for exercising the client offline.
+
+Usage:
+    python -m features.weather.fake_server [--port 8090] [--delay air=3] [--fail hourly=500]
+
+Then point the client at it with WEATHER_API_HOST=http://127.0.0.1:8090.
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from .config import Config
+
+CANNED_RESPONSES = {
+    "now": {
+        "code": "200",
+        "updateTime": "2025-01-01T12:00+08:00",
+        "fxLink": "https://www.qweather.com",
+        "now": {"text": "晴", "temp": "18", "feelsLike": "17", "humidity": "40", "windDir": "东南风",
+                "windSpeed": "3", "pressure": "1015", "vis": "25", "cloud": "10"},
+        "refer": {"sources": ["QWeather"]},
+    },
+    "hourly": {
+        "code": "200",
+        "hourly": [{"fxTime": f"2025-01-01T{13 + i}:00+08:00", "text": "多云", "temp": str(18 - i), "pop": "10"}
+                   for i in range(24 - 13)],
+    },
+    "air": {
+        "code": "200",
+        "now": {"aqi": "42", "category": "优", "primary": "NA", "pm2p5": "12"},
+    },
+}
+
+
+def start_fake_server(port=0, delays=None, failures=None):
+    """Serve canned QWeather responses on a background thread.
+
+    Args:
+        port (int): Port to listen on, 0 for any free port
+        delays (dict): Endpoint -> seconds to wait before answering
+        failures (dict): Endpoint -> HTTP status to answer with instead
+
+    Returns:
+        tuple: (server, host URL); call server.shutdown() to stop it
+    """
+    delays = delays or {}
+    failures = failures or {}
+    paths = {path: endpoint for endpoint, path in Config.ENDPOINTS.items()}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            endpoint = paths.get(urlparse(self.path).path)
+            if endpoint is None:
+                self.send_error(404)
+                return
+
+            time.sleep(delays.get(endpoint, 0))
+            status = failures.get(endpoint, 200)
+            body = json.dumps(CANNED_RESPONSES[endpoint] if status == 200 else {"code": str(status)},
+                              ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _parse_overrides(values, cast):
+    overrides = {}
+    for value in values or []:
+        endpoint, _, setting = value.partition('=')
+        overrides[endpoint] = cast(setting)
+    return overrides
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--delay', action='append', help="endpoint=seconds")
+    parser.add_argument('--fail', action='append', help="endpoint=status")
+    args = parser.parse_args()
+
+    server, url = start_fake_server(args.port, _parse_overrides(args.delay, float),
+                                    _parse_overrides(args.fail, int))
+    print(f"Fake QWeather API at {url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from .config import Config
+
+
+class Location:
+    """Geographic position of the mirror."""
+
+    def __init__(self, lat, lng, city=None, fetched_at=None):
+        """Initialize the location.
+
+        Args:
+            lat (float): Latitude
+            lng (float): Longitude
+            city (str): City name
+            fetched_at (float): Unix time of the lookup
+        """
+        self.lat = lat
+        self.lng = lng
+        self.city = city
+        self.fetched_at = fetched_at if fetched_at is not None else time.time()
+
+    def to_dict(self):
+        return {'lat': self.lat, 'lng': self.lng, 'city': self.city, 'fetched_at': self.fetched_at}
+
+    def __repr__(self):
+        return f"Location({self.lat}, {self.lng}, city={self.city!r})"
+
+
+def geocoder_lookup():
+    """Look up the current location from the public IP address.
+
+    Returns:
+        Location: The location, or None if the lookup failed
+    """
+    import geocoder
+
+    result = geocoder.ip("me")
+    if not result.ok or result.lat is None or result.lng is None:
+        return None
+    return Location(result.lat, result.lng, result.city)
+
+
+class LocationProvider:
+    """IP geolocation cached in memory and on disk.
+
+    The lookup runs at most once per refresh interval, across restarts. A
+    failed refresh keeps serving the last known location.
+    """
+
+    RETRY_INTERVAL = 300  # seconds between attempts after a failed lookup
+
+    def __init__(self, path=Config.LOCATION_CACHE_PATH, refresh=Config.LOCATION_REFRESH,
+                 lookup=geocoder_lookup):
+        """Initialize the provider and load the persisted location.
+
+        Args:
+            path (str): JSON file for persistence, None to keep it in memory only
+            refresh (float): Seconds before the location is looked up again
+            lookup (callable): Returns a fresh Location or None
+        """
+        self.path = Path(path) if path else None
+        self.refresh = refresh
+        self.lookup = lookup
+        self.logger = logging.getLogger(__name__)
+
+        self._location = None
+        self._last_attempt = None
+        self._lock = threading.Lock()
+        self.lookups = 0
+
+        self._load()
+
+    def _load(self):
+        """Load the persisted location."""
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._location = Location(**json.load(f))
+        except (OSError, ValueError, TypeError) as e:
+            self.logger.warning(f"Failed to load cached location: {e}")
+
+    def _save(self):
+        """Write the location to disk atomically."""
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._location.to_dict(), f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"Failed to save location: {e}")
+
+    def get(self):
+        """Return the location, looking it up only when missing or expired.
+
+        Returns:
+            Location: Current or last known location, or None if never resolved
+        """
+        with self._lock:
+            location = self._location
+            if location is not None and time.time() - location.fetched_at < self.refresh:
+                return location
+            if location is not None and self._last_attempt is not None \
+                    and time.monotonic() - self._last_attempt < self.RETRY_INTERVAL:
+                return location
+
+            self._last_attempt = time.monotonic()
+            self.lookups += 1
+            try:
+                fresh = self.lookup()
+            except Exception as e:
+                self.logger.error(f"Error getting location: {e}")
+                fresh = None
+
+            if fresh is None:
+                return location
+            self._location = fresh
+            self._save()
+            return fresh
+
+
+_shared_provider = None
+_shared_lock = threading.Lock()
+
+
+def get_location_provider():
+    """Return the process-wide location provider, creating it on first use.
+
+    Returns:
+        LocationProvider: Shared provider instance
+    """
+    global _shared_provider
+    with _shared_lock:
+        if _shared_provider is None:
+            _shared_provider = LocationProvider()
+        return _shared_provider
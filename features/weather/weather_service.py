@@ -1,47 +1,109 @@
+import threading
+
 from features.weather.api_client import APIClient
+from features.weather.config import Config
+from features.weather.exception import APILimitExceededError
 
 
 class WeatherService:
     """Provides high-level weather service methods."""
 
-    def __init__(self):
-        self.client = APIClient()
+    def __init__(self, hourly_hours=Config.HOURLY_HOURS, client=None):
+        """Initialize the service.
+
+        Args:
+            hourly_hours (int): Number of forecast hours kept
+            client (APIClient): API client, e.g. one pointed at a fake server
+        """
+        self.client = client or APIClient()
+        self.hourly_hours = hourly_hours
 
     def get_weather_info(self, longitude, latitude):
-        """Fetches and processes weather data."""
+        """Fetches and processes weather data, returning {"error": ...} on failure."""
         try:
-            data = self.client.get(longitude, latitude)
-
-            # Check if API response is valid
-            if "code" in data and data["code"] != "200":
-                return {"error": f"API returned error code: {data['code']}"}
-
-            now = data.get("now", {})
-
-            return {
-                "location": f"{latitude},{longitude}",
-                "updated_at": data.get("updateTime", "N/A"),
-                "weather_condition": now.get("text", "Unknown"),
-                "temperature": f"{now.get('temp', 'N/A')}°C",
-                "feels_like": f"{now.get('feelsLike', 'N/A')}°C",
-                "humidity": f"{now.get('humidity', 'N/A')}%",
-                "wind_direction": now.get("windDir", "N/A"),
-                "wind_speed": f"{now.get('windSpeed', 'N/A')} m/s",
-                "pressure": f"{now.get('pressure', 'N/A')} hPa",
-                "visibility": f"{now.get('vis', 'N/A')} km",
-                "cloud_coverage": f"{now.get('cloud', 'N/A')}%",
-                "reference": data.get("fxLink", "N/A"),  # Weather forecast link
-                "source": ", ".join(data.get("refer", {}).get("sources", []))
-            }
-
+            return self.fetch_weather_info(longitude, latitude)
         except Exception as e:
             return {"error": str(e)}
 
+    def fetch_weather_info(self, longitude, latitude):
+        """Fetches current conditions, hourly forecast and air quality concurrently.
+
+        Hourly forecast or air quality sections whose endpoint failed are left
+        empty and listed under "errors". Results are not cached here; the
+        background refresher keeps the latest one.
+
+        Raises:
+            APILimitExceededError: If every endpoint failed and one hit the rate limit
+            APIError: If every endpoint failed, or current conditions could not be fetched
+        """
+        results, errors = self.client.get_many(longitude, latitude)
+        if not results:
+            limited = [e for e in errors.values() if isinstance(e, APILimitExceededError)]
+            raise limited[0] if limited else next(iter(errors.values()))
+        if "now" not in results:
+            # A forecast alone would be read out as "Unknown" current conditions
+            raise errors["now"]
+
+        data = results.get("now", {})
+        now = data.get("now", {})
+
+        return {
+            "location": f"{latitude},{longitude}",
+            "updated_at": data.get("updateTime", "N/A"),
+            "weather_condition": now.get("text", "Unknown"),
+            "temperature": f"{now.get('temp', 'N/A')}°C",
+            "feels_like": f"{now.get('feelsLike', 'N/A')}°C",
+            "humidity": f"{now.get('humidity', 'N/A')}%",
+            "wind_direction": now.get("windDir", "N/A"),
+            "wind_speed": f"{now.get('windSpeed', 'N/A')} m/s",
+            "pressure": f"{now.get('pressure', 'N/A')} hPa",
+            "visibility": f"{now.get('vis', 'N/A')} km",
+            "cloud_coverage": f"{now.get('cloud', 'N/A')}%",
+            "reference": data.get("fxLink", "N/A"),  # Weather forecast link
+            "source": ", ".join(data.get("refer", {}).get("sources", [])),
+            "hourly": [
+                {
+                    "time": hour.get("fxTime", "N/A"),
+                    "weather_condition": hour.get("text", "Unknown"),
+                    "temperature": f"{hour.get('temp', 'N/A')}°C",
+                    "precipitation_chance": f"{hour.get('pop', 'N/A')}%",
+                }
+                for hour in results.get("hourly", {}).get("hourly", [])[:self.hourly_hours]
+            ],
+            "air_quality": self._parse_air(results.get("air", {}).get("now")),
+            "errors": {endpoint: str(e) for endpoint, e in errors.items()},
+        }
+
+    @staticmethod
+    def _parse_air(air):
+        if not air:
+            return None
+        return {
+            "aqi": air.get("aqi", "N/A"),
+            "category": air.get("category", "N/A"),
+            "primary_pollutant": air.get("primary", "N/A"),
+            "pm2_5": air.get("pm2p5", "N/A"),
+        }
+
+
+_shared_service = None
+_shared_lock = threading.Lock()
+
+
+def get_weather_service():
+    """Return the process-wide weather service, creating it on first use.
+
+    Returns:
+        WeatherService: Shared service instance
+    """
+    global _shared_service
+    with _shared_lock:
+        if _shared_service is None:
+            _shared_service = WeatherService()
+        return _shared_service
+
 
 # if __name__ == "__main__":
 #
 #     weather = WeatherService()
 #     print(weather.get_weather_info(121.4581, 31.2222))
-
-
-
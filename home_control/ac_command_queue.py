@@ -0,0 +1,108 @@
+import threading
+import time
+from concurrent.futures import Future
+
+
+class ACCommandQueue:
+    """空调指令队列，在防抖窗口内合并连续的指令。
+
+    连续说出的多条指令（如“空调开”“温度26度”“风速高”）会合并为一个目标状态，
+    只发送一帧红外信号。所有指令由同一个后台线程依次执行，因此发送器和空调
+    状态不会被并发访问。
+    """
+
+    def __init__(self, apply, window=0.4, max_delay=1.5):
+        """初始化指令队列并启动后台线程
+
+        Args:
+            apply (callable): apply(command) 执行合并后的指令，返回是否成功
+            window (float): 防抖窗口（秒），窗口内没有新指令才执行
+            max_delay (float): 第一条指令最长等待时间（秒），避免持续输入时一直不执行
+        """
+        self.apply = apply
+        self.window = window
+        self.max_delay = max_delay
+
+        self._pending = {}
+        self._inflight = {}
+        self._futures = []
+        self._first_at = None
+        self._last_at = None
+        self._cond = threading.Condition()
+
+        self.submitted = 0
+        self.frames = 0
+        self.coalesced = 0
+
+        self._worker = threading.Thread(target=self._run, name='ac-commands', daemon=True)
+        self._worker.start()
+
+    def submit(self, command):
+        """提交一条指令
+
+        Args:
+            command (dict): 状态变更，如 {'power': 'on'}
+
+        Returns:
+            Future: 合并后的指令执行完成时得到是否成功
+        """
+        future = Future()
+        with self._cond:
+            now = time.monotonic()
+            self._pending.update(command)
+            self._futures.append(future)
+            if self._first_at is None:
+                self._first_at = now
+            self._last_at = now
+            self.submitted += 1
+            self._cond.notify()
+        return future
+
+    def pending(self):
+        """返回正在执行和尚未执行的合并指令
+
+        Returns:
+            dict: 尚未反映到空调状态中的状态变更
+        """
+        with self._cond:
+            pending = dict(self._inflight)
+            pending.update(self._pending)
+            return pending
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._futures:
+                    self._cond.wait()
+                # 等到防抖窗口内没有新指令，或达到最长等待时间
+                while True:
+                    now = time.monotonic()
+                    deadline = min(self._last_at + self.window, self._first_at + self.max_delay)
+                    if now >= deadline:
+                        break
+                    self._cond.wait(deadline - now)
+
+                command, futures = self._pending, self._futures
+                self._inflight = command
+                self._pending, self._futures = {}, []
+                self._first_at = self._last_at = None
+
+            try:
+                result = self.apply(command)
+            except Exception as e:
+                print(f'执行空调指令失败: {e}')
+                result = False
+
+            with self._cond:
+                self._inflight = {}
+                self.frames += 1
+                self.coalesced += len(futures) - 1
+            if len(futures) > 1:
+                print(f'合并了 {len(futures)} 条空调指令: {command}')
+            for future in futures:
+                future.set_result(result)
+
+    def stats(self):
+        """返回提交的指令数、发送的帧数和被合并的指令数"""
+        with self._cond:
+            return {'submitted': self.submitted, 'frames': self.frames, 'coalesced': self.coalesced}
@@ -1,9 +1,11 @@
 import os
 from pathlib import Path
-import RPi.GPIO as GPIO
 import requests
-import time
-from voice_feat.voice_feat_system import VoiceAssistant
+from features.resilience import get_policy
+from home_control.ac_command_queue import ACCommandQueue
+from home_control.ir_code_store import IRCodeStore, normalize_state
+from home_control.ir_transmitter import IRTransmitter
+from home_control.tuya_token import TuyaTokenManager
 
 class ACController:
     """空调控制器类，支持语音控制空调。
@@ -12,25 +14,33 @@ class ACController:
     2. 通过MQTT协议控制WiFi空调（暂未实现）
     """
 
-    def __init__(self, tuya_api_key=None, tuya_api_secret=None, ir_gpio_pin=18):
+    # 涂鸦接口表示令牌无效或过期的错误码
+    TUYA_AUTH_ERROR_CODES = (1010, 1011)
+
+    def __init__(self, tuya_api_key=None, tuya_api_secret=None, ir_gpio_pin=18,
+                 ir_code_path='cache/ir_codes.json', ir_backend=None):
         """初始化空调控制器
 
         Args:
             tuya_api_key (str): 涂鸦API密钥
             tuya_api_secret (str): 涂鸦API密钥
             ir_gpio_pin (int): 红外发射模块连接的GPIO引脚号
+            ir_code_path (str): 红外编码缓存文件路径
+            ir_backend: 红外发送后端，默认优先使用pigpio；模拟后端需显式传入或设置IR_SIMULATE=1
         """
-        # 初始化语音助手
-        self.voice_assistant = VoiceAssistant()
-        
         # 涂鸦API配置
         self.tuya_api_id =  os.getenv('TUYA_API_ID')
         self.tuya_api_secret =  os.getenv('TUYA_API_SECRET')
         self.tuya_api_endpoint = 'https://openapi.tuyacn.com/v1.0/infrareds'
+        self.token_manager = TuyaTokenManager(self.tuya_api_endpoint, self.tuya_api_id, self.tuya_api_secret)
+        self.token_manager.prefetch()
+
+        # 按空调状态缓存的红外编码，命中时无需联网
+        self.ir_codes = IRCodeStore(ir_code_path)
         
-        # GPIO配置
+        # GPIO配置：引脚只初始化一次，红外帧编译后整段交给发送后端
         self.ir_gpio_pin = ir_gpio_pin
-        self._setup_gpio()
+        self.transmitter = IRTransmitter(ir_gpio_pin, ir_backend)
         
         # 空调状态
         self.ac_status = {
@@ -40,54 +50,115 @@ class ACController:
             'fan_speed': 'auto'  # auto, low, medium, high
         }
 
-    def _setup_gpio(self):
-        """设置GPIO引脚"""
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setup(self.ir_gpio_pin, GPIO.OUT)
+        # 连续的指令在防抖窗口内合并，由队列线程依次执行
+        self.command_queue = ACCommandQueue(self._apply_command)
 
     def _get_tuya_token(self):
-        """获取涂鸦API访问令牌"""
-        try:
-            response = requests.get(
-                f'{self.tuya_api_endpoint}/token',
-                headers={
-                    'client_id': self.tuya_api_id,
-                    'secret': self.tuya_api_secret
-                }
-            )
-            return response.json()['result']['access_token']
-        except Exception as e:
-            print(f'获取涂鸦token失败: {e}')
-            return None
+        """获取涂鸦API访问令牌（缓存于令牌管理器中）"""
+        return self.token_manager.get_token()
 
-    def _send_ir_command(self, command):
-        """发送红外命令
-
-        Args:
-            command (dict): 包含命令类型和参数的字典
-        """
+    def _is_auth_failure(self, response):
+        """判断涂鸦接口响应是否为认证失败"""
+        if response.status_code == 401:
+            return True
         try:
-            token = self._get_tuya_token()
-            if not token:
-                return False
+            return response.json().get('code') in self.TUYA_AUTH_ERROR_CODES
+        except ValueError:
+            return False
 
-            # 调用涂鸦API获取红外编码
-            response = requests.post(
+    def _request_ir_code(self, token, command):
+        """调用涂鸦API获取红外编码"""
+        return get_policy('tuya').call(
+            lambda: requests.post(
                 f'{self.tuya_api_endpoint}/codes',
                 headers={'Authorization': f'Bearer {token}'},
                 json={
                     'device_type': 'air_conditioner',
                     'brand': 'universal',
                     'command': command
-                }
-            )
+                },
+                timeout=5
+            ),
+            idempotent=True,
+            failed=lambda r: r.status_code >= 500
+        )
+
+    def _fetch_ir_code(self, state):
+        """从涂鸦API获取完整空调状态对应的红外编码
+
+        Args:
+            state (dict): 规范化的空调状态
+
+        Returns:
+            str: 红外编码，失败时返回None
+        """
+        try:
+            token = self._get_tuya_token()
+            if not token:
+                return None
+
+            response = self._request_ir_code(token, state)
+
+            # 令牌被服务端提前吊销时，刷新令牌后重试一次
+            if self._is_auth_failure(response):
+                self.token_manager.invalidate(token)
+                token = self._get_tuya_token()
+                if not token:
+                    return None
+                response = self._request_ir_code(token, state)
 
             if response.status_code == 200:
-                ir_code = response.json()['result']['code']
-                # 通过GPIO发送红外编码
-                self._transmit_ir_code(ir_code)
-                return True
-            return False
+                return response.json()['result']['code']
+            return None
+        except Exception as e:
+            print(f'获取红外编码失败: {e}')
+            return None
+
+    def _get_ir_code(self, state):
+        """获取红外编码，优先使用本地缓存
+
+        Args:
+            state (dict): 规范化的空调状态
+
+        Returns:
+            str: 红外编码，失败时返回None
+        """
+        ir_code = self.ir_codes.get(state)
+        if ir_code is None:
+            ir_code = self._fetch_ir_code(state)
+            if ir_code is not None:
+                self.ir_codes.put(state, ir_code)
+        return ir_code
+
+    def prefetch_ir_codes(self, states=None):
+        """批量预取红外编码，之后的指令可离线发送
+
+        Args:
+            states (iterable): 需要预取的状态，默认为全部组合
+
+        Returns:
+            int: 新获取的编码数量
+        """
+        return self.ir_codes.prefetch(self._fetch_ir_code, states)
+
+    def _target_state(self, command):
+        """将指令合并到当前状态，得到规范化的目标状态"""
+        state = dict(self.ac_status)
+        state.update(command)
+        return normalize_state(state)
+
+    def _send_ir_command(self, state):
+        """发送红外命令
+
+        Args:
+            state (dict): 规范化的目标空调状态
+        """
+        try:
+            ir_code = self._get_ir_code(state)
+            if ir_code is None:
+                return False
+            # 通过GPIO发送红外编码
+            return self._transmit_ir_code(ir_code)
         except Exception as e:
             print(f'发送红外命令失败: {e}')
             return False
@@ -98,61 +169,7 @@ class ACController:
         Args:
             ir_code (str): 红外编码
         """
-        pwm = None
-        try:
-            # 将16进制字符串转换为整数
-            ir_int = int(ir_code, 16)
-            # 将整数转换为二进制字符串，并去除'0b'前缀
-            ir_binary = bin(ir_int)[2:]
-            # 确保二进制序列长度为8的倍数，不足则在前面补0
-            ir_binary = ir_binary.zfill((len(ir_binary) + 7) // 8 * 8)
-            
-            # 设置GPIO为输出模式
-            GPIO.setup(self.ir_gpio_pin, GPIO.OUT)
-            
-            # 设置PWM频率为38KHz，这是大多数红外设备的标准载波频率
-            pwm = GPIO.PWM(self.ir_gpio_pin, 38000)
-            # 设置占空比为50%以获得最佳信号质量
-            pwm.start(50)
-            
-            # 发送引导码（9ms载波 + 4.5ms空闲）
-            pwm.ChangeDutyCycle(50)
-            time.sleep(0.009)  # 9ms载波
-            pwm.ChangeDutyCycle(0)
-            time.sleep(0.0045)  # 4.5ms空闲
-            
-            # 根据二进制序列发送信号
-            for bit in ir_binary:
-                if bit == '1':
-                    # 发送载波信号（600微秒载波 + 600微秒空闲）
-                    pwm.ChangeDutyCycle(50)
-                    time.sleep(0.0006)  # 600微秒载波
-                    pwm.ChangeDutyCycle(0)
-                    time.sleep(0.0006)  # 600微秒空闲
-                else:
-                    # 发送空闲信号（600微秒载波 + 1800微秒空闲）
-                    pwm.ChangeDutyCycle(50)
-                    time.sleep(0.0006)  # 600微秒载波
-                    pwm.ChangeDutyCycle(0)
-                    time.sleep(0.0018)  # 1800微秒空闲
-            
-            # 发送结束码（600微秒载波）
-            pwm.ChangeDutyCycle(50)
-            time.sleep(0.0006)
-            pwm.ChangeDutyCycle(0)
-            
-            return True
-        except Exception as e:
-            print(f'发送红外信号失败: {e}')
-            return False
-        finally:
-            # 确保PWM输出被正确停止并清理GPIO资源
-            if pwm:
-                try:
-                    pwm.stop()
-                    GPIO.cleanup(self.ir_gpio_pin)
-                except:
-                    pass
+        return self.transmitter.send(ir_code)
 
     def _parse_voice_command(self, text):
         """解析语音命令
@@ -164,9 +181,11 @@ class ACController:
             dict: 解析后的命令
         """
         command = {}
+        # 相对调温以尚未执行的指令为基准，连续两次“调高”会累加
+        current_temperature = self._expected_status()['temperature']
 
-        # 解析开关命令
-        if '空调' in text:
+        # 解析开关命令；紧接着的“温度26度”“风速高”等后续指令不必再说“空调”
+        if '空调' in text or '温度' in text or '风速' in text:
             if '开' in text:
                 command['power'] = 'on'
             elif '关' in text:
@@ -181,9 +200,9 @@ class ACController:
                     if 16 <= temp <= 30:
                         command['temperature'] = temp
                     elif '高' in text:
-                        command['temperature'] = min(30, self.ac_status['temperature'] + temp)
+                        command['temperature'] = min(30, current_temperature + temp)
                     elif '低' in text:
-                        command['temperature'] = max(16, self.ac_status['temperature'] - temp)
+                        command['temperature'] = max(16, current_temperature - temp)
             # 解析模式命令
             if '制冷' in text:
                 command['mode'] = 'cool'
@@ -209,26 +228,77 @@ class ACController:
 
         return command
 
-    def control_by_voice(self, text):
-        """通过语音控制空调"""
+    def _expected_status(self):
+        """返回当前状态叠加尚未执行的指令后的预期状态"""
+        status = dict(self.ac_status)
+        status.update(self.command_queue.pending())
+        return status
 
-        # 解析语音命令
-        command = self._parse_voice_command(text)
-        if not command:
-            print('无法解析语音指令')
+    def _apply_command(self, command):
+        """执行合并后的指令（仅在指令队列线程中调用）
+
+        Args:
+            command (dict): 合并后的状态变更
+
+        Returns:
+            bool: 是否执行成功
+        """
+        # 红外编码对应完整状态，因此发送合并后的目标状态
+        try:
+            state = self._target_state(command)
+        except ValueError as e:
+            print(e)
             return False
 
         # 发送红外命令
-        success = self._send_ir_command(command)
+        success = self._send_ir_command(state)
         if success:
             # 更新空调状态
-            self.ac_status.update(command)
+            self.ac_status.update(state)
             print(f'执行命令成功: {command}')
         else:
             print('执行命令失败')
 
         return success
 
+    def submit_command(self, command):
+        """提交状态变更，不等待执行
+
+        Args:
+            command (dict): 状态变更，如 {'power': 'on', 'temperature': 26}；
+                temperature_delta 表示相对当前预期温度的调整
+
+        Returns:
+            Future: 执行完成后得到是否成功
+        """
+        command = dict(command)
+        delta = command.pop('temperature_delta', None)
+        if delta is not None and 'temperature' not in command:
+            command['temperature'] = min(30, max(16, self._expected_status()['temperature'] + delta))
+        return self.command_queue.submit(command)
+
+    def submit_voice_command(self, text):
+        """解析语音指令并提交，不等待执行
+
+        Args:
+            text (str): 语音识别结果
+
+        Returns:
+            Future: 执行完成后得到是否成功，无法解析时返回None
+        """
+        command = self._parse_voice_command(text)
+        if not command:
+            print('无法解析语音指令')
+            return None
+        return self.submit_command(command)
+
+    def control_by_voice(self, text):
+        """通过语音控制空调，等待指令执行完成"""
+        future = self.submit_voice_command(text)
+        if future is None:
+            return False
+        return future.result()
+
 if __name__ == '__main__':
     ac = ACController()
     text = '空调开，温度25度，风速自动'
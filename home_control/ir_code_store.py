@@ -0,0 +1,162 @@
+import itertools
+import json
+import os
+import threading
+from pathlib import Path
+
+# 空调状态的取值范围：2种开关 × 15个温度 × 5种模式 × 4档风速
+POWER_STATES = ('on', 'off')
+TEMPERATURES = tuple(range(16, 31))
+MODES = ('cool', 'heat', 'auto', 'dry', 'fan')
+FAN_SPEEDS = ('auto', 'low', 'medium', 'high')
+
+
+def normalize_state(state):
+    """将空调状态规范化为红外编码缓存的键值
+
+    Args:
+        state (dict): 包含 power、temperature、mode、fan_speed 的状态
+
+    Returns:
+        dict: 规范化后的完整状态
+    """
+    power = state.get('power', 'off')
+    if isinstance(power, bool):
+        power = 'on' if power else 'off'
+    temperature = min(max(int(state.get('temperature', 25)), TEMPERATURES[0]), TEMPERATURES[-1])
+    mode = state.get('mode', 'cool')
+    fan_speed = state.get('fan_speed', 'auto')
+    if power not in POWER_STATES or mode not in MODES or fan_speed not in FAN_SPEEDS:
+        raise ValueError(f'无效的空调状态: {state}')
+    return {'power': power, 'temperature': temperature, 'mode': mode, 'fan_speed': fan_speed}
+
+
+def state_key(state):
+    """返回规范化状态对应的缓存键"""
+    state = normalize_state(state)
+    return f"{state['power']}|{state['temperature']}|{state['mode']}|{state['fan_speed']}"
+
+
+def all_states():
+    """枚举所有空调状态组合
+
+    Yields:
+        dict: 规范化的空调状态
+    """
+    for power, temperature, mode, fan_speed in itertools.product(POWER_STATES, TEMPERATURES, MODES, FAN_SPEEDS):
+        yield {'power': power, 'temperature': temperature, 'mode': mode, 'fan_speed': fan_speed}
+
+
+class IRCodeStore:
+    """按空调状态缓存红外编码，并持久化到磁盘。
+
+    编码按需写入，也可以一次性预取所有组合，之后发送指令无需联网。
+    """
+
+    def __init__(self, path='cache/ir_codes.json'):
+        """初始化编码缓存并加载磁盘上的编码
+
+        Args:
+            path (str): JSON缓存文件路径，None表示仅保存在内存中
+        """
+        self.path = Path(path) if path else None
+        self._codes = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+        self._load()
+
+    def _load(self):
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._codes = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f'加载红外编码缓存失败: {e}')
+
+    def _save(self):
+        """原子地写入磁盘"""
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._codes, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f'保存红外编码缓存失败: {e}')
+
+    def __len__(self):
+        with self._lock:
+            return len(self._codes)
+
+    def __contains__(self, state):
+        with self._lock:
+            return state_key(state) in self._codes
+
+    def get(self, state):
+        """查找状态对应的红外编码
+
+        Args:
+            state (dict): 空调状态
+
+        Returns:
+            str: 红外编码，未缓存时返回None
+        """
+        key = state_key(state)
+        with self._lock:
+            code = self._codes.get(key)
+            if code is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return code
+
+    def put(self, state, code, save=True):
+        """保存状态对应的红外编码
+
+        Args:
+            state (dict): 空调状态
+            code (str): 红外编码
+            save (bool): 是否立即写入磁盘
+        """
+        with self._lock:
+            self._codes[state_key(state)] = code
+            if save:
+                self._save()
+
+    def prefetch(self, fetch, states=None):
+        """批量获取尚未缓存的编码
+
+        Args:
+            fetch (callable): fetch(state) 返回红外编码或None
+            states (iterable): 需要预取的状态，默认为全部组合
+
+        Returns:
+            int: 新获取的编码数量
+        """
+        fetched = 0
+        for state in states if states is not None else all_states():
+            if state in self:
+                continue
+            code = fetch(normalize_state(state))
+            if code is None:
+                continue
+            self.put(state, code, save=False)
+            fetched += 1
+            # 每获取一批保存一次，中断后可以继续
+            if fetched % 20 == 0:
+                with self._lock:
+                    self._save()
+        with self._lock:
+            self._save()
+        return fetched
+
+    def stats(self):
+        """返回命中次数和缓存数量"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._codes)}
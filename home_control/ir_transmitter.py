@@ -0,0 +1,333 @@
+import os
+import statistics
+import threading
+import time
+from functools import lru_cache
+
+# 红外帧时序（微秒）：引导码、位载波与间隔、结束码
+CARRIER_FREQUENCY = 38000
+HEADER_MARK = 9000
+HEADER_SPACE = 4500
+BIT_MARK = 600
+ONE_SPACE = 600
+ZERO_SPACE = 1800
+
+
+@lru_cache(maxsize=1024)
+def compile_ir_code(ir_code):
+    """将16进制红外编码编译为载波/间隔交替的时序数组
+
+    数组从载波开始，偶数下标为载波时长，奇数下标为间隔时长，结果会被缓存，
+    同一编码只编译一次。
+
+    Args:
+        ir_code (str): 16进制红外编码
+
+    Returns:
+        tuple: 以微秒为单位的时序
+    """
+    # 将16进制字符串转换为二进制，长度补齐为8的倍数
+    ir_binary = bin(int(ir_code, 16))[2:]
+    ir_binary = ir_binary.zfill((len(ir_binary) + 7) // 8 * 8)
+
+    timings = [HEADER_MARK, HEADER_SPACE]
+    for bit in ir_binary:
+        timings.append(BIT_MARK)
+        timings.append(ONE_SPACE if bit == '1' else ZERO_SPACE)
+    # 结束码只有载波
+    timings.append(BIT_MARK)
+    return tuple(timings)
+
+
+def encode_chain(waves, min_repeats=4, max_repeats=0xFFFF):
+    """将波形编号序列编码为pigpio波形链，连续重复的载波/间隔对用循环命令表示
+
+    循环命令为 255 0（循环开始）和 255 1 x y（重复 x + 256*y 次）。
+
+    Args:
+        waves (list): 载波/间隔交替的波形编号
+        min_repeats (int): 改用循环命令的最少重复次数
+        max_repeats (int): 单个循环的最多重复次数
+
+    Returns:
+        list: 波形链字节
+    """
+    chain = []
+    i = 0
+    while i < len(waves):
+        pair = waves[i:i + 2]
+        repeats = 1
+        while (len(pair) == 2 and repeats < max_repeats
+               and waves[i + 2 * repeats:i + 2 * repeats + 2] == pair):
+            repeats += 1
+        if repeats >= min_repeats:
+            chain += [255, 0, *pair, 255, 1, repeats & 0xFF, repeats >> 8]
+        else:
+            chain += pair * repeats
+        i += len(pair) * repeats
+    return chain
+
+
+class PigpioBackend:
+    """通过pigpio波形链发送，由DMA定时，不受Python调度抖动影响。
+
+    每种载波时长和间隔时长各生成一个波形并复用，一帧红外信号只是
+    这些波形编号组成的链，按编码缓存。连续重复的位用链内循环命令表示，
+    使较长的编码也不超出链的长度限制。
+    """
+
+    # pigpio wave_chain 的链最多600个字节（波形编号和循环命令都计入）
+    MAX_CHAIN_BYTES = 600
+    # 同一位连续重复至少这么多次才改用循环命令（循环本身占6个字节）
+    MIN_LOOP_REPEATS = 4
+    MAX_LOOP_REPEATS = 0xFFFF
+
+    def __init__(self, pin, carrier=CARRIER_FREQUENCY, host=None):
+        """连接pigpio守护进程
+
+        Args:
+            pin (int): GPIO引脚号（BCM编号）
+            carrier (int): 载波频率（Hz）
+            host (str): pigpiod地址，默认本机
+
+        Raises:
+            RuntimeError: 无法连接pigpiod时
+        """
+        import pigpio
+
+        self.pigpio = pigpio
+        self.pi = pigpio.pi(host) if host else pigpio.pi()
+        if not self.pi.connected:
+            raise RuntimeError('无法连接pigpio守护进程')
+        self.pin = pin
+        self.carrier = carrier
+        self.pi.set_mode(pin, pigpio.OUTPUT)
+        self.pi.wave_clear()
+
+        self._marks = {}  # 载波时长 -> 波形编号
+        self._spaces = {}  # 间隔时长 -> 波形编号
+        self._chains = {}  # 时序 -> 波形链
+
+    def _mark_wave(self, duration):
+        wave_id = self._marks.get(duration)
+        if wave_id is None:
+            period = 1_000_000 / self.carrier
+            cycles = max(1, round(duration / period))
+            on = int(period / 2)
+            off = int(period) - on
+            pulses = []
+            for _ in range(cycles):
+                pulses.append(self.pigpio.pulse(1 << self.pin, 0, on))
+                pulses.append(self.pigpio.pulse(0, 1 << self.pin, off))
+            self.pi.wave_add_generic(pulses)
+            wave_id = self._marks[duration] = self.pi.wave_create()
+        return wave_id
+
+    def _space_wave(self, duration):
+        wave_id = self._spaces.get(duration)
+        if wave_id is None:
+            self.pi.wave_add_generic([self.pigpio.pulse(0, 0, duration)])
+            wave_id = self._spaces[duration] = self.pi.wave_create()
+        return wave_id
+
+    def _chain(self, timings):
+        chain = self._chains.get(timings)
+        if chain is None:
+            waves = [
+                self._mark_wave(duration) if i % 2 == 0 else self._space_wave(duration)
+                for i, duration in enumerate(timings)
+            ]
+            chain = encode_chain(waves, self.MIN_LOOP_REPEATS, self.MAX_LOOP_REPEATS)
+            if len(chain) > self.MAX_CHAIN_BYTES:
+                raise ValueError(f'红外帧过长: 波形链 {len(chain)} 字节')
+            self._chains[timings] = chain
+        return chain
+
+    def transmit(self, timings):
+        """发送一帧并等待发送完成
+
+        Args:
+            timings (tuple): compile_ir_code 生成的时序
+        """
+        self.pi.wave_chain(self._chain(timings))
+        while self.pi.wave_tx_busy():
+            time.sleep(0.002)
+
+    def close(self):
+        self.pi.wave_clear()
+        self.pi.stop()
+
+
+class RPiGPIOBackend:
+    """在没有pigpiod时使用RPi.GPIO的PWM发送，时序受调度抖动影响。"""
+
+    def __init__(self, pin, carrier=CARRIER_FREQUENCY):
+        """初始化GPIO（只执行一次）
+
+        Args:
+            pin (int): GPIO引脚号（BCM编号）
+            carrier (int): 载波频率（Hz）
+        """
+        import RPi.GPIO as GPIO
+
+        self.GPIO = GPIO
+        self.pin = pin
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setup(pin, GPIO.OUT)
+        self.pwm = GPIO.PWM(pin, carrier)
+        self.pwm.start(0)
+
+    def transmit(self, timings):
+        for i, duration in enumerate(timings):
+            # 偶数段为载波（50%占空比），奇数段为间隔
+            self.pwm.ChangeDutyCycle(50 if i % 2 == 0 else 0)
+            time.sleep(duration / 1_000_000)
+        self.pwm.ChangeDutyCycle(0)
+
+    def close(self):
+        self.pwm.stop()
+        self.GPIO.cleanup(self.pin)
+
+
+class SimulatedBackend:
+    """模拟GPIO后端，按时序等待并记录实际发出的每段时长。
+
+    可在任意Linux机器上测量发送抖动和吞吐量。
+    """
+
+    def __init__(self, realtime=True, max_frames=100):
+        """初始化模拟后端
+
+        Args:
+            realtime (bool): 是否按时序实际等待；False时只记录时序
+            max_frames (int): 保留的最近帧数
+        """
+        self.realtime = realtime
+        self.max_frames = max_frames
+        self.frames = []  # [(期望时序, 实际时序)]
+        self.sent = 0
+        self.busy_time = 0.0
+
+    def transmit(self, timings):
+        start = time.perf_counter()
+        actual = []
+        if self.realtime:
+            edge = start
+            target = start
+            for duration in timings:
+                target += duration / 1_000_000
+                # 以绝对时间为目标休眠，误差不会逐段累积
+                remaining = target - time.perf_counter()
+                if remaining > 0:
+                    time.sleep(remaining)
+                now = time.perf_counter()
+                actual.append(round((now - edge) * 1_000_000))
+                edge = now
+        else:
+            actual = list(timings)
+
+        self.busy_time += time.perf_counter() - start
+        self.sent += 1
+        self.frames.append((tuple(timings), tuple(actual)))
+        del self.frames[:-self.max_frames]
+
+    def stats(self):
+        """返回抖动和吞吐量统计
+
+        Returns:
+            dict: 帧数、平均/最大抖动（微秒）和每秒帧数
+        """
+        errors = [abs(a - e) for expected, actual in self.frames for e, a in zip(expected, actual)]
+        return {
+            'frames': self.sent,
+            'mean_jitter_us': statistics.mean(errors) if errors else 0.0,
+            'max_jitter_us': max(errors) if errors else 0,
+            'frames_per_second': self.sent / self.busy_time if self.busy_time else 0.0,
+        }
+
+    def close(self):
+        pass
+
+
+def simulation_enabled():
+    """是否通过环境变量IR_SIMULATE启用模拟红外发送"""
+    return os.getenv('IR_SIMULATE', '').lower() in ('1', 'true', 'yes')
+
+
+def create_backend(pin, simulate=None):
+    """选择可用的发送后端：pigpio优先，其次RPi.GPIO
+
+    模拟后端只在显式启用时使用，避免没有红外硬件时误报发送成功。
+
+    Args:
+        pin (int): GPIO引脚号（BCM编号）
+        simulate (bool): 是否使用模拟后端，默认读取环境变量IR_SIMULATE
+
+    Returns:
+        发送后端实例，没有可用后端时返回None
+    """
+    if simulate is None:
+        simulate = simulation_enabled()
+    if simulate:
+        return SimulatedBackend()
+    try:
+        return PigpioBackend(pin)
+    except Exception as e:
+        print(f'pigpio不可用，改用RPi.GPIO: {e}')
+    try:
+        return RPiGPIOBackend(pin)
+    except Exception as e:
+        print(f'RPi.GPIO不可用，无法发送红外信号（设置IR_SIMULATE=1可使用模拟发送）: {e}')
+    return None
+
+
+class IRTransmitter:
+    """编译并发送红外编码，保证同一时间只有一帧在发送。"""
+
+    def __init__(self, pin=18, backend=None):
+        """初始化发送器
+
+        Args:
+            pin (int): GPIO引脚号（BCM编号）
+            backend: 发送后端，默认自动选择
+        """
+        self.backend = backend or create_backend(pin)
+        self.available = self.backend is not None
+        self._lock = threading.Lock()
+        self.sent = 0
+
+    def send(self, ir_code):
+        """发送一个红外编码
+
+        Args:
+            ir_code (str): 16进制红外编码
+
+        Returns:
+            bool: 是否发送成功
+        """
+        if not self.available:
+            print('没有可用的红外发送后端')
+            return False
+        try:
+            timings = compile_ir_code(ir_code)
+            with self._lock:
+                self.backend.transmit(timings)
+                self.sent += 1
+            return True
+        except Exception as e:
+            print(f'发送红外信号失败: {e}')
+            return False
+
+    def close(self):
+        with self._lock:
+            if self.available:
+                self.backend.close()
+
+
+if __name__ == '__main__':
+    # 在模拟后端上测量发送抖动和吞吐量
+    backend = SimulatedBackend()
+    transmitter = IRTransmitter(backend=backend)
+    for _ in range(20):
+        transmitter.send('B24D7B84E01F')
+    print(backend.stats())
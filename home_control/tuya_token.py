@@ -0,0 +1,146 @@
+import threading
+import time
+
+import requests
+
+from features.resilience import get_policy
+
+
+class TuyaTokenManager:
+    """涂鸦访问令牌管理器。
+
+    缓存访问令牌及其过期时间，在令牌失效前由后台定时器提前刷新，
+    令牌有效期内的指令不再额外请求令牌接口。
+    """
+
+    # 提前刷新的秒数，避免令牌在请求途中过期
+    REFRESH_MARGIN = 120
+    # 刷新失败后的首次重试间隔（秒），连续失败时翻倍，直至上限
+    RETRY_INTERVAL = 30
+    MAX_RETRY_INTERVAL = 1800
+
+    def __init__(self, endpoint, client_id, secret, timeout=5):
+        """初始化令牌管理器
+
+        Args:
+            endpoint (str): 涂鸦API地址
+            client_id (str): 涂鸦API ID
+            secret (str): 涂鸦API密钥
+            timeout (float): 请求超时时间（秒）
+        """
+        self.endpoint = endpoint
+        self.client_id = client_id
+        self.secret = secret
+        self.timeout = timeout
+
+        self._token = None
+        self._expires_at = 0.0
+        self._refresh_at = 0.0
+        self._lock = threading.Lock()
+        self._timer = None
+        self._failures = 0  # 连续刷新失败次数
+
+        self.fetches = 0
+        self.hits = 0
+
+    def _fetch(self):
+        """请求新的访问令牌
+
+        Returns:
+            tuple: (令牌, 有效期秒数)
+        """
+        response = get_policy('tuya').call(
+            lambda: requests.get(
+                f'{self.endpoint}/token',
+                headers={
+                    'client_id': self.client_id,
+                    'secret': self.secret
+                },
+                timeout=self.timeout
+            ),
+            idempotent=True
+        )
+        result = response.json()['result']
+        return result['access_token'], float(result.get('expire_time', 7200))
+
+    @property
+    def has_credentials(self):
+        """bool: 是否配置了涂鸦API凭据"""
+        return bool(self.client_id and self.secret)
+
+    def _schedule_refresh(self, delay):
+        """安排后台刷新"""
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(max(0.0, delay), self._background_refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _refresh_locked(self):
+        """在持有锁时刷新令牌
+
+        Returns:
+            str: 新令牌，失败时返回None
+        """
+        self.fetches += 1
+        try:
+            token, expire_time = self._fetch()
+        except Exception as e:
+            self._failures += 1
+            delay = min(self.MAX_RETRY_INTERVAL, self.RETRY_INTERVAL * 2 ** (self._failures - 1))
+            print(f'获取涂鸦token失败，{delay:.0f}秒后重试: {e}')
+            self._schedule_refresh(delay)
+            # 刷新失败时，未过期的旧令牌仍可使用
+            return self._token if time.monotonic() < self._expires_at else None
+
+        self._failures = 0
+        margin = min(self.REFRESH_MARGIN, expire_time / 2)
+        self._token = token
+        self._expires_at = time.monotonic() + expire_time
+        self._refresh_at = self._expires_at - margin
+        self._schedule_refresh(expire_time - margin)
+        return token
+
+    def _background_refresh(self):
+        with self._lock:
+            self._refresh_locked()
+
+    def get_token(self):
+        """获取有效的访问令牌，仅在没有缓存或即将过期时请求
+
+        Returns:
+            str: 访问令牌，获取失败或未配置凭据时返回None
+        """
+        if not self.has_credentials:
+            return None
+        with self._lock:
+            if self._token and time.monotonic() < self._refresh_at:
+                self.hits += 1
+                return self._token
+            return self._refresh_locked()
+
+    def prefetch(self):
+        """在后台获取首个令牌，使第一条指令也无需等待令牌接口"""
+        if not self.has_credentials:
+            print('未配置涂鸦API凭据，跳过令牌预取')
+            return
+        threading.Thread(target=self.get_token, daemon=True).start()
+
+    def invalidate(self, token=None):
+        """丢弃缓存的令牌，例如接口返回认证失败时
+
+        Args:
+            token (str): 失效的令牌；若缓存已被其他线程更新则不丢弃
+        """
+        with self._lock:
+            if token is None or token == self._token:
+                self._token = None
+                self._expires_at = 0.0
+                self._refresh_at = 0.0
+
+    def stop(self):
+        """停止后台刷新"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
@@ -1,12 +1,17 @@
-import os
 import sys
-from flask import Flask, render_template
-import geocoder
-from features.face_recognition.face_recognition_system import FaceRecognition
-from features.common.utils import read_text_baidu, user_speech_recognition, record_audio_until_silence, audio_to_text, \
-    text_to_speech_chinese, load_known_faces_from_folder
-from features.voice_feat_system import VoiceAssistant
-from features.weather import WeatherService
+from flask import Flask, jsonify, render_template
+from features.common.utils import read_text_baidu, read_texts_baidu, user_speech_recognition, audio_to_text, \
+    text_to_speech_chinese, load_known_faces_from_folder, prewarm_tts_cache, init_audio_capture, wait_with_barge_in
+from features.intent import create_intent_engine
+from features.speech import SpeechPriority, get_offline_recognizer, get_speech_output, get_tts_cache
+from features.common.async_runtime import Turn, cancellable, get_async_runtime
+from features.common.refresher import get_refresher
+from features.common.services import get_ac_controller, get_assistant, get_services, process_rss_mb
+from features.common.startup import StartupOrchestrator
+from features.common.state_machine import StateMachine
+from features.resilience import resilience_stats
+from features.weather import APILimitExceededError, Config as WeatherConfig, get_location_provider, get_weather_service
+import asyncio
 import time
 import threading
 
@@ -18,13 +23,11 @@ app.config['TEMPLATES_AUTO_RELOAD'] = True
 app = Flask(__name__)
 
 # Global flags and variables
-running = True
-face_detected = False
 wake_words = ["小", "小朋友", "朋友"]  # Example wake words in Chinese (adjust as needed)
 WAKE_WORD_THRESHOLD = 0.7  # Adjust based on your speech recognition sensitivity
-assistant = None  # Initialize VoiceAssistant globally
-face_detection_running = False
-face_detection_success = False
+WEB_PORT = 8080  # Port of the web UI shown by the GUI
+CONVERSATION_TIMEOUT = 60  # Seconds without speech before a session ends
+TURN_TIMEOUT = 45  # Seconds allowed for one reply, including speaking it
 
 
 @app.route('/')
@@ -33,18 +36,34 @@ def index():
     return render_template('index.html')
 
 
+@app.route('/api/dashboard')
+def dashboard():
+    """Latest background-refreshed data for the web UI; never waits on the network"""
+    return jsonify(get_refresher().snapshot())
+
+
+@app.route('/api/resilience')
+def resilience():
+    """Circuit breaker state and rejected-call counters per provider"""
+    return jsonify(resilience_stats())
+
+
+@app.route('/api/state')
+def state():
+    """Current interaction state and transition timings"""
+    return jsonify(mirror.stats())
+
+
 @app.route('/test')
 def test():
     """Test endpoint to verify Flask is running"""
     return "Flask server is working!"
 
 
-# Global variable to store preloaded face data
-preloaded_face_data = None
-
-
 def preload_face_data():
     """Preload face data into memory."""
+    from features.face_recognition.face_recognition_system import FaceRecognition
+
     face_system = FaceRecognition()
     image_paths_by_person = load_known_faces_from_folder("known_faces")
     for person_name, image_paths in image_paths_by_person.items():
@@ -52,154 +71,249 @@ def preload_face_data():
     return face_system
 
 
-def detect_face(timeout=60) -> bool:
-    """Detect a face using preloaded face data."""
-    global preloaded_face_data
-    if preloaded_face_data is None:
-        print("Error: Face data not preloaded.")
-        return False
+def create_presence_detector():
+    """Camera presence detector that recognizes faces speculatively while idle."""
+    from features.face_recognition.presence import PresenceDetector
+
+    return PresenceDetector(lambda: get_services().get('face_recognizer'))
+
+
+def detect_face(timeout=60):
+    """Detect a known face using preloaded face data.
+
+    Returns:
+        str: Name of the recognized person, None if nobody was recognized in time
+    """
+    presence = get_services().get('presence')
+    presence.start()
+    if presence.available:
+        # Usually answered at once from a recognition made while the user approached
+        name = presence.recognize(timeout)
+        if name is not None:
+            print("Face detected")
+            get_services().get('face_recognizer').announce(name)
+            return name
+        if presence.available:
+            return None
 
+    # The detector could not open the camera; stop it retrying and open the camera directly
+    presence.pause()
+    face_system = get_services().get('face_recognizer')
     start_time = time.time()
 
-    while time.time() - start_time < timeout and running:
+    while time.time() - start_time < timeout and not mirror.stopped.is_set():
         try:
-            recognized = preloaded_face_data.start_recognition()
-            if recognized:
+            if face_system.start_recognition():
                 print("Face detected")
-                return True
-            else:
-                print("No face detected (during activation)")
-                time.sleep(0.5)
+                return face_system.last_recognized_name
+            print("No face detected (during activation)")
         except Exception as e:
             print(f"Error during recognition: {e}")
-            time.sleep(0.5)
+            # Camera unavailable: back off briefly, but wake immediately on shutdown
+            mirror.stopped.wait(0.5)
 
-    return False
+    return None
 
 
 def get_user_location():
-    """Get the user's location using geocoder"""
-    try:
-        return geocoder.ip("me")
-    except Exception as e:
-        print(f"Error getting location: {e}")
-        return None
+    """Get the user's location, looked up by IP at most once per refresh interval"""
+    return get_location_provider().get()
 
 
-def assistant_mode():
-    global running, face_detected, assistant
-    if assistant is None:
-        print("Error: Assistant not initialized.")
+def fetch_weather():
+    """Fetch fresh weather for the mirror's location; run by the background refresher."""
+    location = get_user_location()
+    if location is None:
+        raise RuntimeError("Location unavailable")
+    weather = get_weather_service().fetch_weather_info(location.lng, location.lat)
+    return dict(weather, city=location.city)
+
+
+def handle_weather(intent, session):
+    """Read out the current weather."""
+    print("Weather query detected")
+    # Only current conditions are fetched; don't answer "明天会下雨吗" with today's weather
+    if intent.slots.get('day', 0) > 0:
+        read_text_baidu("抱歉，目前只能查询今天的天气。")
+        return
+    # Warm snapshot from the refresher; only a cold start waits briefly for the first fetch
+    snapshot = get_refresher().get('weather', wait=5)
+    response = snapshot.value
+    if response is None:
+        print(f"Weather error: {snapshot.error}")
+        read_text_baidu("抱歉，暂时无法获取天气信息。")
+        return
+    print("Response: " + response['weather_condition'])
+    air = response.get('air_quality')
+    read_texts_baidu([
+        f"今天的天气状况如下,  位置:{response['city']}",
+        f"天气：{response['weather_condition']}",
+        f"温度：{response['temperature']}",
+        f"体感温度：{response['feels_like']}",
+        f"湿度：{response['humidity']}",
+        f"风向：{response['wind_direction']}",
+        f"风速：{response['wind_speed']}",
+        f"气压：{response['pressure']}",
+        f"能见度：{response['visibility']}",
+        f"云量：{response['cloud_coverage']}",
+    ] + ([f"空气质量：{air['category']}，指数{air['aqi']}"] if air else []))
+
+
+def handle_time(intent, session):
+    """Read out the current time."""
+    print("Time query detected")
+    read_text_baidu(f"现在是 {time.strftime('%H:%M')}")
+
+
+def handle_ac(intent, session):
+    """Queue an air conditioner command; quick follow-ups are merged into one IR frame."""
+    print(f"AC query detected: {intent.slots}")
+    if not intent.slots:
+        read_text_baidu("抱歉，我没有听懂空调指令。")
         return
+    future = get_ac_controller().submit_command(intent.slots)
+    future.add_done_callback(lambda f: f.result() or print(f"AC command failed: {intent.slots}"))
+    read_text_baidu("好的，正在处理空调指令。")
 
-    location = get_user_location()
-    weather = WeatherService()
-    longitude = get_user_location().lng
-    latitude = get_user_location().lat
-    response = weather.get_weather_info(longitude, latitude)
-    listening_duration = 60  # 1 minute in seconds
+
+def handle_goodbye(intent, session):
+    """End the conversation and go back to waiting for the wake word."""
+    read_text_baidu("拜拜，下次再见！", SpeechPriority.PROMPT)
+    get_assistant().reset_conversation(session['user'])
+    session['active'] = False
+
+
+# Commands resolved locally; anything else goes to DeepSeek
+intent_engine = create_intent_engine({
+    'weather': handle_weather,
+    'time': handle_time,
+    'ac': handle_ac,
+    'ac_adjust': handle_ac,
+    'goodbye': handle_goodbye,
+})
+
+
+async def run_turn(runtime, assistant, text, session):
+    """Answer one utterance; a barge-in or timeout cancels all of the turn's in-flight work."""
+    turn = Turn()
+    try:
+        if await runtime.device(intent_engine.dispatch, text, session=session):
+            return
+
+        print("Deepseek request")
+        print(f"Heard: {text}, processing with DeepSeek...")
+        # Sentences are synthesized while the reply is still streaming
+        sentences = cancellable(assistant.chat_stream(text, user=session['user']), turn.cancelled)
+        request = get_speech_output().say_stream(sentences)
+        try:
+            interrupted = await asyncio.wait_for(turn.spawn(runtime.device(wait_with_barge_in, request)),
+                                                 TURN_TIMEOUT)
+        except asyncio.TimeoutError:
+            print("Turn timed out")
+            get_speech_output().barge_in()
+            interrupted = True
+        if interrupted:
+            request.cancel()
+            print(f"Turn interrupted, cancelled {turn.cancel()} task(s)")
+    finally:
+        turn.cancel()
+
+
+async def conversation(user):
+    """Hold a conversation with a verified user until they leave or say goodbye."""
+    runtime = get_async_runtime()
+    session = {'user': user, 'active': True}
     last_interaction_time = time.time()
 
-    read_text_baidu("你好！有什么我可以帮您？")
-    while running and face_detected:
-        if time.time() - last_interaction_time > listening_duration:
-            read_text_baidu("等待唤醒...")
-            face_detected = False
+    # The assistant is usually warm already; if not, it loads while the greeting plays
+    assistant_task = asyncio.ensure_future(runtime.io(get_assistant))
+    await runtime.device(read_text_baidu, "你好！有什么我可以帮您？", SpeechPriority.GREETING)
+    assistant = await assistant_task
+
+    while session['active'] and not mirror.stopped.is_set():
+        if time.time() - last_interaction_time > CONVERSATION_TIMEOUT:
+            await runtime.device(read_text_baidu, "等待唤醒...", SpeechPriority.PROMPT)
+            assistant.reset_conversation(user)
             break
 
-        text = user_speech_recognition()
+        # Non-blocking: a stale weather snapshot is refreshed on the refresher thread while ASR runs
+        get_refresher().get('weather')
+        # Blocks on the microphone until the user speaks or recognition times out
+        text = await runtime.device(user_speech_recognition)
         if text:
             print(f"User said: {text}")
             last_interaction_time = time.time()  # Reset the timer
-
-            if '天气' in text:
-                print("Weather query detected")
-                print("Response: " + response['weather_condition'])
-                read_text_baidu(f"今天的天气状况如下,  位置:{location.city}")
-                read_text_baidu(f"天气：{response['weather_condition']}")
-                read_text_baidu(f"温度：{response['temperature']}")
-                read_text_baidu(f"体感温度：{response['feels_like']}")
-                read_text_baidu(f"湿度：{response['humidity']}")
-                read_text_baidu(f"风向：{response['wind_direction']}")
-                read_text_baidu(f"风速：{response['wind_speed']}")
-                read_text_baidu(f"气压：{response['pressure']}")
-                read_text_baidu(f"能见度：{response['visibility']}")
-                read_text_baidu(f"云量：{response['cloud_coverage']}")
-                continue
-            elif '几点' in text:
-                print("Time query detected")
-                read_text_baidu(f"现在是 {time.strftime('%H:%M')}")
-                continue
-            elif '空调' in text:
-                print("AC query detected")
-                # Add your AC control logic here
-                read_text_baidu("好的，正在处理空调指令。")
-                continue
-            elif '拜拜' in text or '再见' in text:
-                read_text_baidu("拜拜，下次再见！")
-                face_detected = False
-                continue
-            else:
-                print("Deepseek request")
-                print(f"Heard: {text}, processing with DeepSeek...")
-                response = assistant.chat(text)
-                print(f"DeepSeek response: {response}")
-                read_text_baidu(response)
-                continue
+            await run_turn(runtime, assistant, text, session)
         else:
             print("Listening for command...")
-            time.sleep(1)  # Small delay while actively listening
 
-    if face_detected:
-        read_text_baidu("等待唤醒...")
-        face_detected = False
 
+def assistant_mode(user):
+    """Run the conversation on the async runtime and wait for it to end."""
+    get_async_runtime().run(conversation(user))
 
-def run_face_detection():
-    global face_detection_running, face_detection_success
-    face_detection_running = True
-    if detect_face(timeout=60):
-        face_detection_success = True
-    else:
-        text_to_speech_chinese("我无法识别您的面部。如果需要我，请随时叫我。")
-    face_detection_running = False
 
+def listen_for_wake_word(_):
+    """Idle: block on the microphone until a wake word is heard."""
+    if get_services().is_created('presence'):
+        get_services().get('presence').resume()
+    while not mirror.stopped.is_set():
+        print("Listening for wake word...")
+        try:
+            script = audio_to_text()
+        except Exception as e:
+            print(f"Wake word listening failed: {e}")
+            mirror.stopped.wait(1)
+            continue
+        if not script:
+            print("No speech detected.")
+        elif any(wake_word in script for wake_word in wake_words):
+            return 'wake_word', script
+        else:
+            print("Wake word not detected.")
+    return None
 
-def wake_word_detection_loop():
-    global running, face_detected, assistant
-    global face_detection_running, face_detection_success
 
-    if assistant is None:
-        print("Error: Assistant not initialized.")
-        return
+def prompt_face_scan(_):
+    """Wake: ask the user to face the camera; the prompt plays while verification starts."""
+    text_to_speech_chinese("唤醒成功，请靠近并扫描您的面部以继续互动。这是为了您的安全。")
+    return 'prompted', None
 
-    while running:
-        if face_detected:
-            time.sleep(2)
-            continue
 
-        if face_detection_success:
-            face_detected = True
-            face_detection_success = False  # Reset
-            assistant_thread = threading.Thread(target=assistant_mode)
-            assistant_thread.start()
-            continue
+def verify_face(_):
+    """Verify: recognize the user's face before starting a session."""
+    user = detect_face(timeout=60)
+    if user is None:
+        text_to_speech_chinese("我无法识别您的面部。如果需要我，请随时叫我。")
+        return 'face_failed', None
+    return 'face_verified', user
 
-        if not face_detection_running:
-            print("Listening for wake word...")
-            script = audio_to_text()
-            if script:
-                for wake_word in wake_words:
-                    if wake_word in script:
-                        text_to_speech_chinese("唤醒成功，请靠近并扫描您的面部以继续互动。这是为了您的安全。")
-                        threading.Thread(target=run_face_detection).start()
-                        break
-                else:
-                    print("Wake word not detected.")
-            else:
-                print("No speech detected.")
 
-        time.sleep(1)  # Small delay to avoid busy loop
+def converse(user):
+    """Converse: run the session, then go back to idle."""
+    # The camera is not needed while talking
+    get_services().get('presence').pause()
+    assistant_mode(user)
+    return 'session_ended', user
+
+
+# Interaction flow: idle -> wake -> verify -> converse -> idle
+MIRROR_STATES = ('idle', 'wake', 'verify', 'converse')
+MIRROR_TRANSITIONS = {
+    ('idle', 'wake_word'): 'wake',
+    ('wake', 'prompted'): 'verify',
+    ('verify', 'face_verified'): 'converse',
+    ('verify', 'face_failed'): 'idle',
+    ('converse', 'session_ended'): 'idle',
+}
+# A failed state action falls back to idle
+MIRROR_TRANSITIONS.update({(state, 'error'): 'idle' for state in MIRROR_STATES})
+
+mirror = StateMachine('idle', MIRROR_TRANSITIONS, workers=2)
+mirror.on_enter('idle', listen_for_wake_word)
+mirror.on_enter('wake', prompt_face_scan)
+mirror.on_enter('verify', verify_face)
+mirror.on_enter('converse', converse)
 
 
 def launch_gui():
@@ -213,7 +327,7 @@ def launch_gui():
 
         app = QApplication(sys.argv)
         web = QWebEngineView()
-        web.load(QUrl("http://localhost:8080"))
+        web.load(QUrl(f"http://localhost:{WEB_PORT}"))
         web.show()
         sys.exit(app.exec_())
 
@@ -238,37 +352,96 @@ def launch_gui():
                 time.sleep(1)
 
 
-def main() -> None:
-    global running, assistant, preloaded_face_data
-    print("Smart Mirror started.")
+def start_web_ui(port=WEB_PORT):
+    """Serve the Flask app on a background thread; returns once the port is bound."""
+    from werkzeug.serving import make_server
+
+    server = make_server('0.0.0.0', port, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def prefetch_weather():
+    """Start the background refresher and wait for the first weather fetch."""
+    refresher = get_refresher()
+    refresher.register('weather', fetch_weather, WeatherConfig.REFRESH_INTERVAL,
+                       backoff_on=(APILimitExceededError,), max_backoff=WeatherConfig.REFRESH_MAX_BACKOFF)
+    refresher.start()
+    snapshot = refresher.get('weather', wait=WeatherConfig.REQUEST_TIMEOUT * 2)
+    if snapshot.value is None:
+        raise RuntimeError(f"First weather fetch failed: {snapshot.error}")
+    return snapshot
 
-    # Initialize the voice assistant
-    assistant = VoiceAssistant(
-        baidu_app_id=os.getenv("BAIDU_APP_ID"),
-        baidu_api_key=os.getenv("BAIDU_API_KEY"),
-        baidu_secret_key=os.getenv("BAIDU_SECRET_KEY"),
-        deepseek_api_key=os.getenv("DEEPSEEK_API_KEY"),
-    )
 
-    # Preload face data
-    preloaded_face_data = preload_face_data()
-    gui_thread = threading.Thread(target=launch_gui)
+def load_offline_model():
+    """Load the on-device recognition model; until then recognition uses the cloud."""
+    if not get_offline_recognizer().load():
+        raise RuntimeError("Offline recognition model failed to load")
 
-    # Start voice processing
-    voice_thread = threading.Thread(target=wake_word_detection_loop, daemon=True)
-    voice_thread.start()
-    gui_thread.start()
 
+def start_thread(target, daemon=True):
+    thread = threading.Thread(target=target, daemon=daemon)
+    thread.start()
+    return thread
+
+
+def main() -> None:
+    start_time = time.perf_counter()
+    print("Smart Mirror started.")
+
+    # Subsystems are constructed on first use and shared
+    services = get_services()
+    services.register('face_recognizer', preload_face_data)
+    services.register('presence', create_presence_detector)
+
+    # Independent subsystems initialize concurrently; the wake loop only waits for its own inputs
+    startup = StartupOrchestrator()
+    startup.add('audio', init_audio_capture)
+    startup.add('offline_asr', load_offline_model)
+    startup.add('face_gallery', lambda: services.get('face_recognizer'))
+    startup.add('presence', lambda: services.get('presence').start())
+    startup.add('tts', prewarm_tts_cache)
+    startup.add('assistant', get_assistant)
+    startup.add('weather', prefetch_weather)
+    startup.add('web_ui', start_web_ui)
+    startup.add('wake_loop', mirror.start, requires=('audio',))
+    startup.add('gui', lambda: start_thread(launch_gui, daemon=False), requires=('web_ui',))
+    startup.start()
 
     try:
+        startup.wait('wake_loop')
+        print(f"Listening for the wake word {time.perf_counter() - start_time:.2f}s after start")
+        startup.wait_all(timeout=120)
+        for name, step in startup.stats().items():
+            print(f"  {name}: {step['status']}, init {step['init_seconds'] or 0:.2f}s, "
+                  f"finished {step['finished_after'] or 0:.2f}s after start")
+        print(f"Startup took {time.perf_counter() - start_time:.2f}s, RSS {process_rss_mb() or 0:.0f} MB")
+
         while True:
             time.sleep(1)
     except KeyboardInterrupt:
         print("Exiting...")
-        running = False
-        voice_thread.join()
+        print(f"TTS cache: {get_tts_cache().stats()}")
+        print(f"Speech output: {get_speech_output().stats()}")
+        if services.is_created('assistant'):
+            print(f"Chat cache: {get_assistant().response_cache.stats()}")
+        print(f"Intents: {intent_engine.stats()}")
+        print(f"Refresher: {get_refresher().stats()}")
+        print(f"Resilience: {resilience_stats()}")
+        print(f"Services: {services.stats()}")
+        print(f"Startup: {startup.stats()}")
+        print(f"States: {mirror.stats()}")
+        if services.is_created('presence'):
+            print(f"Presence: {services.get('presence').stats()}")
+            services.get('presence').stop()
+        mirror.stop(timeout=5)
+        get_async_runtime().stop()
         # GUI thread will exit when the Qt application is closed
 
 
 if __name__ == "__main__":
+    if "--profile-startup" in sys.argv:
+        # Import-time tree of this module, measured in a fresh interpreter
+        from features.common.import_profile import main as profile_startup
+        sys.exit(profile_startup([arg for arg in sys.argv[1:] if arg != "--profile-startup"]))
     main()
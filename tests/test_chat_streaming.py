@@ -0,0 +1,89 @@
+import pytest
+
+requests = pytest.importorskip('requests')
+
+from features.chat import ResponseCache, iter_sentences, iter_sse_content
+from features.chat.fake_server import start_fake_server
+
+EXPECTED_SENTENCES = ["你好！", "今天天气晴，气温18度。", "出门记得带水"]
+
+
+@pytest.fixture
+def fake_chat():
+    servers = []
+
+    def start(**kwargs):
+        server, url = start_fake_server(**kwargs)
+        servers.append(server)
+        return url
+
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
+def _post(url):
+    return requests.post(url, json={"stream": True}, stream=True, timeout=5)
+
+
+def test_sse_content_yields_deltas_until_done(fake_chat):
+    url = fake_chat(deltas=["一", "二", "三"])
+    with _post(url) as response:
+        assert list(iter_sse_content(response)) == ["一", "二", "三"]
+
+
+@pytest.mark.parametrize('split', [None, 1, 7, 32])
+def test_sentences_survive_chunk_boundaries(fake_chat, split):
+    # Small pieces end mid-line and mid-character, and sentence ends fall inside deltas
+    url = fake_chat(split=split)
+    with _post(url) as response:
+        assert list(iter_sentences(iter_sse_content(response))) == EXPECTED_SENTENCES
+
+
+@pytest.mark.parametrize('content_type', ['text/event-stream', 'application/octet-stream', ''])
+def test_stream_is_decoded_as_utf8_without_a_charset(fake_chat, content_type):
+    url = fake_chat(split=7, content_type=content_type)
+    with _post(url) as response:
+        assert list(iter_sentences(iter_sse_content(response))) == EXPECTED_SENTENCES
+
+
+def test_events_after_done_are_ignored(fake_chat):
+    url = fake_chat(deltas=["完。"], after_done=["多余。"])
+    with _post(url) as response:
+        assert list(iter_sentences(iter_sse_content(response))) == ["完。"]
+
+
+@pytest.fixture
+def assistant(tmp_path, monkeypatch, fake_chat):
+    pytest.importorskip('speech_recognition')
+    pytest.importorskip('aip')
+    from features.voice_feat_system import VoiceAssistant
+
+    assistant = VoiceAssistant(log_dir=str(tmp_path))
+    assistant.deepseek_api_url = fake_chat(split=5, delay=0.01)
+    assistant.deepseek_api_key = 'test'
+    assistant.response_cache = ResponseCache(path=None)
+    monkeypatch.setattr(assistant, '_check_network_connection', lambda timeout=3: True)
+    return assistant
+
+
+def test_chat_stream_yields_sentences_and_records_the_turn(assistant):
+    assert list(assistant.chat_stream("今天天气怎么样", user='alice')) == EXPECTED_SENTENCES
+    conversation = assistant.conversations.get('alice')
+    assert not conversation.is_empty
+    assert assistant.response_cache.get("今天天气怎么样") == ' '.join(EXPECTED_SENTENCES)
+
+
+@pytest.mark.parametrize('stream', [False, True])
+def test_cached_first_turn_is_recorded(assistant, stream):
+    assistant.response_cache.put("你是谁", "我是小朋友。", 1.0)
+    reply = list(assistant.chat_stream("你是谁", user='bob')) if stream else assistant.chat("你是谁", user='bob')
+    assert reply == (["我是小朋友。"] if stream else "我是小朋友。")
+    assert not assistant.conversations.get('bob').is_empty
+
+
+def test_empty_stream_reply_is_not_recorded(assistant, fake_chat):
+    assistant.deepseek_api_url = fake_chat(deltas=[])
+    assert list(assistant.chat_stream("在吗", user='carol')) == []
+    assert assistant.conversations.get('carol').is_empty
+    assert assistant.response_cache.get("在吗") is None
@@ -0,0 +1,38 @@
+import pytest
+
+from features.common.import_profile import build_tree, find, run_importtime
+
+# Same budget as the startup profile's documented --budget-ms
+BUDGET_MS = 1500
+
+# Loaded on first use, never at import time
+HEAVY_MODULES = ('cv2', 'face_recognition', 'dlib', 'aip', 'speech_recognition', 'pyaudio',
+                 'pyttsx3', 'PyQt5')
+
+# Third-party packages stubbed when not installed, so main always imports
+OPTIONAL_DEPENDENCIES = HEAVY_MODULES + ('RPi', 'dotenv', 'flask', 'geocoder', 'kivy', 'numpy',
+                                         'pigpio', 'pydub', 'requests', 'vosk', 'werkzeug')
+
+
+def _walk(nodes):
+    for node in nodes:
+        yield node
+        yield from _walk(node.children)
+
+
+@pytest.fixture(scope='module')
+def main_imports():
+    lines, error = run_importtime('main', stub_missing=OPTIONAL_DEPENDENCIES)
+    assert not error, error
+    return build_tree(lines)
+
+
+def test_main_imports_within_budget(main_imports):
+    node = find(main_imports, 'main')
+    assert node is not None
+    assert node.cumulative_us / 1000 < BUDGET_MS
+
+
+def test_main_does_not_import_heavy_modules(main_imports):
+    loaded = {node.package for node in _walk(main_imports)}
+    assert not loaded & set(HEAVY_MODULES)
@@ -0,0 +1,29 @@
+import pytest
+
+from features.intent import create_intent_engine
+from features.intent.benchmark import DEFAULT_CORPUS, load_corpus, run_benchmark
+
+
+def test_corpus_resolves_as_labelled():
+    result = run_benchmark(load_corpus(DEFAULT_CORPUS), repeat=1)
+    assert result['mismatches'] == []
+
+
+@pytest.mark.parametrize('text, slots', [
+    ("温度26度", {'temperature': 26}),
+    ("风速高", {'fan_speed': 'high'}),
+    ("温度调低两度", {'temperature_delta': -2}),
+])
+def test_ac_follow_ups_carry_settings(text, slots):
+    intent = create_intent_engine().parse(text)
+    assert intent.name == 'ac_adjust'
+    assert intent.slots == slots
+
+
+def test_follow_up_keyword_without_a_setting_falls_through():
+    assert create_intent_engine().parse("外面温度多少") is None
+
+
+@pytest.mark.parametrize('text', ["把冷气温度调到26度", "冷气温度调高"])
+def test_overlapping_keywords_do_not_override_the_leftmost_match(text):
+    assert create_intent_engine().parse(text).name == 'ac'
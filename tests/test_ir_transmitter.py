@@ -0,0 +1,36 @@
+from home_control.ir_transmitter import IRTransmitter, SimulatedBackend, create_backend, encode_chain
+
+
+def test_simulator_is_opt_in(monkeypatch):
+    monkeypatch.delenv('IR_SIMULATE', raising=False)
+    assert not isinstance(create_backend(18), SimulatedBackend)
+    assert not isinstance(create_backend(18, simulate=False), SimulatedBackend)
+
+    monkeypatch.setenv('IR_SIMULATE', '1')
+    assert isinstance(create_backend(18), SimulatedBackend)
+    assert isinstance(create_backend(18, simulate=True), SimulatedBackend)
+
+
+def test_repeated_bits_are_chained_as_loops():
+    # Header, six identical bits, two different ones, stop mark
+    waves = [0, 1] + [2, 3] * 6 + [2, 4, 2, 3, 2]
+    chain = encode_chain(waves)
+    assert chain == [0, 1, 255, 0, 2, 3, 255, 1, 6, 0, 2, 4, 2, 3, 2]
+
+    long_run = [2, 3] * 1000 + [2]
+    assert len(encode_chain(long_run)) == 9
+
+
+def test_send_fails_without_a_backend(monkeypatch):
+    monkeypatch.setattr('home_control.ir_transmitter.create_backend', lambda pin: None)
+    transmitter = IRTransmitter(18)
+    assert not transmitter.available
+    assert transmitter.send('B24D7B84E01F') is False
+    transmitter.close()
+
+
+def test_send_on_simulator():
+    backend = SimulatedBackend()
+    transmitter = IRTransmitter(backend=backend)
+    assert transmitter.send('B24D7B84E01F') is True
+    assert backend.stats()['frames'] == 1
@@ -0,0 +1,14 @@
+from features.common.network import NetworkProbe
+
+
+def test_result_is_reused_within_ttl_and_rechecked_after(monkeypatch):
+    probe = NetworkProbe(ttl=60)
+    answers = [False, True]
+    monkeypatch.setattr(probe, '_connect', lambda: answers.pop(0))
+
+    assert probe.is_online() is False
+    assert probe.is_online() is False  # cached, no second connection
+
+    probe._checked_at -= 61
+    assert probe.is_online() is True
+    assert answers == []
@@ -0,0 +1,46 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('cv2')
+
+from features.face_recognition.presence import PresenceDetector
+
+
+class FakeCapture:
+    def read(self):
+        return True, np.zeros((480, 640, 3), dtype=np.uint8)
+
+
+class FakeFaceSystem:
+    def __init__(self, *names):
+        self.names = list(names)
+
+    def recognize_frame(self, frame):
+        return self.names.pop(0)
+
+
+def _detector(*names):
+    faces = FakeFaceSystem(*names)
+    detector = PresenceDetector(lambda: faces)
+    detector._capture = FakeCapture()
+    detector._mode = 'active'
+    detector._active_until = float('inf')
+    return detector
+
+
+def test_speculative_match_is_accepted_while_the_face_is_in_frame():
+    detector = _detector('alice', 'alice')
+    detector._step('active', demanded=False)
+    detector._step('active', demanded=False)
+
+    assert detector.recognize(timeout=0) == 'alice'
+    assert detector.stats()['speculative_recognitions'] == 1
+    assert detector.stats()['speculative_hits'] == 1
+
+
+def test_speculative_match_is_dropped_once_the_face_leaves():
+    detector = _detector('alice', None)
+    detector._step('active', demanded=False)
+    detector._step('active', demanded=False)
+
+    assert detector.recognize(timeout=0) is None
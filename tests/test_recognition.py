@@ -0,0 +1,49 @@
+import pytest
+
+from features.resilience.policy import ServicePolicy
+from features.speech.baidu import BaiduServiceError, check_tts_result
+from features.speech.recognition import CloudRecognizer
+
+SDK_TIMEOUT = {'error_code': 'SDK108', 'error_msg': 'connection or read data timeout'}
+
+
+class FakeClient:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    def asr(self, data, format, rate, options):
+        self.calls += 1
+        return self.results.pop(0)
+
+
+def _recognizer(client):
+    recognizer = CloudRecognizer(client, network_check=lambda: True)
+    recognizer.preparer.trim = False
+    recognizer.policy = ServicePolicy('baidu_asr', rate=100.0, burst=100, attempts=2,
+                                      base_delay=0, max_delay=0, failure_threshold=1)
+    return recognizer
+
+
+def test_sdk_timeout_is_retried():
+    client = FakeClient(SDK_TIMEOUT, {'err_no': 0, 'result': ['你好']})
+    recognizer = _recognizer(client)
+
+    assert recognizer.recognize(b'\x10\x00' * 1600) == '你好'
+    assert client.calls == 2
+    assert recognizer.policy.stats()['retries'] == 1
+
+
+def test_repeated_sdk_timeouts_open_the_breaker():
+    client = FakeClient(SDK_TIMEOUT, SDK_TIMEOUT)
+    recognizer = _recognizer(client)
+
+    assert recognizer.recognize(b'\x10\x00' * 1600) is None
+    assert recognizer.policy.stats()['failures'] == 1
+    assert not recognizer.ready()
+
+
+def test_tts_error_dicts_raise():
+    with pytest.raises(BaiduServiceError):
+        check_tts_result(SDK_TIMEOUT)
+    assert check_tts_result(b'audio') == b'audio'
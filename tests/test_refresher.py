@@ -0,0 +1,29 @@
+import time
+
+import pytest
+
+from features.common.refresher import BackgroundRefresher
+from features.resilience.exceptions import CircuitOpenError
+
+
+@pytest.mark.parametrize('error', [RuntimeError("boom"), CircuitOpenError("open")])
+def test_stale_reads_do_not_cut_short_the_retry_delay(error):
+    calls = []
+
+    def fetch():
+        calls.append(time.monotonic())
+        raise error
+
+    refresher = BackgroundRefresher(retry_interval=60)
+    refresher.register('job', fetch, interval=120)
+    refresher.start()
+    try:
+        assert refresher.get('job', wait=2).error == str(error)
+        for _ in range(20):
+            refresher.get('job')
+            time.sleep(0.01)
+    finally:
+        refresher.stop()
+
+    assert len(calls) == 1
+    assert refresher.stats()['job']['failures'] == 1
@@ -0,0 +1,36 @@
+import pytest
+
+from features.resilience import RateLimitedError
+from features.resilience.policy import ServicePolicy
+
+
+def _policy(**kwargs):
+    settings = dict(rate=0.001, burst=1, attempts=3, token_wait=0, base_delay=0, max_delay=0)
+    settings.update(kwargs)
+    return ServicePolicy('test', **settings)
+
+
+def test_exhausted_budget_is_not_retried():
+    policy = _policy()
+    policy.call(lambda: 'ok', idempotent=True)
+
+    with pytest.raises(RateLimitedError):
+        policy.call(lambda: 'ok', idempotent=True)
+    stats = policy.stats()
+    assert stats['retries'] == 0
+    assert stats['rejected_rate'] == 1
+    assert stats['state'] == 'closed'
+
+
+def test_failures_are_retried_within_budget():
+    policy = _policy(burst=3)
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise ConnectionError("reset")
+        return 'ok'
+
+    assert policy.call(flaky, idempotent=True) == 'ok'
+    assert policy.stats()['retries'] == 2
@@ -0,0 +1,29 @@
+from features.speech.speech_pipeline import SpeechPipeline
+
+
+def _synthesize(sentence):
+    if sentence.startswith('bad'):
+        raise RuntimeError("synthesis failed")
+    return sentence.encode('utf-8')
+
+
+def test_failed_sentences_are_spoken_by_the_fallback_in_order():
+    spoken = []
+    pipeline = SpeechPipeline(_synthesize, lambda audio: spoken.append(audio.decode('utf-8')))
+
+    result = pipeline.speak(iter(['a', 'bad1', 'b', 'bad2']),
+                            fallback=lambda sentence: spoken.append(f"offline:{sentence}"))
+
+    assert spoken == ['a', 'offline:bad1', 'b', 'offline:bad2']
+    assert result['played'] == 2
+    assert result['fallback'] == 2
+    assert result['unplayed'] == []
+
+
+def test_failures_are_reported_without_a_fallback():
+    pipeline = SpeechPipeline(_synthesize, lambda audio: None)
+
+    result = pipeline.speak(['bad1', 'a', 'bad2', 'b'])
+
+    assert result['played'] == 2
+    assert result['unplayed'] == ['bad1', 'bad2']
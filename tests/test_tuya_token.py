@@ -0,0 +1,36 @@
+import pytest
+
+pytest.importorskip('requests')
+
+from home_control.tuya_token import TuyaTokenManager
+
+
+def test_missing_credentials_skip_the_token_endpoint(monkeypatch):
+    manager = TuyaTokenManager('http://tuya.invalid', None, None)
+    monkeypatch.setattr(manager, '_fetch', lambda: pytest.fail("token endpoint called"))
+
+    manager.prefetch()
+    assert manager.get_token() is None
+    assert manager.fetches == 0
+
+
+def test_failed_refreshes_back_off_exponentially_up_to_the_cap(monkeypatch):
+    manager = TuyaTokenManager('http://tuya.invalid', 'id', 'secret')
+    manager.MAX_RETRY_INTERVAL = 200
+    delays = []
+    monkeypatch.setattr(manager, '_schedule_refresh', delays.append)
+
+    def fail():
+        raise ConnectionError("unreachable")
+
+    monkeypatch.setattr(manager, '_fetch', fail)
+    for _ in range(5):
+        assert manager.get_token() is None
+    assert delays == [30, 60, 120, 200, 200]
+
+    monkeypatch.setattr(manager, '_fetch', lambda: ('token', 7200))
+    assert manager.get_token() == 'token'
+    monkeypatch.setattr(manager, '_fetch', fail)
+    manager.invalidate()
+    manager.get_token()
+    assert delays[-1] == 30
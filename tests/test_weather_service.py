@@ -0,0 +1,41 @@
+import pytest
+
+pytest.importorskip('requests')
+
+from features.resilience.policy import ServicePolicy
+from features.weather.api_client import APIClient
+from features.weather.exception import APIError
+from features.weather.fake_server import start_fake_server
+from features.weather.weather_service import WeatherService
+
+
+@pytest.fixture
+def service_with():
+    servers = []
+
+    def make(failures=None):
+        server, url = start_fake_server(failures=failures)
+        servers.append(server)
+        client = APIClient(host=url, api_key='test')
+        # A policy of its own, so failures here don't trip the shared breaker or budget
+        client.policy = ServicePolicy('qweather', rate=100.0, burst=100, attempts=1)
+        return WeatherService(client=client)
+
+    yield make
+    for server in servers:
+        server.shutdown()
+
+
+def test_missing_current_conditions_raise(service_with):
+    service = service_with(failures={'now': 500})
+    with pytest.raises(APIError):
+        service.fetch_weather_info(121.46, 31.22)
+    assert 'error' in service.get_weather_info(121.46, 31.22)
+
+
+def test_missing_air_quality_returns_partial_result(service_with):
+    service = service_with(failures={'air': 500})
+    result = service.fetch_weather_info(121.46, 31.22)
+    assert result['weather_condition'] == '晴'
+    assert result['air_quality'] is None
+    assert set(result['errors']) == {'air'}